@@ -68,3 +68,17 @@ def _unicode_to_ascii(obj):
 def _write(fobj, data):
     """ Write data to file """
     fobj.write(data)
+
+
+###
+# Classes
+###
+class _Awaitable(object):
+    """ Awaitable that evaluates to a value without suspending """
+    # pylint: disable=R0903
+    def __init__(self, value):
+        self._value = value
+
+    def __await__(self):
+        yield from ()
+        return self._value
@@ -4,8 +4,10 @@
 # pylint: disable=C0111,E0611,W0105,W0611
 
 # Standard library imports
+from __future__ import division
 import collections
 import math
+import numbers
 import textwrap
 import decimal
 from decimal import Decimal
@@ -14,8 +16,10 @@ if sys.hexversion < 0x03000000: # pragma: no cover
     from itertools import izip_longest as zip_longest
 else: # pragma: no cover
     from itertools import zip_longest
-# PyPI imports
-import numpy
+try:
+    from math import gcd as _igcd
+except ImportError: # pragma: no cover
+    from fractions import gcd as _igcd
 # Putil imports
 import putil.exh
 from putil.ptypes import (
@@ -56,6 +60,13 @@ _SUFFIX_POWER_DICT = dict(
     (key, float(10**value)) for key, value in _SUFFIX_TO_POWER_DICT.items()
 )
 
+DECVECTOR = collections.namedtuple('DecVector', ['ints', 'exp'])
+"""
+Constructor for exact decimal vector representation; each vector item is
+the corresponding item of the **ints** tuple times ten to the power of
+**exp**
+"""
+
 ENGPOWER = collections.namedtuple('EngPower', ['suffix', 'exp'])
 """
 Constructor for engineering notation suffix
@@ -103,6 +114,47 @@ def _split_every(text, sep, count, lstrip=False, rstrip=False):
     return tuple(func(joint) for joint in joints)
 
 
+def _to_dec_tuple(number, decimals=None):
+    """
+    Returns a tuple where the first item is an integer mantissa and the
+    second item is the exponent such that the number is the mantissa times
+    ten to the power of the exponent. Trailing zeros are removed from the
+    mantissa
+
+    :param number: Number
+    :type  number: integer, float or string
+
+    :param decimals: Number of digits to round the fractional part of the
+                     mantissa (in normalized scientific notation) to, None
+                     indicates that the shortest representation that
+                     round-trips is used
+    :type  decimals: integer or None
+
+    :rtype: tuple
+
+    :raises: RuntimeError (Argument \`vector\` is not valid)
+    """
+    if isinstance(number, numbers.Integral):
+        return int(number), 0
+    if isinstance(number, str):
+        text = number.strip()
+    elif decimals is None:
+        text = repr(float(number))
+    else:
+        text = '{0:.{1}e}'.format(number, decimals)
+    mant, _, exp = text.lower().partition('e')
+    ipart, _, fpart = mant.partition('.')
+    digits = (ipart+fpart).rstrip('0')
+    if digits.lstrip('+-') == '':
+        return 0, 0
+    # Infinity and NaN (and malformed strings) have no exact decimal
+    # representation
+    if not digits.lstrip('+-').isdigit():
+        raise RuntimeError('Argument `vector` is not valid')
+    exp = (int(exp) if exp else 0)-len(fpart)+(len(ipart+fpart)-len(digits))
+    return int(digits), exp
+
+
 def _to_eng_tuple(number):
     """
     Returns a tuple where the first item is the mantissa and the second
@@ -129,6 +181,123 @@ def _to_eng_tuple(number):
     return NUMCOMP(new_mant, new_exp)
 
 
+def dec_gcd(dvec):
+    """
+    Calculates the greatest common divisor (GCD) of the items of an exact
+    decimal vector. The GCD is computed over the scaled integers, so there
+    are no floating point precision issues
+
+    :param dvec: Exact decimal vector
+    :type  dvec: :py:data:`putil.eng.DECVECTOR`
+
+    :rtype: :py:data:`putil.eng.DECVECTOR` with one item (zero if all
+            items of **dvec** are zero) and the same exponent as **dvec**
+
+    For example:
+
+        >>> import putil.eng
+        >>> dvec = putil.eng.to_dec_vector([0.3, 0.75, 1.2])
+        >>> putil.eng.from_dec_vector(putil.eng.dec_gcd(dvec))
+        [0.15]
+    """
+    ret = 0
+    for item in dvec.ints:
+        ret = _igcd(ret, abs(item))
+    return DECVECTOR((abs(ret), ), dvec.exp)
+
+
+def dec_linspace(start, stop, num, decimals=None):
+    """
+    Returns evenly spaced numbers over an interval. Unlike `numpy.linspace
+    <http://docs.scipy.org/doc/numpy/reference/generated/
+    numpy.linspace.html>`_ all numbers are computed exactly from their
+    decimal representation and then correctly rounded to the nearest
+    floating point number, so there are no floating point artifacts
+    (e.g. :code:`0.30000000000000004`) even when the spacing is not exactly
+    representable
+
+    :param start: Start of the interval
+    :type  start: integer, float or string
+
+    :param stop: End of the interval (included)
+    :type  stop: integer, float or string
+
+    :param num: Number of samples to generate
+    :type  num: integer
+
+    :param decimals: Number of digits to round the fractional part of the
+                     mantissa of **start** and **stop** to, None indicates
+                     that they are not rounded
+    :type  decimals: integer or None
+
+    :rtype: list of floats
+
+    For example:
+
+        >>> import putil.eng
+        >>> putil.eng.dec_linspace(0.1, 0.5, 5)
+        [0.1, 0.2, 0.3, 0.4, 0.5]
+    """
+    dvec = to_dec_vector([start, stop], decimals)
+    if num < 2:
+        return from_dec_vector(DECVECTOR(dvec.ints[:num], dvec.exp))
+    (ista, isto), den = dvec.ints, num-1
+    if dvec.exp < 0:
+        scale, mult = den*10**(-dvec.exp), 1
+    else:
+        scale, mult = den, 10**dvec.exp
+    return [
+        ((ista*den+idx*(isto-ista))*mult)/scale for idx in range(den+1)
+    ]
+
+
+def dec_step(dvec):
+    """
+    Returns the differences between consecutive items of an exact decimal
+    vector
+
+    :param dvec: Exact decimal vector
+    :type  dvec: :py:data:`putil.eng.DECVECTOR`
+
+    :rtype: :py:data:`putil.eng.DECVECTOR` with one item less than
+            **dvec** and the same exponent as **dvec**
+
+    For example:
+
+        >>> import putil.eng
+        >>> dvec = putil.eng.to_dec_vector([0.8, 0.9, 1.1])
+        >>> putil.eng.from_dec_vector(putil.eng.dec_step(dvec))
+        [0.1, 0.2]
+    """
+    ints = dvec.ints
+    return DECVECTOR(
+        tuple(nitem-item for item, nitem in zip(ints, ints[1:])), dvec.exp
+    )
+
+
+def from_dec_vector(dvec):
+    """
+    Converts an exact decimal vector to a list of floating point numbers.
+    Each number is correctly rounded to the nearest floating point number
+
+    :param dvec: Exact decimal vector
+    :type  dvec: :py:data:`putil.eng.DECVECTOR`
+
+    :rtype: list of floats
+
+    For example:
+
+        >>> import putil.eng
+        >>> putil.eng.from_dec_vector(putil.eng.DECVECTOR((1, 25, 3), -1))
+        [0.1, 2.5, 0.3]
+    """
+    if dvec.exp < 0:
+        scale = 10**(-dvec.exp)
+        return [item/scale for item in dvec.ints]
+    mult = 10**dvec.exp
+    return [float(item*mult) for item in dvec.ints]
+
+
 @putil.pcontracts.contract(number='number')
 def no_exp(number):
     r"""
@@ -543,7 +712,10 @@ def round_mantissa(arg, decimals=0):
     """
     if arg is None:
         return arg
-    if isinstance(arg, numpy.ndarray):
+    # An argument can only be a Numpy vector if Numpy has been imported, this
+    # avoids importing Numpy (which is slow) if it is not used elsewhere
+    numpy = sys.modules.get('numpy', None)
+    if (numpy is not None) and isinstance(arg, numpy.ndarray):
         foi = [isinstance(item, int) for item in arg]
         return numpy.array(
             [
@@ -795,6 +967,47 @@ def pprint_vector(vector, limit=False, width=None, indent=0,
     )
 
 
+def to_dec_vector(vector, decimals=None):
+    """
+    Converts a list of numbers or a Numpy vector to an exact decimal vector,
+    i.e. a vector of integers scaled by a common power of ten. This enables
+    exact arithmetic (differences, greatest common divisor, etc.) without
+    floating point artifacts and without creating one `Decimal
+    <https://docs.python.org/2/library/decimal.html>`_ object per item.
+    Integers are not altered; full precision is maintained if a number is
+    represented as a string
+
+    :param vector: Vector of numbers
+    :type  vector: list of integers, floats or strings, or Numpy vector
+
+    :param decimals: Number of digits to round the fractional part of the
+                     mantissa of floating point numbers to (as in
+                     :py:func:`putil.eng.round_mantissa`), None indicates
+                     that the shortest representation that round-trips is
+                     used
+    :type  decimals: integer or None
+
+    :rtype: :py:data:`putil.eng.DECVECTOR`
+
+    :raises: RuntimeError (Argument \`vector\` is not valid)
+
+    For example:
+
+        >>> import putil.eng
+        >>> putil.eng.to_dec_vector([0.8, 0.9, 1, 12.5])
+        DecVector(ints=(8, 9, 10, 125), exp=-1)
+        >>> putil.eng.to_dec_vector([1234.5678, 2e-3], 2)
+        DecVector(ints=(1230000, 2), exp=-3)
+    """
+    items = [_to_dec_tuple(item, decimals) for item in vector]
+    if not items:
+        return DECVECTOR((), 0)
+    exp = min(iexp for item, iexp in items)
+    return DECVECTOR(
+        tuple(item*10**(iexp-exp) for item, iexp in items), exp
+    )
+
+
 def to_scientific_string(
         number,
         frac_length=None,
@@ -20,7 +20,7 @@ else:   # pragma: no cover
     import builtins as __builtin__
 # Putil imports
 if sys.hexversion >= 0x03000000: # pragma: no cover
-    from putil.compat3 import _rwtb
+    from putil.compat3 import _Awaitable, _rwtb
 else: # pragma: no cover
     from putil.compat2 import _rwtb
 import putil.exh
@@ -69,7 +69,164 @@ def _validate_fname(fname, arg_name):
 ###
 # Context managers
 ###
-class ExDocCxt(object):
+class _BaseExDocCxt(object):
+    """
+    Common functionality of the synchronous and asynchronous exception
+    tracing context managers
+    """
+    def __init__(
+        self,
+        exclude=None,
+        _no_print=True,
+        pickle_fname=None,
+        in_callables_fname=None,
+        out_callables_fname=None
+    ):
+        # Validate aguments
+        if (exclude is not None) and (not isinstance(exclude, list)):
+            raise RuntimeError('Argument `exclude` is not valid')
+        _validate_fname(pickle_fname, 'pickle_fname')
+        _validate_fname(in_callables_fname, 'in_callables_fname')
+        _validate_fname(out_callables_fname, 'out_callables_fname')
+        if ((in_callables_fname is not None) and
+           (not os.path.exists(in_callables_fname))):
+            raise OSError(
+                'File {0} could not be found'.format(in_callables_fname)
+            )
+        if not isinstance(_no_print, bool):
+            raise RuntimeError('Argument `_no_print` is not valid')
+        self._pickle_fname = pickle_fname
+        self._pickle_dict = {}
+        self._out_callables_fname = out_callables_fname
+        # Need to have an exception handler with full_cname=True and clean
+        # the slate for the trace
+        self._exhobj = putil.exh.ExHandle(
+            full_cname=True,
+            exclude=exclude,
+            callables_fname=in_callables_fname
+        )
+        # Create a dummy ExDoc object. It has to be created here so that
+        # it can be returned by the context in the '[...] as [...]' clause.
+        # The actual (valid) contents of this object are loaded upon
+        # context exit
+        self._exdoc_obj = putil.exdoc.ExDoc(
+            exh_obj=putil.exh.ExHandle(), _empty=True, _no_print=_no_print
+        )
+
+    def _build_exdoc(self, exhobj):
+        """
+        Generates the exceptions database from the traced exception handler
+        """
+        if self._out_callables_fname is not None:
+            exhobj.save_callables(self._out_callables_fname)
+        # The exception handler is not used anywhere else, so it does not
+        # need to be copied
+        self._exdoc_obj._exh_obj = exhobj
+        self._pickle_dict['exhobj'] = exhobj
+        # Generate exceptions database
+        self._exdoc_obj._build_ex_tree()
+        self._exdoc_obj._build_module_db()
+        if self._pickle_fname is not None:
+            self._pickle_dict['exdoc'] = copy.copy(self._exdoc_obj)
+            with open(self._pickle_fname, 'wb') as fobj:
+                pickle.dump(self._pickle_dict, fobj)
+
+
+class AsyncExDocCxt(_BaseExDocCxt):
+    r"""
+    Asynchronous context manager counterpart of
+    :py:class:`putil.exdoc.ExDocCxt` (Python 3.7 or newer). The exception
+    handler used for tracing is scoped to the current task with
+    :py:class:`putil.exh.ExHandleCxt` instead of replacing the global
+    exception handler, so coroutines can be traced while other coroutines
+    run concurrently. Task scoping requires the `contextvars
+    <https://docs.python.org/3/library/contextvars.html>`_ module, an
+    exception is raised in older Python versions rather than sharing the
+    exception handler between coroutines running in the same thread.
+    Multi-CPU traces are not supported
+
+    :param exclude: Module exclusion list. A particular callable in
+                    an otherwise fully qualified name is omitted if
+                    it belongs to a module in this list. If None all
+                    callables are included
+    :type  exclude: list of strings or None
+
+    :param pickle_fname: File name to pickle traced exception handler
+                         (useful for debugging purposes). If None all
+                         pickle file is created
+    :type  pickle_fname: :ref:`FileName` or None
+
+    :param in_callables_fname: File name that contains traced modules
+                               information. File can be produced by either
+                               the
+                               :py:meth:`putil.pinspect.Callables.save` or
+                               :py:meth:`putil.exh.ExHandle.save_callables`
+                               methods
+    :type  in_callables_fname: :ref:`FileNameExists` or None
+
+    :param out_callables_fname: File name to save traced modules information
+                                to in `JSON <http://www.json.org/>`_ format.
+                                If the file exists it is overwritten
+    :type  out_callables_fname: :ref:`FileNameExists` or None
+
+    :raises:
+     * OSError (File *[in_callables_fname]* could not be found)
+
+     * RuntimeError (Argument \`in_callables_fname\` is not valid)
+
+     * RuntimeError (Argument \`exclude\` is not valid)
+
+     * RuntimeError (Argument \`out_callables_fname\` is not valid)
+
+     * RuntimeError (Argument \`pickle_fname\` is not valid)
+
+     * RuntimeError (Asynchronous context manager requires Python 3.7 or
+       newer)
+
+    For example (inside a coroutine):
+
+    .. code-block:: python
+
+        async with putil.exdoc.AsyncExDocCxt() as exdoc_obj:
+            await my_coroutine()
+        print(exdoc_obj.get_sphinx_doc('my_module.my_coroutine'))
+    """
+    def __init__(
+        self,
+        exclude=None,
+        _no_print=True,
+        pickle_fname=None,
+        in_callables_fname=None,
+        out_callables_fname=None
+    ):
+        if putil.exh._CONTEXT_EXH is None:
+            raise RuntimeError(
+                'Asynchronous context manager requires Python 3.7 or newer'
+            )
+        super(AsyncExDocCxt, self).__init__(
+            exclude,
+            _no_print,
+            pickle_fname,
+            in_callables_fname,
+            out_callables_fname
+        )
+        self._exh_cxt = putil.exh.ExHandleCxt(self._exhobj)
+
+    def __aenter__(self):
+        self._exh_cxt.__enter__()
+        return _Awaitable(self._exdoc_obj)
+
+    def __aexit__(self, exc_type, exc_value, exc_tb):
+        self._exh_cxt.__exit__(exc_type, exc_value, exc_tb)
+        if exc_type is None:
+            # Exceptions registered while building the exceptions tree go
+            # to a scratch exception handler
+            with putil.exh.ExHandleCxt():
+                self._build_exdoc(self._exhobj)
+        return _Awaitable(False)
+
+
+class ExDocCxt(_BaseExDocCxt):
     r"""
     Context manager to simplify exception tracing; it sets up the
     tracing environment and returns a :py:class:`putil.exdoc.ExDoc`
@@ -139,42 +296,19 @@ class ExDocCxt(object):
         in_callables_fname=None,
         out_callables_fname=None
     ):
-        # Validate aguments
-        if (exclude is not None) and (not isinstance(exclude, list)):
-            raise RuntimeError('Argument `exclude` is not valid')
-        _validate_fname(pickle_fname, 'pickle_fname')
-        _validate_fname(in_callables_fname, 'in_callables_fname')
-        _validate_fname(out_callables_fname, 'out_callables_fname')
-        if ((in_callables_fname is not None) and
-           (not os.path.exists(in_callables_fname))):
-            raise OSError(
-                'File {0} could not be found'.format(in_callables_fname)
-            )
-        if not isinstance(_no_print, bool):
-            raise RuntimeError('Argument `_no_print` is not valid')
-        # Need to have an exception handler with full_cname=True and clean
-        # the slate for the trace. If there is an existing handler copy it
-        # to a temporary variable and copy it back/restore it upon exit
-        self._pickle_fname = pickle_fname
-        self._pickle_dict = {}
+        super(ExDocCxt, self).__init__(
+            exclude,
+            _no_print,
+            pickle_fname,
+            in_callables_fname,
+            out_callables_fname
+        )
+        # If there is an existing handler copy it to a temporary variable
+        # and copy it back/restore it upon exit
         self._existing_exhobj = None
-        self._out_callables_fname = out_callables_fname
         if putil.exh.get_exh_obj() is not None:
             self._existing_exhobj = copy.copy(putil.exh.get_exh_obj())
-        putil.exh.set_exh_obj(
-            putil.exh.ExHandle(
-                full_cname=True,
-                exclude=exclude,
-                callables_fname=in_callables_fname
-            )
-        )
-        # Create a dummy ExDoc object. It has to be created here so that
-        # it can be returned by the context in the '[...] as [...]' clause.
-        # The actual (valid) contents of this object are loaded upon
-        # context exit
-        self._exdoc_obj = putil.exdoc.ExDoc(
-            exh_obj=putil.exh.ExHandle(), _empty=True, _no_print=_no_print
-        )
+        putil.exh.set_exh_obj(self._exhobj)
         # Pass exclude list to all processes. For multi-CPU trace runs
         # via py.test (using the xdist plug-in) this is picked up in the
         # ../tests/conftest.py file
@@ -194,29 +328,17 @@ class ExDocCxt(object):
         # __builtin__._EXH_LIST. For py.test-based tracing, the code to
         # do this is in ../tests/conftest.py
         if hasattr(__builtin__, '_EXH_LIST') and __builtin__._EXH_LIST:
-            exhobj = copy.copy(__builtin__._EXH_LIST[0])
-            for obj in __builtin__._EXH_LIST[1:]:
-                exhobj += obj
-            self._pickle_dict['_EXH_LIST'] = copy.copy(__builtin__._EXH_LIST)
+            exhobj = putil.exh.merge_exh_objs(__builtin__._EXH_LIST)
+            self._pickle_dict['_EXH_LIST'] = __builtin__._EXH_LIST
             delattr(__builtin__, '_EXH_LIST')
         else:
             exhobj = putil.exh.get_exh_obj()
         delattr(__builtin__, '_EXDOC_EXCLUDE')
         delattr(__builtin__, '_EXDOC_FULL_CNAME')
         delattr(__builtin__, '_EXDOC_CALLABLES_FNAME')
-        if self._out_callables_fname is not None:
-            exhobj.save_callables(self._out_callables_fname)
-        self._exdoc_obj._exh_obj = copy.copy(exhobj)
-        self._pickle_dict['exhobj'] = copy.copy(exhobj)
         # Delete all traced exceptions
         putil.exh.del_exh_obj()
-        # Generate exceptions database
-        self._exdoc_obj._build_ex_tree()
-        self._exdoc_obj._build_module_db()
-        self._pickle_dict['exdoc'] = copy.copy(self._exdoc_obj)
-        if self._pickle_fname is not None:
-            with open(self._pickle_fname, 'wb') as fobj:
-                pickle.dump(self._pickle_dict, fobj)
+        self._build_exdoc(exhobj)
         # Delete exceptions from exception tree building. The _build_ex_tree()
         # method uses the tree module, which in turn uses the ExDoc class, so
         # there will be exceptions registered in a global exception handler
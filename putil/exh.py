@@ -10,11 +10,18 @@ import imp
 import inspect
 import itertools
 import os
+import re
 import sys
+import threading
+import timeit
 if sys.hexversion < 0x03000000: # pragma: no cover
     import __builtin__
 else: # pragma: no cover
     import builtins as __builtin__
+try:    # pragma: no cover
+    from contextvars import ContextVar
+except ImportError: # pragma: no cover
+    ContextVar = None
 # PyPI imports
 import decorator
 # Putil imports
@@ -28,11 +35,37 @@ import putil.pinspect
 ###
 # Global variables
 ###
-_BREAK_LIST = ['_pytest']
+# The callable path stops at the test runner or, in asynchronous code, at
+# the event loop, i.e. the coroutine of an asyncio task is the first
+# callable of the path
+_BREAK_LIST = ['_pytest', 'asyncio']
+# File name of the code generated by putil.pcontracts to check contracts,
+# frames of generated code are not part of callable paths
+_CODEGEN_FNAME = '<putil.pcontracts>'
 _INVALID_MODULES_LIST = [
     os.path.join('putil', 'exh.py'),
     os.path.join('putil', 'exdoc.py')
 ]
+# Frame validity decisions, keyed by file name. Entries expire so that
+# files created or deleted afterwards are eventually picked up, and the
+# cache is emptied when it reaches its maximum size
+_INVALID_FRAME_CACHE = {}
+_INVALID_FRAME_CACHE_SIZE = 1024
+_INVALID_FRAME_CACHE_TTL = 1.0
+_FIELD_REGEXP = re.compile(r'\*\[(.*?)\]\*')
+# Fields of the per-callable statistics
+_STATS_FIELDS = ['registrations', 'raised', 'path_time', 'raise_time']
+# Per-thread exception handlers, only the (infrequent) merges of a
+# per-thread exception handler into the global exception handler are
+# serialized
+_THREAD_EXH = threading.local()
+_THREAD_EXH_LOCK = threading.Lock()
+# Exception handler set by the ExHandleCxt context manager. It is scoped to
+# the current execution context (i.e. asyncio task) where the contextvars
+# module is available, otherwise it is scoped to the current thread
+_CONTEXT_EXH = (
+    None if ContextVar is None else ContextVar('putil_exh', default=None)
+)
 
 ###
 # Functions
@@ -61,13 +94,53 @@ def _build_exclusion_list(exclude):
     return mod_files
 
 
+def _compile_msg(msg):
+    """
+    Parses an exception message into a template, a tuple of message chunks
+    where the odd items are the message fields, and a dictionary of the
+    positions in the template of each field
+    """
+    parts = _FIELD_REGEXP.split(msg)
+    fields = {}
+    for num in range(1, len(parts), 2):
+        fields.setdefault(parts[num], []).append(num)
+        parts[num] = '*[{0}]*'.format(parts[num])
+    return tuple(parts), fields
+
+
+def _get_frame_key(fobj, uobj):
+    """
+    Returns the key that determines the full name of the callable that
+    corresponds to a stack frame: code object, line being executed, class of
+    the object the callable is bound to (class properties) and unwrapped
+    callable object (callables without a file, i.e. doctests)
+    """
+    scontext = fobj.f_locals.get('self', None)
+    return (
+        fobj.f_code,
+        fobj.f_lineno,
+        scontext.__class__ if scontext is not None else None,
+        uobj
+    )
+
+
 def _invalid_frame(fobj):
     """ Selects valid stack frame to process """
+    # Whether a frame is valid or not only depends on its file name, so
+    # the decision is cached to avoid a file system access every time an
+    # exception is registered from the same module
     fin = fobj.f_code.co_filename
-    invalid_module = any(
-        [fin.endswith(item) for item in _INVALID_MODULES_LIST]
+    now = timeit.default_timer()
+    entry = _INVALID_FRAME_CACHE.get(fin)
+    if (entry is not None) and (entry[1] > now):
+        return entry[0]
+    if len(_INVALID_FRAME_CACHE) >= _INVALID_FRAME_CACHE_SIZE:
+        _INVALID_FRAME_CACHE.clear()
+    ret = any([fin.endswith(item) for item in _INVALID_MODULES_LIST]) or (
+        not os.path.isfile(fin)
     )
-    return invalid_module or (not os.path.isfile(fin))
+    _INVALID_FRAME_CACHE[fin] = (ret, now+_INVALID_FRAME_CACHE_TTL)
+    return ret
 
 
 def _isiterable(obj):
@@ -83,34 +156,70 @@ def _isiterable(obj):
         return True
 
 
-def _merge_cdicts(self, clut, exdict, separator):
-    """ Merge exception dictionaries from two objects """
-    if not self._full_cname:
-        return
-    # Find all callables that are not in self exceptions dictionary
-    # and create new tokens for them
+def _merge_exh_objs(robj, objs):
+    """
+    Merge exception handlers into an exception handler. The callables
+    look-up table and the callable paths of each handler are re-mapped
+    once, exceptions defined in more than one handler are combined
+    """
+    for obj in objs:
+        if ((robj._full_cname != obj._full_cname) or
+           (robj._exclude != obj._exclude)):
+            raise RuntimeError('Incompatible exception handlers')
+        path_ids = _remap_paths(robj, obj)
+        for func_id, fdict in obj._ex_dict.items():
+            rfdict = robj._ex_dict.setdefault(func_id, {})
+            for key, entry in fdict.items():
+                rentry = rfdict.get(key, None)
+                if rentry is None:
+                    rentry = {'function':{}, 'name':entry['name'], 'raised':0}
+                    rfdict[key] = rentry
+                rfuncs = rentry['function']
+                iobj = sorted(entry['function'].items(), key=lambda x: x[1])
+                for path_id, pos in iobj:
+                    rpos = rfuncs.setdefault(path_ids[path_id], len(rfuncs))
+                    if entry['raised'] & (1 << pos):
+                        rentry['raised'] |= 1 << rpos
+        robj._callables_obj += obj._callables_obj
+        if (robj._stats is not None) and obj._stats:
+            for name, entry in obj._stats.items():
+                rentry = robj._stats.get(name, None)
+                if rentry is None:
+                    robj._stats[name] = entry.copy()
+                else:
+                    for key in _STATS_FIELDS:
+                        rentry[key] += entry[key]
+    # Merged exceptions may replace cached exception entries
+    robj._exobj_cache = {}
+    return robj
+
+
+def _remap_paths(robj, obj):
+    """
+    Returns a list that maps the callable path identifiers of an exception
+    handler to those of the exception handler it is merged into
+    """
+    # Find all callables that are not in the destination exception handler
+    # callables look-up table and create new tokens for them. Tokens are
+    # processed in the order they were created so that merging into an
+    # empty exception handler preserves them
+    separator = obj._callables_separator
     repl_dict = {}
-    for key, value in clut.items():
-        otoken = self._clut.get(key, None)
+    for key, value in sorted(obj._clut.items(), key=lambda x: int(x[1])):
+        otoken = robj._clut.get(key, None)
         if not otoken:
-            otoken = str(len(self._clut))
-            self._clut[key] = otoken
+            otoken = str(len(robj._clut))
+            robj._clut[key] = otoken
         repl_dict[value] = otoken
-    # Update other dictionaries to the mapping to self
-    # exceptions dictionary
-    for fdict in exdict.values():
-        for entry in fdict.values():
-            olist = []
-            for item in entry['function']:
-                if item is None:
-                    # Callable name is None when callable is
-                    # part of exclude list
-                    olist.append(None)
-                else:
-                    itokens = item.split(separator)
-                    itokens = [repl_dict.get(itoken) for itoken in itokens]
-                    olist.append(separator.join(itokens))
-            entry['function'] = olist
+    ret = []
+    for path in obj._paths:
+        # Callable name is None when callable is part of exclude list
+        if path is not None:
+            path = separator.join(
+                [repl_dict[token] for token in path.split(separator)]
+            )
+        ret.append(robj._intern_path(path))
+    return ret
 
 
 def addex(extype, exmsg, condition=None, edata=None):
@@ -150,7 +259,9 @@ def addex(extype, exmsg, condition=None, edata=None):
                     <https://docs.python.org/2/library/stdtypes.html#
                     str.format>`_ string method
 
-                  If None no field replacement is done
+                  If None no field replacement is done. If a callable it is
+                  called (without arguments) only when the exception is
+                  raised and it has to return the replacement values
 
     :rtype: (if condition is not given or None) function
 
@@ -200,24 +311,39 @@ def addai(argname, condition=None):
     return obj.craise
 
 
-def del_exh_obj():
+def del_exh_obj(thread_local=False):
     """
     Deletes global exception handler (if set)
+
+    :param thread_local: Flag that indicates whether the exception handler
+                         of the calling thread (True) or the global exception
+                         handler (False) is deleted
+    :type  thread_local: boolean
     """
     try:
-        delattr(__builtin__, '_EXH')
+        delattr(_THREAD_EXH if thread_local else __builtin__, '_EXH')
     except AttributeError:
         pass
 
 
 def get_exh_obj():
     """
-    Returns the global exception handler
+    Returns the global exception handler. The exception handler of the
+    current context (see :py:class:`putil.exh.ExHandleCxt`) or of the
+    calling thread (see :py:func:`putil.exh.set_exh_obj`), in that order of
+    precedence, is returned instead if set
 
     :rtype: :py:class:`putil.exh.ExHandle` if global exception handler
             is set, None otherwise
     """
-    return getattr(__builtin__, '_EXH', None)
+    obj = (
+        getattr(_THREAD_EXH, '_CXT_EXH', None)
+        if _CONTEXT_EXH is None else
+        _CONTEXT_EXH.get()
+    )
+    if obj is None:
+        obj = getattr(_THREAD_EXH, '_EXH', None)
+    return getattr(__builtin__, '_EXH', None) if obj is None else obj
 
 
 def get_or_create_exh_obj(
@@ -262,29 +388,132 @@ def get_or_create_exh_obj(
 
      * RuntimeError (Argument \\`full_cname\\` is not valid)
     """
-    if not hasattr(__builtin__, '_EXH'):
-        set_exh_obj(
-            ExHandle(
-                full_cname=full_cname,
-                exclude=exclude,
-                callables_fname=callables_fname
-            )
+    obj = get_exh_obj()
+    if obj is None:
+        obj = ExHandle(
+            full_cname=full_cname,
+            exclude=exclude,
+            callables_fname=callables_fname
         )
-    return get_exh_obj()
+        set_exh_obj(obj)
+    return obj
+
+
+def merge_exh_objs(objs):
+    """
+    Merges exception handlers, for example the exception handlers of the
+    processes of a multi-CPU trace run. This is faster than merging the
+    exception handlers one at a time with the :code:`+` or :code:`+=`
+    operators because the exception handlers are not copied and the callables
+    look-up table of each exception handler is re-mapped only once
+
+    :param objs: Exception handlers to merge
+    :type  objs: list of :py:class:`putil.exh.ExHandle` objects
+
+    :rtype: :py:class:`putil.exh.ExHandle`
+
+    :raises:
+     * RuntimeError (Argument \\`objs\\` is not valid)
+
+     * RuntimeError (Incompatible exception handlers)
+
+    For example:
+
+        >>> import copy, putil.exh, putil.eng, putil.tree
+        >>> exhobj = putil.exh.set_exh_obj(putil.exh.ExHandle())
+        >>> putil.eng.peng(100, 3, True)
+        ' 100.000 '
+        >>> obj1 = copy.copy(putil.exh.get_exh_obj())
+        >>> putil.exh.del_exh_obj()
+        >>> exhobj = putil.exh.get_or_create_exh_obj()
+        >>> tobj = putil.tree.Tree().add_nodes([{'name':'a', 'data':5}])
+        >>> obj2 = copy.copy(putil.exh.get_exh_obj())
+        >>> putil.exh.merge_exh_objs([obj1, obj2]) == obj1+obj2
+        True
+    """
+    if ((not isinstance(objs, list)) or (not objs) or
+       any([not isinstance(obj, ExHandle) for obj in objs])):
+        raise RuntimeError('Argument `objs` is not valid')
+    robj = ExHandle(
+        full_cname=objs[0]._full_cname,
+        exclude=objs[0]._exclude,
+        stats=objs[0]._stats is not None,
+        _copy=True
+    )
+    robj._exclude_list = objs[0]._exclude_list[:]
+    robj._callables_obj = putil.pinspect.Callables()
+    return _merge_exh_objs(robj, objs)
+
+
+def merge_thread_exh_obj():
+    """
+    Merges the exception handler of the calling thread (if set) into the
+    global exception handler and deletes it. If the global exception handler
+    is not set the exception handler of the calling thread becomes the
+    global exception handler. Merges from different threads are serialized
+
+    :rtype: :py:class:`putil.exh.ExHandle` (global exception handler) or None
+            if the exception handler of the calling thread is not set
+
+    :raises: RuntimeError (Incompatible exception handlers)
+
+    For example:
+
+        >>> import threading, putil.exh, putil.tree
+        >>> def func(name):
+        ...     putil.exh.set_exh_obj(putil.exh.ExHandle(), thread_local=True)
+        ...     try:
+        ...         tobj = putil.tree.Tree().add_nodes(
+        ...             [{'name':name, 'data':5}]
+        ...         )
+        ...     finally:
+        ...         exhobj = putil.exh.merge_thread_exh_obj()
+        >>> putil.exh.del_exh_obj()
+        >>> threads = [
+        ...     threading.Thread(target=func, args=(name, ))
+        ...     for name in ['a', 'b']
+        ... ]
+        >>> for thread in threads:
+        ...     thread.start()
+        >>> for thread in threads:
+        ...     thread.join()
+        >>> putil.exh.get_exh_obj() is not None
+        True
+    """
+    obj = getattr(_THREAD_EXH, '_EXH', None)
+    if obj is None:
+        return None
+    with _THREAD_EXH_LOCK:
+        gobj = getattr(__builtin__, '_EXH', None)
+        if gobj is None:
+            setattr(__builtin__, '_EXH', obj)
+        else:
+            _merge_exh_objs(gobj, [obj])
+    del_exh_obj(thread_local=True)
+    return getattr(__builtin__, '_EXH')
 
 
-def set_exh_obj(obj):
+def set_exh_obj(obj, thread_local=False):
     """
     Sets the global exception handler
 
     :param obj: Exception handler
     :type  obj: :py:class:`putil.exh.ExHandle`
 
+    :param thread_local: Flag that indicates whether the exception handler is
+                         set only for the calling thread (True) or globally
+                         (False). A thread with its own exception handler does
+                         not share the global exception handler with other
+                         threads, its exception handler can be merged into
+                         the global exception handler with
+                         :py:func:`putil.exh.merge_thread_exh_obj`
+    :type  thread_local: boolean
+
     :raises: RuntimeError (Argument \\`obj\\` is not valid)
     """
     if not isinstance(obj, ExHandle):
         raise RuntimeError('Argument `obj` is not valid')
-    setattr(__builtin__, '_EXH', obj)
+    setattr(_THREAD_EXH if thread_local else __builtin__, '_EXH', obj)
 
 
 ###
@@ -327,9 +556,11 @@ class _ExObj(object):
                     <https://docs.python.org/2/library/stdtypes.html#
                     str.format>`_ string method
 
-                  If None no field replacement is done
+                  If None no field replacement is done. If a callable it is
+                  called (without arguments) only when the exception is
+                  raised and it has to return the replacement values
 
-    :type  edata: dictionary, iterable of dictionaries or None
+    :type  edata: dictionary, iterable of dictionaries, callable or None
 
     :param exclude: Module exclusion list. A particular callable in an
                     otherwise fully qualified name is omitted if it belongs
@@ -376,15 +607,53 @@ class _ExObj(object):
         self._exh = get_or_create_exh_obj(
             exclude=exclude, callables_fname=callables_fname
         )
-        next(self._count)
+        # When the full callable name is not used an exception is uniquely
+        # identified by the code object of the callable that registers it,
+        # the exception type and the exception message, so registrations
+        # from the same call site can re-use the exception already added
+        # to the handler
+        key = None
+        if not self._exh._full_cname:
+            start = (
+                timeit.default_timer() if self._exh._stats is not None else 0
+            )
+            frame = sys._getframe(1)
+            while _invalid_frame(frame):
+                frame = frame.f_back
+            key = (frame.f_code, extype, exmsg)
+            del frame
+            try:
+                self._exname, self._ex_data = self._exh._exobj_cache[key]
+            except KeyError:
+                pass
+            except TypeError:
+                # Unhashable argument, validated (and rejected) by the
+                # add_exception method
+                key = None
+            else:
+                if self._exh._stats is not None:
+                    self._exh._update_stats(
+                        self._ex_data[3],
+                        registrations=1,
+                        path_time=timeit.default_timer()-start
+                    )
+                if condition is not None:
+                    self._exh.raise_exception_if(
+                        self._exname, condition, edata, _keys=self._ex_data
+                    )
+                return
         self._exname = '__exobj_pid_{0}_ex{1}__'.format(
-            os.getpid(), self._count
+            os.getpid(), next(self._count)
         )
         self._ex_data = self._exh.add_exception(
             self._exname, extype, exmsg
         )
+        if key is not None:
+            self._exh._exobj_cache[key] = (self._exname, self._ex_data)
         if condition is not None:
-            self.craise(condition, edata)
+            self._exh.raise_exception_if(
+                self._exname, condition, edata, _keys=self._ex_data
+            )
 
     def craise(self, condition, edata=None):
         """
@@ -406,8 +675,11 @@ class _ExObj(object):
                         <https://docs.python.org/2/library/stdtypes.html#
                         str.format>`_ string method
 
-                      If None no field replacement is done
-        :type  edata: dictionary, iterable of dictionaries or None
+                      If None no field replacement is done. If a callable
+                      it is called (without arguments) only when the
+                      exception is raised and it has to return the
+                      replacement values
+        :type  edata: dictionary, iterable of dictionaries, callable or None
 
         :raises:
          * RuntimeError (Argument \\`condition\\` is not valid)
@@ -421,6 +693,10 @@ class _ExObj(object):
          * ValueError (Exception name *[name]* not found')
 
         """
+        # Most calls do not raise the exception, so return before any
+        # argument validation or exception look-up is done
+        if condition is False:
+            return
         self._exh.raise_exception_if(
             self._exname,
             condition,
@@ -459,9 +735,17 @@ class ExHandle(object):
                             File can be produced by either the
                             :py:meth:`putil.pinspect.Callables.save` or
                             :py:meth:`putil.exh.ExHandle.save_callables`
-                            methods
+                            methods. The information of each module in a
+                            binary file is read only when it is needed, so
+                            a binary file has to exist, unchanged, for the
+                            lifetime of the exception handler
     :type  callables_fname: :ref:`FileNameExists` or None
 
+    :param stats: Flag that indicates whether exception registration and
+                  raising statistics are collected (True) or not (False).
+                  See :py:meth:`putil.exh.ExHandle.stats`
+    :type  stats: boolean
+
     :rtype: :py:class:`putil.exh.ExHandle`
 
     :raises:
@@ -473,20 +757,41 @@ class ExHandle(object):
 
      * RuntimeError (Argument \\`full_cname\\` is not valid)
 
+     * RuntimeError (Argument \\`stats\\` is not valid)
+
      * ValueError (Source for module *[module_name]* could not be found)
     """
     # pylint: disable=R0902,W0703
     def __init__(
-        self, full_cname=False, exclude=None, callables_fname=None, _copy=False
+        self, full_cname=False, exclude=None, callables_fname=None,
+        stats=False, _copy=False
     ):
         if not isinstance(full_cname, bool):
             raise RuntimeError('Argument `full_cname` is not valid')
+        if not isinstance(stats, bool):
+            raise RuntimeError('Argument `stats` is not valid')
         if ((exclude and (not isinstance(exclude, list))) or
            (isinstance(exclude, list) and
            any([not isinstance(item, str) for item in exclude]))):
             raise RuntimeError('Argument `exclude` is not valid')
         self._ex_dict = {}
+        # Callable paths are interned, exception entries refer to them by
+        # their index in the callable paths list
+        self._paths = [None]
+        self._path_ids = {None:0}
+        self._exobj_cache = {}
+        self._cname_cache = {}
+        self._cpath_cache = {}
+        self._class_props_cache = {}
+        # Exception messages are parsed once, when the exception is added,
+        # into templates keyed by exception definition (type and message)
+        self._msg_templates = {}
         self._clut = {}
+        # Statistics are kept per name of the callable that registers
+        # exceptions, None when statistics are not collected. The names of
+        # encoded callable paths are cached
+        self._stats = {} if stats else None
+        self._stats_names = {}
         self._callables_separator = '/'
         self._full_cname = full_cname
         self._exclude = exclude
@@ -495,7 +800,7 @@ class ExHandle(object):
         if not _copy:
             self._callables_obj = putil.pinspect.Callables()
             if callables_fname is not None:
-                self._callables_obj.load(callables_fname)
+                self._callables_obj.load(callables_fname, lazy=True)
             self._exclude_list = _build_exclusion_list(exclude)
 
     def __add__(self, other):
@@ -539,21 +844,7 @@ class ExHandle(object):
                 'Unsupported operand type(s) for +: putil.exh.ExHandle and '+
                 stype[offset:-2]
             )
-        if ((self._full_cname != other._full_cname) or
-           (self._exclude != other._exclude)):
-            raise RuntimeError('Incompatible exception handlers')
-        robj = ExHandle(
-            full_cname=self._full_cname, exclude=self._exclude, _copy=True
-        )
-        ex_dict = copy.deepcopy(other._ex_dict)
-        robj._ex_dict = copy.deepcopy(self._ex_dict)
-        robj._clut = copy.deepcopy(self._clut)
-        _merge_cdicts(robj, other._clut, ex_dict, other._callables_separator)
-        robj._ex_dict.update(ex_dict)
-        robj._callables_obj = (
-            copy.copy(self._callables_obj)+copy.copy(other._callables_obj)
-        )
-        return robj
+        return merge_exh_objs([self, other])
 
     def __bool__(self): # pragma: no cover
         """
@@ -600,6 +891,10 @@ class ExHandle(object):
             full_cname=self._full_cname, exclude=self._exclude, _copy=True
         )
         cobj._ex_dict = copy.deepcopy(self._ex_dict)
+        cobj._stats = copy.deepcopy(self._stats)
+        cobj._msg_templates = self._msg_templates.copy()
+        cobj._paths = self._paths[:]
+        cobj._path_ids = self._path_ids.copy()
         cobj._clut = copy.deepcopy(self._clut)
         cobj._exclude_list = self._exclude_list[:]
         cobj._callables_obj = copy.copy(self._callables_obj)
@@ -627,6 +922,20 @@ class ExHandle(object):
             (sorted(self._clut) == sorted(other._clut))
         )
 
+    def __getstate__(self):
+        """
+        Returns object state for pickling. The exception registration and
+        callable name caches are keyed by code and class objects, which
+        cannot (always) be pickled, so they are omitted
+        """
+        state = self.__dict__.copy()
+        state['_exobj_cache'] = {}
+        state['_cname_cache'] = {}
+        state['_cpath_cache'] = {}
+        state['_class_props_cache'] = {}
+        state['_msg_templates'] = {}
+        return state
+
     def __iadd__(self, other):
         """
         Merges an object into an existing object.
@@ -669,14 +978,7 @@ class ExHandle(object):
                 'Unsupported operand type(s) for +: putil.exh.ExHandle and '+
                 stype[offset:-2]
             )
-        if ((self._full_cname != other._full_cname) or
-           (self._exclude != other._exclude)):
-            raise RuntimeError('Incompatible exception handlers')
-        ex_dict = copy.deepcopy(other._ex_dict)
-        _merge_cdicts(self, other._clut, ex_dict, other._callables_separator)
-        self._ex_dict.update(ex_dict)
-        self._callables_obj += copy.copy(other._callables_obj)
-        return self
+        return _merge_exh_objs(self, [other])
 
     def __nonzero__(self):  # pragma: no cover
         """
@@ -763,26 +1065,38 @@ class ExHandle(object):
         for _, fdict in self._ex_dict.items():
             for (extype, exmsg), value in fdict.items():
                 key = value['name']
-                odict[key] = copy.deepcopy(value)
-                del odict[key]['name']
-                odict[key]['type'] = extype
-                odict[key]['msg'] = exmsg
+                flist = self._get_entry_functions(value)
+                odict[key] = {
+                    'function':[func_name for func_name, _ in flist],
+                    'raised':[raised for _, raised in flist],
+                    'type':extype,
+                    'msg':exmsg
+                }
         return odict
 
-    def _format_msg(self, msg, edata):
+    def _format_msg(self, key, edata):
         """ Substitute parameters in exception message """
+        template = self._msg_templates.get(key, None)
+        if template is None:
+            # Exception added by a merged or un-pickled exception handler
+            template = self._msg_templates[key] = _compile_msg(key[1])
+        parts, fields = template
+        parts = list(parts)
         edata = edata if isinstance(edata, list) else [edata]
+        done = set()
         for fdict in edata:
-            if '*[{token}]*'.format(token=fdict['field']) not in msg:
+            field = fdict['field']
+            if (field not in fields) or (field in done):
                 raise RuntimeError(
                     'Field {token} not in exception message'.format(
-                        token=fdict['field']
+                        token=field
                     )
                 )
-            msg = msg.replace(
-                '*[{token}]*'.format(token=fdict['field']), '{value}'
-            ).format(value=fdict['value'])
-        return msg
+            done.add(field)
+            value = '{0}'.format(fdict['value'])
+            for num in fields[field]:
+                parts[num] = value
+        return ''.join(parts)
 
     def _get_callables_db(self):
         """ Returns database of callables """
@@ -793,6 +1107,21 @@ class ExHandle(object):
         Get full path [module, class (if applicable) and function name]
         of callable
         """
+        key = _get_frame_key(fob, uobj)
+        try:
+            return self._cname_cache[key]
+        except KeyError:
+            ret = self._cname_cache[key] = self._resolve_callable_full_name(
+                fob, fin, uobj
+            )
+            del fob, uobj, key
+            return ret
+
+    def _resolve_callable_full_name(self, fob, fin, uobj):
+        """
+        Resolve full path [module, class (if applicable) and function name]
+        of callable
+        """
         # Check if object is a class property
         name = self._property_search(fob)
         if name:
@@ -822,9 +1151,12 @@ class ExHandle(object):
        (int(decorator.__version__.split('.')[0]) == 3)):   # pragma: no cover
         # Method works with decorator 3.x series
         def _get_callable_path(self):
-            """ Get fully qualified calling function name """
+            """
+            Get code object and fully qualified name of calling function
+            """
             # If full_cname is False, then the only thing that matters is to
-            # return the ID of the calling function as fast as possible. If
+            # return the code object, whose ID identifies the calling
+            # function, as fast as possible. If
             # full_cname is True, the full calling path has to be calculated
             # because multiple callables can call the same callable, thus the
             # ID does not uniquely identify the callable path
@@ -832,35 +1164,37 @@ class ExHandle(object):
             frame = sys._getframe(fnum)
             while _invalid_frame(frame):
                 fnum += 1
-                frame = sys._getframe(fnum)
-            callable_id = id(frame.f_code)
+                frame = frame.f_back
+            code = frame.f_code
             if not self._full_cname:
                 del frame
-                return callable_id, None
+                return code, None
             # Filter stack to omit frames that are part of the exception
             # handling module, argument validation, or top level (tracing)
-            # module Stack frame -> (frame object [0], filename [1], line
-            # number of current line [2], function name [3], list of lines
-            # of context from source code [4], index of current line within
-            # list [5]) Classes initialization appear as:
-            # filename = '<string>', function name = '__init__', list of lines
-            # of context from source code = None, index of current line within
-            # list = None
+            # module. Frame information is obtained directly from the frame
+            # and code objects, inspect.getframeinfo is not used because it
+            # reads the source code context from disk. Classes
+            # initialization appear as: filename = '<string>', function
+            # name = '__init__', current line = 2
             stack = []
             ### Check to see if path has modules in exclude list
-            fin, lin, fun, fuc, fui = inspect.getframeinfo(frame)
+            fin, lin, fun = (
+                frame.f_code.co_filename,
+                frame.f_lineno,
+                frame.f_code.co_name
+            )
             uobj, ufin = self._unwrap_obj(frame, fun)
             if ufin in self._exclude_list:
                 del uobj, frame
-                return callable_id, None
-            tokens = frame.f_code.co_filename.split(os.sep)
+                return code, None
+            tokens = fin.split(os.sep)
             ###
             while not any([token.startswith(item)
                   for token in tokens for item in _BREAK_LIST]):
                 # Gobble up two frames if it is a decorator. 4th stack list
                 # tuple element (index 3) indicates whether the frame
                 # corresponds to a decorator or not
-                if (fin, lin, fuc, fui) == ('<string>', 2, None, None):
+                if (fin, lin) == ('<string>', 2):
                     stack.pop()
                     if stack:
                         stack[-1][3] = True
@@ -873,38 +1207,57 @@ class ExHandle(object):
                     break
                 ### Check to see if path has modules in exclude list
                 # Repeated to avoid an expensive function call
-                fin, lin, fun, fuc, fui = inspect.getframeinfo(frame)
+                fin, lin, fun = (
+                    frame.f_code.co_filename,
+                    frame.f_lineno,
+                    frame.f_code.co_name
+                )
                 uobj, ufin = self._unwrap_obj(frame, fun)
                 if ufin in self._exclude_list:
                     del uobj, frame, stack
-                    return callable_id, None
-                tokens = frame.f_code.co_filename.split(os.sep)
+                    return code, None
+                tokens = fin.split(os.sep)
                 ###
             # Stack is from most recent frame out, fully qualified
             # callable path is from first callable to lat callable
             stack.reverse()
-            # Decorator flag vector
-            idv = [item[3] for item in stack]
-            # Fully qualified callable path construction
-            ret = list(
-                self._get_callable_full_name(fob, fin, uobj)
-                for fob, fin, uobj, _ in stack
+            # The fully qualified callable path only depends on the names
+            # of the callables in the stack (and on whether they are part of
+            # a decorator chain, which is determined by the frames), so it is
+            # cached by the name resolution keys of the frames
+            keys = tuple(
+                _get_frame_key(fob, uobj)+(in_decorator, )
+                for fob, _, uobj, in_decorator in stack
             )
-            # Eliminate callables that are in a decorator chain
-            iobj = enumerate(zip(ret[1:], ret, idv[1:]))
-            num_del_items = 0
-            for num, (name, prev_name, in_decorator) in iobj:
-                if in_decorator and (name == prev_name):
-                    del ret[num-num_del_items]
-                    num_del_items += 1
-            del uobj, frame, stack
-            return callable_id, self._callables_separator.join(ret)
+            ret = self._cpath_cache.get(keys, None)
+            if ret is None:
+                # Decorator flag vector
+                idv = [item[3] for item in stack]
+                # Fully qualified callable path construction
+                names = list(
+                    self._get_callable_full_name(fob, fin, uobj)
+                    for fob, fin, uobj, _ in stack
+                )
+                # Eliminate callables that are in a decorator chain
+                iobj = enumerate(zip(names[1:], names, idv[1:]))
+                num_del_items = 0
+                for num, (name, prev_name, in_decorator) in iobj:
+                    if in_decorator and (name == prev_name):
+                        del names[num-num_del_items]
+                        num_del_items += 1
+                ret = self._callables_separator.join(names)
+                self._cpath_cache[keys] = ret
+            del uobj, frame, stack, keys
+            return code, ret
     else:   # pragma: no cover
         # Method works with decorator 4.x series
         def _get_callable_path(self):
-            """ Get fully qualified calling function name """
+            """
+            Get code object and fully qualified name of calling function
+            """
             # If full_cname is False, then the only thing that matters is to
-            # return the ID of the calling function as fast as possible. If
+            # return the code object, whose ID identifies the calling
+            # function, as fast as possible. If
             # full_cname is True, the full calling path has to be calculated
             # because multiple callables can call the same callable, thus the
             # ID does not uniquely identify the callable path
@@ -912,28 +1265,24 @@ class ExHandle(object):
             frame = sys._getframe(fnum)
             while _invalid_frame(frame):
                 fnum += 1
-                frame = sys._getframe(fnum)
-            callable_id = id(frame.f_code)
+                frame = frame.f_back
+            code = frame.f_code
             if not self._full_cname:
                 del frame
-                return callable_id, None
+                return code, None
             # Filter stack to omit frames that are part of the exception
             # handling module, argument validation, or top level (tracing)
-            # module Stack frame -> (frame object [0], filename [1], line
-            # number of current line [2], function name [3], list of lines
-            # of context from source code [4], index of current line within
-            # list [5]) Classes initialization appear as:
-            # filename = '<string>', function name = '__init__', list of lines
-            # of context from source code = None, index of current line within
-            # list = None
+            # module. Frame information is obtained directly from the frame
+            # and code objects, inspect.getframeinfo is not used because it
+            # reads the source code context from disk
             stack = []
             ### Check to see if path has modules in exclude list
-            fin, _, fun, _, _ = inspect.getframeinfo(frame)
+            fin, fun = frame.f_code.co_filename, frame.f_code.co_name
             uobj, ufin = self._unwrap_obj(frame, fun)
             if ufin in self._exclude_list:
                 del uobj, frame
-                return callable_id, None
-            tokens = frame.f_code.co_filename.split(os.sep)
+                return code, None
+            tokens = fin.split(os.sep)
             ###
             while not any([token.startswith(item)
                   for token in tokens for item in _BREAK_LIST]):
@@ -946,32 +1295,52 @@ class ExHandle(object):
                     break
                 ### Check to see if path has modules in exclude list
                 # Repeated to avoid an expensive function call
-                fin, _, fun, _, _ = inspect.getframeinfo(frame)
+                fin, fun = frame.f_code.co_filename, frame.f_code.co_name
                 uobj, ufin = self._unwrap_obj(frame, fun)
                 if ufin in self._exclude_list:
                     del uobj, frame, stack
-                    return callable_id, None
-                tokens = frame.f_code.co_filename.split(os.sep)
+                    return code, None
+                tokens = fin.split(os.sep)
                 ###
             # Stack is from most recent frame out, fully qualified
             # callable path is from first callable to lat callable
             stack.reverse()
-            # Fully qualified callable path construction (exclude
-            # pcontracts decorators)
-            ret = []
-            skip = 0
-            dlist = ['putil.pcontracts', 'putil.pcontracts.contract.wrapper']
-            for fob, fin, uobj in stack:
-                if skip > 0:
-                    skip -= 1
-                else:
-                    item = self._get_callable_full_name(fob, fin, uobj)
-                    if item in dlist:
-                        skip = 3
+            # The fully qualified callable path only depends on the names
+            # of the callables in the stack, so it is cached by the name
+            # resolution keys of the frames
+            keys = tuple(_get_frame_key(fob, uobj) for fob, _, uobj in stack)
+            ret = self._cpath_cache.get(keys, None)
+            if ret is None:
+                # Fully qualified callable path construction (exclude
+                # pcontracts decorators)
+                names = []
+                skip = 0
+                dlist = [
+                    'putil.pcontracts', 'putil.pcontracts.contract.wrapper'
+                ]
+                for num, (fob, fin, uobj) in enumerate(stack):
+                    if skip > 0:
+                        skip -= 1
                     else:
-                        ret.append(item)
-            del fob, uobj, frame, stack
-            return callable_id, self._callables_separator.join(ret)
+                        item = self._get_callable_full_name(fob, fin, uobj)
+                        if item in dlist:
+                            # PyContracts adds two frames (decorator and
+                            # checker) before the decorated callable, when
+                            # a generated checker validates the arguments
+                            # the decorated callable is called from
+                            # generated code instead
+                            skip = (
+                                2
+                                if (num+2 < len(stack)) and
+                                (stack[num+2][1] == _CODEGEN_FNAME) else
+                                3
+                            )
+                        else:
+                            names.append(item)
+                ret = self._callables_separator.join(names)
+                self._cpath_cache[keys] = ret
+            del uobj, frame, stack, keys
+            return code, ret
 
     def _get_callables_separator(self):
         """ Get callable separator character """
@@ -996,7 +1365,7 @@ class ExHandle(object):
                             'data':template.format(
                                 extype=_ex_type_str(key[0]),
                                 exmsg=key[1],
-                                raised='*' if fdict[key]['raised'][0] else ''
+                                raised='*' if fdict[key]['raised'] & 1 else ''
                             )
                         }
                     )
@@ -1005,9 +1374,8 @@ class ExHandle(object):
         ret = []
         for fdict in self._ex_dict.values():
             for key in fdict.keys():
-                for func_name in fdict[key]['function']:
-                    rindex = fdict[key]['function'].index(func_name)
-                    raised = fdict[key]['raised'][rindex]
+                flist = self._get_entry_functions(fdict[key])
+                for func_name, raised in flist:
                     ret.append(
                         {
                             'name':self.decode_call(func_name),
@@ -1020,24 +1388,42 @@ class ExHandle(object):
                     )
         return ret
 
+    def _get_entry_functions(self, entry):
+        """
+        Returns a list of tuples, (callable path, raised flag), of an
+        exception entry in the order the callable paths were added
+        """
+        iobj = sorted(entry['function'].items(), key=lambda item: item[1])
+        return [
+            (self._paths[path_id], bool(entry['raised'] & (1 << pos)))
+            for path_id, pos in iobj
+        ]
+
     def _get_ex_data(self):
-        """ Returns hierarchical function name """
-        func_id, func_name = self._get_callable_path()
+        """
+        Returns the identifier, hierarchical name and statistics name (None
+        if statistics are not collected) of the calling function
+        """
+        code, func_name = self._get_callable_path()
         if self._full_cname:
             func_name = self.encode_call(func_name)
-        return func_id, func_name
+        if self._stats is None:
+            return id(code), func_name, None
+        return id(code), func_name, self._get_stats_name(code, func_name)
 
-    def _property_search(self, fobj):
+    def _get_class_props(self, class_obj):
         """
-        Check if object is a class property and if so return full name,
-        otherwise return None
+        Returns a dictionary whose keys are the code identifiers of the
+        actions (getter, setter, deleter) of the properties of a class and
+        whose values are the actions full names. The dictionary is built once
+        per class and re-built if the module the class belongs to has been
+        re-traced since (i.e. by the callables database refresh method)
         """
-        # Get class object
-        scontext = fobj.f_locals.get('self', None)
-        class_obj = scontext.__class__ if scontext is not None else None
-        if not class_obj:
-            del fobj, scontext, class_obj
-            return
+        cache = self._class_props_cache.get(class_obj, None)
+        if (cache is not None) and (
+                (cache[0] is None) or
+                (cache[1] == self._get_module_date(cache[0]))):
+            return cache[2]
         # Get class properties objects
         class_props = [
             (member_name, member_obj)
@@ -1045,18 +1431,22 @@ class ExHandle(object):
             if isinstance(member_obj, property)
         ]
         if not class_props:
-            del fobj, scontext, class_obj
-            return
+            self._class_props_cache[class_obj] = (None, None, {})
+            return {}
         class_file = inspect.getfile(class_obj).replace('.pyc', '.py')
         class_name = self._callables_obj.get_callable_from_line(
             class_file,
             inspect.getsourcelines(class_obj)[1]
         )
         # Get properties actions
-        prop_actions_dicts = {}
+        desc_dict = {
+            'fget':'getter',
+            'fset':'setter',
+            'fdel':'deleter',
+        }
+        props_dict = {}
         for prop_name, prop_obj in class_props:
-            prop_dict = {'fdel':None, 'fget':None, 'fset':None}
-            for action in prop_dict.keys():
+            for action in ['fdel', 'fget', 'fset']:
                 action_obj = getattr(prop_obj, action)
                 if action_obj:
                     # Unwrap action object. Contracts match the wrapped
@@ -1072,33 +1462,74 @@ class ExHandle(object):
                             next_func_obj,
                             getattr(next_func_obj, '__wrapped__', None)
                         )
-                    prop_dict[action] = [
-                        id(_get_func_code(action_obj)),
-                        id(_get_func_code(prev_func_obj))
-                    ]
-            prop_actions_dicts[prop_name] = prop_dict
-        # Create properties directory
-        func_id = id(fobj.f_code)
-        desc_dict = {
-            'fget':'getter',
-            'fset':'setter',
-            'fdel':'deleter',
-        }
-        for prop_name, prop_actions_dict in prop_actions_dicts.items():
-            for action_name, action_id_list in prop_actions_dict.items():
-                if action_id_list and (func_id in action_id_list):
-                    prop_name = '.'.join([class_name, prop_name])
-                    del fobj, scontext, class_obj, class_props
-                    return '{prop_name}({prop_action})'.format(
-                        prop_name=prop_name,
-                        prop_action=desc_dict[action_name]
+                    name = '{prop_name}({prop_action})'.format(
+                        prop_name='.'.join([class_name, prop_name]),
+                        prop_action=desc_dict[action]
                     )
+                    for func_obj in [action_obj, prev_func_obj]:
+                        props_dict.setdefault(
+                            id(_get_func_code(func_obj)), name
+                        )
+        self._class_props_cache[class_obj] = (
+            class_file, self._get_module_date(class_file), props_dict
+        )
+        return props_dict
+
+    def _get_module_date(self, fname):
+        """ Returns the time a module was traced at, None if not traced """
+        return self._callables_obj._fnames.get(fname, {}).get('date', None)
+
+    def _get_stats(self):
+        """ Returns statistics dictionary """
+        return copy.deepcopy(self._stats)
+
+    def _get_stats_name(self, code, func_name):
+        """
+        Returns the name the statistics of a callable are kept under, its
+        full name if the full callable name is used or the callable file
+        name, first line and name otherwise. Names, unlike code identifiers,
+        are not re-used and are stable across exception handlers
+        """
+        if self._full_cname and (func_name is not None):
+            name = self._stats_names.get(func_name, None)
+            if name is None:
+                name = self._stats_names[func_name] = self.decode_call(
+                    func_name
+                ).split(self._callables_separator)[-1]
+            return name
+        return '{0}:{1}({2})'.format(
+            code.co_filename, code.co_firstlineno, code.co_name
+        )
+
+    def _intern_path(self, path):
+        """ Returns the identifier of an (encoded) callable path """
+        try:
+            return self._path_ids[path]
+        except KeyError:
+            path_id = self._path_ids[path] = len(self._paths)
+            self._paths.append(path)
+            return path_id
+
+    def _property_search(self, fobj):
+        """
+        Check if object is a class property and if so return full name,
+        otherwise return None
+        """
+        # Get class object
+        scontext = fobj.f_locals.get('self', None)
+        class_obj = scontext.__class__ if scontext is not None else None
+        if not class_obj:
+            del fobj, scontext, class_obj
+            return
+        ret = self._get_class_props(class_obj).get(id(fobj.f_code), None)
+        del fobj, scontext, class_obj
+        return ret
 
     def _raise_exception(self, eobj, edata=None):
         """ Raise exception by name """
         _, _, tbobj = sys.exc_info()
         if edata:
-            emsg = self._format_msg(eobj['msg'], edata)
+            emsg = self._format_msg((eobj['type'], eobj['msg']), edata)
             _rwtb(eobj['type'], emsg, tbobj)
         else:
             _rwtb(eobj['type'], eobj['msg'], tbobj)
@@ -1126,6 +1557,17 @@ class ExHandle(object):
             # TypeError: pref_func_obj does not have a file associated with it
             return None, None
 
+    def _update_stats(self, name, **kwargs):
+        """
+        Updates the statistics of a callable, keyword arguments are the
+        increments of the statistics fields
+        """
+        entry = self._stats.get(name, None)
+        if entry is None:
+            entry = self._stats[name] = dict.fromkeys(_STATS_FIELDS, 0)
+        for key, value in kwargs.items():
+            entry[key] += value
+
     def _validate_edata(self, edata):
         """ Validate edata argument of raise_exception_if method """
         # pylint: disable=R0916
@@ -1200,29 +1642,49 @@ class ExHandle(object):
             raise RuntimeError('Argument `exname` is not valid')
         if not isinstance(exmsg, str):
             raise RuntimeError('Argument `exmsg` is not valid')
-        msg = ''
+        key = (extype, exmsg)
         try:
-            raise extype(exmsg)
-        except Exception as eobj:
-            msg = _get_ex_msg(eobj)
-        if msg != exmsg:
-            raise RuntimeError('Argument `extype` is not valid')
+            valid = key in self._msg_templates
+        except TypeError:
+            valid = False
+        if not valid:
+            msg = ''
+            try:
+                raise extype(exmsg)
+            except Exception as eobj:
+                msg = _get_ex_msg(eobj)
+            if msg != exmsg:
+                raise RuntimeError('Argument `extype` is not valid')
+            self._msg_templates[key] = _compile_msg(exmsg)
         # A callable that defines an exception can be accessed by
         # multiple functions or paths, therefore the callable
-        # dictionary key 'function' is a list
-        func_id, func_name = self._get_ex_data()
+        # dictionary key 'function' is a dictionary whose keys are the
+        # callable path identifiers and whose values are the order in
+        # which the paths were added, which is also the bit number of
+        # the raised flag of the path in the dictionary key 'raised'
+        if self._stats is None:
+            func_id, func_name, stats_name = self._get_ex_data()
+        else:
+            start = timeit.default_timer()
+            func_id, func_name, stats_name = self._get_ex_data()
+            self._update_stats(
+                stats_name,
+                registrations=1,
+                path_time=timeit.default_timer()-start
+            )
         if func_id not in self._ex_dict:
             self._ex_dict[func_id] = {}
-        key = (extype, exmsg)
-        exname = '{0}{1}{2}'.format(func_id, self._callables_separator, exname)
-        entry = self._ex_dict[func_id].get(
-            key, {'function':[], 'name':exname, 'raised':[]}
-        )
-        if func_name not in entry['function']:
-            entry['function'].append(func_name)
-            entry['raised'].append(False)
-        self._ex_dict[func_id][key] = entry
-        return (func_id, key, func_name)
+        entry = self._ex_dict[func_id].get(key, None)
+        if entry is None:
+            exname = '{0}{1}{2}'.format(
+                func_id, self._callables_separator, exname
+            )
+            entry = {'function':{}, 'name':exname, 'raised':0}
+            self._ex_dict[func_id][key] = entry
+        path_id = self._intern_path(func_name)
+        if path_id not in entry['function']:
+            entry['function'][path_id] = len(entry['function'])
+        return (func_id, key, func_name, stats_name)
 
     def decode_call(self, call):
         """
@@ -1271,6 +1733,54 @@ class ExHandle(object):
             otokens.append(otoken)
         return self._callables_separator.join(otokens)
 
+    def get_stats_table(self):
+        """
+        Returns a table (string) with the exception registration and raising
+        statistics of each callable, sorted by decreasing time spent in
+        getting the callable path, or an empty string if statistics are not
+        collected. See :py:meth:`putil.exh.ExHandle.stats`
+
+        :rtype: string
+        """
+        stats = self._get_stats()
+        if not stats:
+            return ''
+        header = [
+            'Callable',
+            'Registrations',
+            'Raised',
+            'Path time [ms]',
+            'Raise time [ms]'
+        ]
+        iobj = sorted(
+            stats.items(), key=lambda item: (-item[1]['path_time'], item[0])
+        )
+        rows = [
+            [
+                name,
+                str(entry['registrations']),
+                str(entry['raised']),
+                '{0:.3f}'.format(1e3*entry['path_time']),
+                '{0:.3f}'.format(1e3*entry['raise_time'])
+            ]
+            for name, entry in iobj
+        ]
+        widths = [
+            max([len(row[col]) for row in [header]+rows])
+            for col in range(len(header))
+        ]
+        ret = []
+        for row in [header, ['-'*width for width in widths]]+rows:
+            ret.append(
+                '  '.join(
+                    [row[0].ljust(widths[0])]+[
+                        item.rjust(width)
+                        for item, width in zip(row[1:], widths[1:])
+                    ]
+                )
+            )
+        return '\n'.join(ret)
+
     def raise_exception_if(self, exname, condition, edata=None, _keys=None):
         """
         Raises exception conditionally
@@ -1294,8 +1804,11 @@ class ExHandle(object):
                         <https://docs.python.org/2/library/stdtypes.html#
                         str.format>`_ string method
 
-                      If None no field replacement is done
-        :type  edata: dictionary, iterable of dictionaries or None
+                      If None no field replacement is done. If a callable
+                      it is called (without arguments) only when the
+                      exception is raised and it has to return the
+                      replacement values
+        :type  edata: dictionary, iterable of dictionaries, callable or None
 
         :raises:
          * RuntimeError (Argument \\`condition\\` is not valid)
@@ -1312,15 +1825,20 @@ class ExHandle(object):
         # _edict is an argument used by the _ExObj class which saves a
         # second exception look-up since the _ExObj class can save the
         # call dictionary
+        stats = self._stats is not None
+        start = timeit.default_timer() if stats else 0
+        path_time = 0
         if not isinstance(condition, bool):
             raise RuntimeError('Argument `condition` is not valid')
-        if not self._validate_edata(edata):
+        if not (callable(edata) or self._validate_edata(edata)):
             raise RuntimeError('Argument `edata` is not valid')
         if _keys is None:
             if not isinstance(exname, str):
                 raise RuntimeError('Argument `exname` is not valid')
             # Find exception object
-            func_id, func_name = self._get_ex_data()
+            func_id, func_name, stats_name = self._get_ex_data()
+            if stats:
+                path_time = timeit.default_timer()-start
             name = '{0}{1}{2}'.format(
                 func_id, self._callables_separator, exname
             )
@@ -1331,25 +1849,50 @@ class ExHandle(object):
                 raise ValueError(
                     'Exception name {exname} not found'.format(exname=exname)
                 )
-            _keys = (func_id, key, func_name)
+            _keys = (func_id, key, func_name, stats_name)
+        if not condition:
+            if path_time:
+                self._update_stats(_keys[3], path_time=path_time)
+            return
         eobj = self._ex_dict[_keys[0]][_keys[1]]
-        if condition:
-            eobj['raised'][eobj['function'].index(_keys[2])] = True
+        eobj['raised'] |= 1 << eobj['function'][self._path_ids[_keys[2]]]
+        try:
+            if callable(edata):
+                edata = edata()
+                if not self._validate_edata(edata):
+                    raise RuntimeError('Argument `edata` is not valid')
             self._raise_exception(
                 {'type':_keys[1][0], 'msg':_keys[1][1]}, edata
             )
+        finally:
+            if stats:
+                self._update_stats(
+                    _keys[3],
+                    raised=1,
+                    path_time=path_time,
+                    raise_time=timeit.default_timer()-start
+                )
 
-    def save_callables(self, callables_fname):
+    def save_callables(self, callables_fname, binary=False):
         """
         Saves traced modules information to a `JSON <http://www.json.org>`_
-        file. If the file exists it is overwritten
+        file or to a binary file (see
+        :py:meth:`putil.pinspect.Callables.save`). If the file exists it is
+        overwritten
 
         :param callables_fname: File name
         :type  callables_fname: :ref:`FileName`
 
-        :raises: RuntimeError (Argument \\`callables_fname\\` is not valid)
+        :param binary: Flag that indicates whether the file is written in the
+                       binary format (True) or in the JSON format (False)
+        :type  binary: boolean
+
+        :raises:
+         * RuntimeError (Argument \\`binary\\` is not valid)
+
+         * RuntimeError (Argument \\`callables_fname\\` is not valid)
         """
-        self._callables_obj.save(callables_fname)
+        self._callables_obj.save(callables_fname, binary)
 
     # Managed attributes
     callables_db = property(_get_callables_db, doc='Dictionary of callables')
@@ -1401,3 +1944,110 @@ class ExHandle(object):
        :py:meth:`putil.exh.ExHandle.raise_exception_if`, the empty string
        (:code:`''`) otherwise
     """
+
+    stats = property(_get_stats, doc='Exception statistics')
+    """
+    Returns the exception registration and raising statistics, or None if
+    the exception handler does not collect statistics (**stats** argument).
+    The statistics are a dictionary whose keys are the names of the
+    callables that register exceptions (the full callable name if the
+    **full_cname** argument is True, otherwise
+    :code:`'[file_name]:[first_line]([callable_name])'`) and whose values
+    are dictionaries with the following keys:
+
+     * **registrations** *(integer)* -- Number of exception registrations
+
+     * **raised** *(integer)* -- Number of exceptions raised
+
+     * **path_time** *(float)* -- Cumulative time, in seconds, spent getting
+       the callable path (walking the call stack) in exception
+       registrations, including registrations re-used from the same call
+       site, and in :py:meth:`putil.exh.ExHandle.raise_exception_if` calls
+       that look up the exception by name
+
+     * **raise_time** *(float)* -- Cumulative time, in seconds, spent in
+       :py:meth:`putil.exh.ExHandle.raise_exception_if` calls that raise
+       the exception, from the call to the exception being raised
+
+    Exceptions registered and raised by :py:func:`putil.exh.addex`,
+    :py:func:`putil.exh.addai` and the :py:func:`putil.pcontracts.contract`
+    decorator are accounted for in these statistics; the time spent
+    validating the arguments of a contract is not
+
+    For example:
+
+        >>> from __future__ import print_function
+        >>> import putil.exh
+        >>> def my_func(value):
+        ...     exobj = putil.exh.addai('value')
+        ...     exobj(value < 0)
+        >>> exhobj = putil.exh.ExHandle(stats=True)
+        >>> with putil.exh.ExHandleCxt(exhobj):
+        ...     for value in [1, 2, -1]:
+        ...         try:
+        ...             my_func(value)
+        ...         except RuntimeError:
+        ...             pass
+        >>> stats = list(exhobj.stats.values())[0]
+        >>> print(stats['registrations'], stats['raised'])
+        3 1
+    """
+
+
+class ExHandleCxt(object):
+    r"""
+    Context manager that sets an exception handler for the current execution
+    context. Within the context the exception handler is returned by
+    :py:func:`putil.exh.get_exh_obj` and used by :py:func:`putil.exh.addex`
+    and :py:func:`putil.exh.addai`, overriding the per-thread and global
+    exception handlers. The global exception handler is not modified.
+
+    The scope of the exception handler is an `asyncio
+    <https://docs.python.org/3/library/asyncio.html>`_ task (or, more
+    generally, a `contextvars
+    <https://docs.python.org/3/library/contextvars.html>`_ context), so
+    coroutines that run concurrently in the same thread can each use their
+    own exception handler. In Python versions without the contextvars module
+    (older than 3.7) the scope of the exception handler is the current
+    thread, and the context manager must then not be used by coroutines
+    that are interleaved in the same thread, as they would replace each
+    other's exception handler
+
+    :param obj: Exception handler. If None a new exception handler (with
+                default arguments) is created
+    :type  obj: :py:class:`putil.exh.ExHandle` or None
+
+    :raises: RuntimeError (Argument \`obj\` is not valid)
+
+    For example:
+
+        >>> import putil.eng, putil.exh
+        >>> putil.exh.del_exh_obj()
+        >>> with putil.exh.ExHandleCxt() as exhobj:
+        ...     value = putil.eng.peng(100, 3, True)
+        >>> putil.exh.get_exh_obj() is None
+        True
+        >>> len(exhobj.exceptions_db) > 0
+        True
+    """
+    def __init__(self, obj=None):
+        if (obj is not None) and (not isinstance(obj, ExHandle)):
+            raise RuntimeError('Argument `obj` is not valid')
+        self._obj = ExHandle() if obj is None else obj
+        self._token = None
+
+    def __enter__(self):
+        if _CONTEXT_EXH is None:
+            self._token = getattr(_THREAD_EXH, '_CXT_EXH', None)
+            _THREAD_EXH._CXT_EXH = self._obj
+        else:
+            self._token = _CONTEXT_EXH.set(self._obj)
+        return self._obj
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        if _CONTEXT_EXH is None:
+            _THREAD_EXH._CXT_EXH = self._token
+        else:
+            _CONTEXT_EXH.reset(self._token)
+        self._token = None
+        return False
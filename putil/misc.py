@@ -18,7 +18,6 @@ import types
 from fractions import Fraction
 # PyPI imports
 import decorator
-import numpy
 # Putil imports
 import putil.eng
 
@@ -708,6 +707,8 @@ def per(arga, argb, prec=10):
      * TypeError (Arguments are not of the same type)
     """
     # pylint: disable=E1101,R0204
+    # Numpy is slow to import, only import it when it is needed
+    import numpy
     if not isinstance(prec, int):
         raise RuntimeError('Argument `prec` is not valid')
     arga_type = (
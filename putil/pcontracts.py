@@ -1,24 +1,26 @@
 # pcontracts.py
 # Copyright (c) 2013-2016 Pablo Acosta-Serafini
 # See LICENSE for details
-# pylint: disable=C0103,C0111,E0102,E0611,E1101,F0401,R0912,R0914,W0212,W0613
+# pylint: disable=C0103,C0111,E0102,E0611,E1101,F0401,R0912,R0914,W0122
+# pylint: disable=W0212,W0613
 
 # Standard library imports
+import hashlib
+import imp
 import inspect
+import marshal
 import os
 import re
+import struct
 import sys
+import types
+import weakref
 # PyPI imports
-if os.environ.get('READTHEDOCS', False) != 'True': # pragma: no branch
-    # The PyContracts module imports numpy, which is not allowed in
-    # the ReadTheDocs environment
-    import contracts
 import decorator
 try:    # pragma: no cover
-    from funcsigs import signature, Parameter
+    from inspect import signature, Parameter
 except ImportError: # pragma: no cover
-    signature = inspect.signature
-    Parameter = inspect.Parameter
+    from funcsigs import signature, Parameter
 # Putil imports
 import putil.exh
 if sys.hexversion < 0x03000000: # pragma: no cover
@@ -32,11 +34,204 @@ else:   # pragma: no cover
 ###
 RTD = os.environ.get('READTHEDOCS', False) == 'True'
 _CUSTOM_CONTRACTS = dict()
+_PENDING_CONTRACTS = list()
+# Custom contract referenced by each parameter contract string (None if the
+# parameter contract does not reference a custom contract). Contract strings
+# are parsed once, the registry is cleared when a custom contract is
+# registered since that can change what a contract string references
+_PARSED_CONTRACTS = dict()
+# Checkers (parsed PyContracts contracts) used by validate_many(), and
+# custom contracts that can validate several objects in one pass
+_COMPILED_CONTRACTS = dict()
+_BATCH_CONTRACTS = dict()
+# Signature and arguments default values of decorated functions, used to
+# report contract breaches
+_SIGNATURES = weakref.WeakKeyDictionary()
+# Exception descriptions of the custom contracts defined with the
+# new_contract decorator, keyed by the code object of the custom contract.
+# They are returned by get_exdesc() when called from the custom contract
+_EXDESC = dict()
+# Generated Python code contract checkers (see enable_codegen()). The
+# supported subset of the PyContracts grammar is made of the type names
+# below, None, list(...), custom contracts defined with new_contract() and
+# either one of the | and , operators (or parenthesized sub-expressions)
+_CODEGEN = {'enabled':False, 'cache_dir':None}
+# Cached compiled checkers start with the byte code magic number and the
+# version of the interpreter that compiled them, files written by another
+# interpreter are not loaded
+_CODEGEN_HEADER = imp.get_magic()+struct.pack('<I', sys.hexversion)
+_CODEGEN_TOKENS = re.compile(r'\w+|\S')
+_CODEGEN_TYPES = {
+    'bool':'bool',
+    'dict':'dict',
+    'float':'float',
+    'int':'int',
+    'list':'list',
+    'number':'(int, float)',
+    'str':'str',
+    'tuple':'tuple',
+}
+_CUSTOM_FUNCS = dict()
+# Generated checker of each decorated function (None if its contracts are
+# not supported). The registry is cleared when code generation is enabled
+# or disabled and when a custom contract is registered, since generated
+# checkers reference the custom contracts by name
+_CODEGEN_CHECKERS = weakref.WeakKeyDictionary()
+# Decorated functions whose arguments are validated by a generated checker
+# are called from generated code, which the exception handler identifies
+# by its file name
+_CODEGEN_CALL = dict()
+exec(
+    compile(
+        'def call(func, args, kwargs):\n    return func(*args, **kwargs)\n',
+        putil.exh._CODEGEN_FNAME,
+        'exec'
+    ),
+    _CODEGEN_CALL
+)
+# The PyContracts module is imported on first use by _get_contracts()
+contracts = None
 
 
 ###
 # Functions
 ###
+def _check_custom_contract(func, obj):
+    """
+    Returns True if an object satisfies a custom contract, False otherwise
+    """
+    # pylint: disable=W0703
+    try:
+        ret = func(obj)
+    except Exception:
+        return False
+    return (ret is None) or (ret is True)
+
+
+def _codegen_atom(tokens, names, var, depth):
+    """ Generates code to check a contract atom """
+    if not tokens:
+        raise ValueError('Unexpected end of contract')
+    token = tokens.pop()
+    if token == '(':
+        expr = _codegen_expr(tokens, names, var, depth)
+        if (not tokens) or (tokens.pop() != ')'):
+            raise ValueError('Unbalanced parenthesis')
+        return expr
+    if token == 'None':
+        return '({0} is None)'.format(var)
+    if (token == 'list') and tokens and (tokens[-1] == '('):
+        tokens.pop()
+        item = 'obj{0}'.format(depth+1)
+        expr = _codegen_expr(tokens, names, item, depth+1)
+        if (not tokens) or (tokens.pop() != ')'):
+            raise ValueError('Unbalanced parenthesis')
+        return '(isinstance({0}, list) and all({1} for {2} in {0}))'.format(
+            var, expr, item
+        )
+    if token in _CODEGEN_TYPES:
+        return 'isinstance({0}, {1})'.format(var, _CODEGEN_TYPES[token])
+    if token in _CUSTOM_FUNCS:
+        name = '_c_{0}'.format(token)
+        names[name] = _CUSTOM_FUNCS[token]
+        return '_check_custom_contract({0}, {1})'.format(name, var)
+    raise ValueError('Unsupported token {0}'.format(token))
+
+
+def _codegen_compile(source):
+    """
+    Compiles checker source code. The code object is cached on disk, keyed
+    by a hash of the source code and the Python version, if a cache
+    directory is defined. Cached code objects are only loaded if they were
+    written by the same interpreter version
+    """
+    cache_dir = _CODEGEN['cache_dir']
+    fname = None
+    if cache_dir is not None:
+        digest = hashlib.sha1(
+            (sys.version+source).encode('utf-8')
+        ).hexdigest()
+        fname = os.path.join(cache_dir, 'contract_{0}.bin'.format(digest))
+        try:
+            with open(fname, 'rb') as fobj:
+                header = fobj.read(len(_CODEGEN_HEADER))
+                code = (
+                    marshal.load(fobj) if header == _CODEGEN_HEADER else None
+                )
+            if isinstance(code, types.CodeType):
+                return code
+        except (IOError, OSError, EOFError, ValueError, TypeError):
+            pass
+    code = compile(source, putil.exh._CODEGEN_FNAME, 'exec')
+    if fname is not None:
+        # Write to a temporary file first so that concurrent processes
+        # never read a partially written file
+        tmp_fname = '{0}.{1}'.format(fname, os.getpid())
+        try:
+            with open(tmp_fname, 'wb') as fobj:
+                fobj.write(_CODEGEN_HEADER)
+                marshal.dump(code, fobj)
+            os.rename(tmp_fname, fname)
+        except (IOError, OSError):
+            pass
+    return code
+
+
+def _codegen_expr(tokens, names, var, depth):
+    """ Generates code to check a contract expression """
+    items = [_codegen_atom(tokens, names, var, depth)]
+    oper = None
+    while tokens and (tokens[-1] in [',', '|']):
+        token = tokens.pop()
+        # Operator precedence is avoided by only supporting one type of
+        # operator in each (sub-)expression
+        if oper not in [None, token]:
+            raise ValueError('Mixed operators')
+        oper = token
+        items.append(_codegen_atom(tokens, names, var, depth))
+    if len(items) == 1:
+        return items[0]
+    return '({0})'.format((' and ' if oper == ',' else ' or ').join(items))
+
+
+def _codegen_source(contract_args, names):
+    """
+    Generates the source code of a function that returns True if all the
+    arguments of an argument dictionary satisfy their contracts. ValueError
+    is raised if a contract is not in the supported subset of the
+    PyContracts grammar
+    """
+    lines = []
+    checks = []
+    for num, param_name in enumerate(sorted(contract_args)):
+        param_contract = contract_args[param_name]
+        if inspect.isclass(param_contract):
+            name = '_t{0}'.format(num)
+            names[name] = param_contract
+            expr = 'isinstance(obj0, {0})'.format(name)
+        elif isinstance(param_contract, str):
+            tokens = _CODEGEN_TOKENS.findall(param_contract)[::-1]
+            expr = _codegen_expr(tokens, names, 'obj0', 0)
+            if tokens:
+                raise ValueError('Unsupported token {0}'.format(tokens[-1]))
+        else:
+            raise ValueError('Unsupported contract')
+        lines += [
+            'def _check_{0}(obj0):'.format(num),
+            '    return {0}'.format(expr),
+        ]
+        checks.append(
+            '(({0!r} in args) and _check_{1}(args[{0!r}]))'.format(
+                param_name, num
+            )
+        )
+    lines += [
+        'def check(args):',
+        '    return {0}'.format(' and '.join(checks) if checks else 'True'),
+    ]
+    return '\n'.join(lines)+'\n'
+
+
 def _create_argument_value_pairs(func, *args, **kwargs):
     """
     Creates a dictionary where the keys are the argument names and the values
@@ -46,18 +241,27 @@ def _create_argument_value_pairs(func, *args, **kwargs):
     arguments than in the function definition, argument(s) defined by position
     and keyword, etc.
     """
+    fsig, arg_names, defaults = _get_signature(func)
     # Capture parameters that have been explicitly specified in function call
-    try:
-        arg_dict = signature(func).bind_partial(*args, **kwargs).arguments
-    except TypeError:
-        return dict()
+    if arg_names is None:
+        try:
+            arg_dict = fsig.bind_partial(*args, **kwargs).arguments
+        except TypeError:
+            return dict()
+    else:
+        # Only positional-or-keyword arguments, binding is straightforward
+        if len(args) > len(arg_names):
+            return dict()
+        arg_dict = dict(zip(arg_names, args))
+        for arg_name, arg_value in kwargs.items():
+            if (arg_name in arg_dict) or (arg_name not in arg_names):
+                return dict()
+            arg_dict[arg_name] = arg_value
     # Capture parameters that have not been explicitly specified
     # but have default values
-    arguments = signature(func).parameters
-    for arg_name in arguments:
-        if ((arguments[arg_name].default != Parameter.empty) and
-           (arguments[arg_name].name not in arg_dict)):
-            arg_dict[arguments[arg_name].name] = arguments[arg_name].default
+    for arg_name, arg_value in defaults:
+        if arg_name not in arg_dict:
+            arg_dict[arg_name] = arg_value
     return arg_dict
 
 
@@ -123,6 +327,17 @@ def _format_arg(arg):
         }
 
 
+def _format_contract_msg(exdict, param_name, param_value):
+    """ Replace field in contract exception message """
+    if not exdict['field']:
+        return exdict['msg']
+    return exdict['msg'].replace(
+        '*[{0}]*'.format(exdict['field']),
+        param_name if exdict['field'] == 'argument_name' else
+        '{0}'.format(param_value)
+    )
+
+
 def _get_contract_exception_dict(contract_msg):
     """ Generate message for exception """
     # A pcontract-defined custom exception message is wrapped in a string
@@ -153,17 +368,94 @@ def _get_contract_exception_dict(contract_msg):
                 return exvalue
 
 
+def _get_codegen_checker(contract_args):
+    """
+    Returns a generated checker of the contracts of a decorated function,
+    None if a contract is not in the supported subset of the PyContracts
+    grammar
+    """
+    names = {'_check_custom_contract':_check_custom_contract}
+    try:
+        source = _codegen_source(contract_args, names)
+    except ValueError:
+        return None
+    exec(_codegen_compile(source), names)
+    return names['check']
+
+
 def _get_custom_contract(param_contract):
     """
-    Returns True if the parameter contract is a custom contract,
-    False otherwise
+    Returns the name of the custom contract referenced by the parameter
+    contract, None if the parameter contract does not reference a custom
+    contract
     """
     if not isinstance(param_contract, str):
         return None
-    for custom_contract in _CUSTOM_CONTRACTS:
-        if re.search(r'\b{0}\b'.format(custom_contract), param_contract):
+    try:
+        custom_contract = _PARSED_CONTRACTS[param_contract]
+    except KeyError:
+        pass
+    else:
+        if (custom_contract is None) or (custom_contract in _CUSTOM_CONTRACTS):
             return custom_contract
-    return None
+    custom_contract = _parse_contract(param_contract)
+    _PARSED_CONTRACTS[param_contract] = custom_contract
+    return custom_contract
+
+
+def _get_signature(func):
+    """
+    Returns the signature of a function, the argument names if all arguments
+    are positional-or-keyword arguments (None otherwise) and a list of
+    (argument name, default value) tuples of the arguments that have default
+    values
+    """
+    try:
+        return _SIGNATURES[func]
+    except (KeyError, TypeError):
+        # TypeError: func cannot be weakly referenced
+        pass
+    fsig = signature(func)
+    params = fsig.parameters
+    ret = (
+        fsig,
+        (
+            list(params)
+            if all(
+                [
+                    param.kind == Parameter.POSITIONAL_OR_KEYWORD
+                    for param in params.values()
+                ]
+            ) else
+            None
+        ),
+        [
+            (arg_name, param.default)
+            for arg_name, param in params.items()
+            if param.default is not Parameter.empty
+        ]
+    )
+    try:
+        _SIGNATURES[func] = ret
+    except TypeError:
+        pass
+    return ret
+
+
+def _get_contracts():
+    """
+    Returns the PyContracts module. The module (which in turn imports numpy)
+    is slow to import, so it is only imported the first time it is needed,
+    at which point the custom contracts defined until then are registered
+    with it
+    """
+    # pylint: disable=W0603,W0621
+    global contracts
+    if contracts is None:
+        import contracts
+        while _PENDING_CONTRACTS:
+            contracts.new_contract(_PENDING_CONTRACTS.pop(0))
+    return contracts
 
 
 def _isexception(obj):
@@ -185,7 +477,15 @@ def all_disabled():
     module-contracts.enabling>`_ function. From the PyContracts documentation:
     "Returns true if all contracts are disabled"
     """
-    return contracts.all_disabled()
+    return _get_contracts().all_disabled()
+
+
+def codegen_enabled():
+    """
+    Returns True if contracts are checked with generated Python code (see
+    :py:func:`putil.pcontracts.enable_codegen`), False otherwise
+    """
+    return _CODEGEN['enabled']
 
 
 def disable_all():
@@ -195,7 +495,16 @@ def disable_all():
     module-contracts.enabling>`_ function. From the PyContracts documentation:
     "Disables all contract checks"
     """
-    contracts.disable_all()
+    _get_contracts().disable_all()
+
+
+def disable_codegen():
+    """
+    Disables checking contracts with generated Python code, all contracts
+    are checked by PyContracts
+    """
+    _CODEGEN['enabled'] = False
+    _CODEGEN_CHECKERS.clear()
 
 
 def enable_all():
@@ -205,7 +514,43 @@ def enable_all():
     module-contracts.enabling>`_ function. From the PyContracts documentation:
     "Enables all contract checks. Can be overridden by an environment variable"
     """
-    contracts.enable_all()
+    _get_contracts().enable_all()
+
+
+def enable_codegen(cache_dir=None):
+    r"""
+    Enables checking contracts with generated Python code. Contracts in the
+    supported subset of the PyContracts grammar (type names such as
+    :code:`int`, :code:`str` or :code:`dict`, :code:`None`,
+    :code:`list(...)`, custom contracts defined with the
+    :py:func:`putil.pcontracts.new_contract` decorator, types, and
+    alternatives or conjunctions of them, as in
+    :code:`'list(list(str|int|float|None))'` or :code:`'None|file_name'`)
+    are translated into plain Python functions when a decorated function is
+    first called. Arguments that the generated code cannot validate, and all
+    other contracts, are checked by PyContracts, so exceptions raised are
+    the same as without code generation
+
+    :param cache_dir: Directory where the compiled checkers are cached,
+                      keyed by a hash of their source code and the Python
+                      version. If None the compiled checkers are not
+                      cached on disk. Cached checkers are executed when
+                      loaded, so the directory must be trusted, i.e.
+                      writable only by trusted users
+    :type  cache_dir: string or None
+
+    :raises: RuntimeError (Argument \`cache_dir\` is not valid)
+    """
+    if (cache_dir is not None) and (not isinstance(cache_dir, str)):
+        raise RuntimeError('Argument `cache_dir` is not valid')
+    if (cache_dir is not None) and (not os.path.isdir(cache_dir)):
+        try:
+            os.makedirs(cache_dir)
+        except OSError:
+            raise RuntimeError('Argument `cache_dir` is not valid')
+    _CODEGEN['enabled'] = True
+    _CODEGEN['cache_dir'] = cache_dir
+    _CODEGEN_CHECKERS.clear()
 
 
 def get_exdesc():
@@ -254,9 +599,17 @@ def get_exdesc():
     :code:`{'ex1':'Empty name', 'ex2':'Invalid name'}`.
 
     """
+    # Custom contracts defined with the new_contract decorator have their
+    # exception descriptions bound to their code object
+    frame = sys._getframe(1)
+    try:
+        return _EXDESC[frame.f_code]
+    except KeyError:
+        pass
     # First frame is own function (get_exdesc), next frame is the calling
     # function, of which its name is needed
-    fname = inspect.getframeinfo(sys._getframe(1))[2]
+    fname = inspect.getframeinfo(frame)[2]
+    del frame
     # Find function object in stack
     count = 0
     fobj = None
@@ -280,6 +633,77 @@ def get_exdesc():
     return exdesc if len(exdesc) > 1 else exdesc[next(iter(exdesc))]
 
 
+def validate_many(contract, iterable, argname='item'):
+    r"""
+    Validates several objects against a contract in one pass. The contract
+    is parsed once and custom contracts that can validate several objects
+    at a time (for example :py:func:`putil.ptypes.real_numpy_vector` with
+    the rows of a two-dimensional Numpy array) do so
+
+    :param contract: Contract, specified as in the
+                     :py:func:`putil.pcontracts.contract` decorator
+    :type  contract: string or type
+
+    :param iterable: Objects to validate
+    :type  iterable: iterable
+
+    :param argname: Name that replaces the :code:`'*[argument_name]*'` token
+                    in the exception messages
+    :type  argname: string
+
+    :rtype: list of tuples. Each tuple describes an object that breaches the
+     contract: the first item is the index of the object in the iterable,
+     the second item is the exception type and the third item is the
+     exception message, as they would be raised by the
+     :py:func:`putil.pcontracts.contract` decorator. An empty list is
+     returned if all objects are valid or if contracts are disabled
+
+    :raises:
+     * RuntimeError (Argument \`argname\` is not valid)
+
+     * Same as PyContracts if the contract is not valid
+
+    For example:
+
+        >>> import putil.pcontracts
+        >>> ret = putil.pcontracts.validate_many('int,>0', [1, 0, 2], 'num')
+        >>> [(num, extype.__name__, exmsg) for num, extype, exmsg in ret]
+        [(1, 'RuntimeError', 'Argument `num` is not valid')]
+    """
+    if not isinstance(argname, str):
+        raise RuntimeError('Argument `argname` is not valid')
+    pycontracts = _get_contracts()
+    if pycontracts.all_disabled():
+        return []
+    custom_contract = _get_custom_contract(contract)
+    if ((custom_contract in _BATCH_CONTRACTS) and
+       (contract.strip() == custom_contract)):
+        exdict = next(iter(_CUSTOM_CONTRACTS[custom_contract].values()))
+        return [
+            (num, exdict['type'], _format_contract_msg(exdict, argname, None))
+            for num in _BATCH_CONTRACTS[custom_contract](iterable)
+        ]
+    try:
+        checker = _COMPILED_CONTRACTS[contract]
+    except KeyError:
+        checker = pycontracts.parse(contract)
+        _COMPILED_CONTRACTS[contract] = checker
+    ret = []
+    for num, obj in enumerate(iterable):
+        try:
+            checker.check(obj)
+        except pycontracts.ContractNotRespected as eobj:
+            exdict = _get_contract_exception_dict(eobj.error)
+            ret.append(
+                (
+                    num,
+                    exdict['type'],
+                    _format_contract_msg(exdict, argname, obj)
+                )
+            )
+    return ret
+
+
 def _get_num_contracts(contracts_list, param_name):
     """
     Returns the number of simple/default contracts (the ones which raise a
@@ -305,6 +729,21 @@ def _get_replacement_token(msg):
     )
 
 
+def _parse_contract(param_contract):
+    """
+    Tokenizes a parameter contract and returns the name of the first
+    registered custom contract it references (None if the parameter contract
+    does not reference a custom contract)
+    """
+    # A custom contract name is referenced in the parameter contract when it
+    # is a whole word of it
+    tokens = set(re.findall(r'\w+', param_contract))
+    for custom_contract in _CUSTOM_CONTRACTS:
+        if custom_contract in tokens:
+            return custom_contract
+    return None
+
+
 def _parse_new_contract_args(*args, **kwargs):
     """ Parse argument for new_contract() function """
     # No arguments
@@ -328,6 +767,17 @@ def _parse_new_contract_args(*args, **kwargs):
     ]
 
 
+def _register_batch_contract(contract_name, func):
+    """
+    Registers a function that validates several objects against a custom
+    contract in one pass. The function takes an iterable and returns a list
+    of the indexes of the objects that breach the contract; the custom
+    contract has to be defined with only one exception
+    """
+    _BATCH_CONTRACTS[contract_name] = func
+    return func
+
+
 def _register_custom_contracts(contract_name, contract_exceptions):
     """ Homogenize custom contract exception definition """
     # pylint: disable=W0602
@@ -410,6 +860,7 @@ def _register_custom_contracts(contract_name, contract_exceptions):
         )
     # Register new contract
     _CUSTOM_CONTRACTS[contract_name] = homogenized_exdict
+    _PARSED_CONTRACTS.clear()
     return contract_exceptions
 
 
@@ -419,6 +870,12 @@ def _register_custom_contracts(contract_name, contract_exceptions):
 # Function docstring in rst documentation
 def contract(**contract_args):
     # pylint: disable=W0631
+    # Parse the parameter contracts once, when the decorator is applied
+    for param_contract in contract_args.values():
+        _get_custom_contract(param_contract)
+    # PyContracts-decorated functions, the parameter contracts are parsed
+    # by PyContracts on the first call of each decorated function
+    checkers = {}
     @decorator.decorator
     def wrapper(func, *args, **kwargs):
         """ Decorator """
@@ -432,8 +889,8 @@ def contract(**contract_args):
                 # param_name=param_value, as in num='str|float'
                 contracts_dicts = list()
                 # Create dictionary of custom contracts
-                if _get_custom_contract(param_contract):
-                    key = _get_custom_contract(param_contract)
+                key = _get_custom_contract(param_contract)
+                if key:
                     contracts_dicts += _CUSTOM_CONTRACTS[key].values()
                 else: # Add regular PyContracts contracts
                     msg = 'Argument `*[argument_name]*` is not valid'
@@ -467,6 +924,21 @@ def contract(**contract_args):
                             param_name
                         )
                     )
+        # Arguments that satisfy their contracts according to the generated
+        # checker are not validated by PyContracts. A contract breach, or an
+        # argument the generated checker cannot validate, is reported by
+        # PyContracts below
+        if _CODEGEN['enabled']:
+            try:
+                codegen_checker = _CODEGEN_CHECKERS[func]
+            except KeyError:
+                codegen_checker = _get_codegen_checker(contract_args)
+                _CODEGEN_CHECKERS[func] = codegen_checker
+            if ((codegen_checker is not None) and
+               codegen_checker(
+                   _create_argument_value_pairs(func, *args, **kwargs)
+               )):
+                return _CODEGEN_CALL['call'](func, args, kwargs)
         # Argument validation. PyContracts "entry" is the
         # contracts.contract_decorator, which has some logic to figure out
         # which way the contract was specified. Since this module
@@ -474,17 +946,19 @@ def contract(**contract_args):
         # contracts, all the mentioned logic can be bypassed by calling
         # contracts.contracts_decorate, which is renamed to
         # contracts.decorate in the contracts __init__.py file
+        pycontracts = _get_contracts()
         try:
-            return (
-                contracts.decorate(
+            checker = checkers.get(func, None)
+            if checker is None:
+                checker = checkers[func] = pycontracts.decorate(
                     func,
                     False,
                     **contract_args
-                )(*args, **kwargs)
-            )
-        except contracts.ContractSyntaxError:
+                )
+            return checker(*args, **kwargs)
+        except pycontracts.ContractSyntaxError:
             raise
-        except contracts.ContractNotRespected as eobj:
+        except pycontracts.ContractNotRespected as eobj:
             # Extract which function parameter triggered exception
             param_dict = _create_argument_value_pairs(
                 func, *args, **kwargs
@@ -520,10 +994,8 @@ def contract(**contract_args):
                 # Pick "nice" variable names because the raise line is
                 # going to be shown in the exception traceback
                 exception_type = exdict['type']
-                exception_message = exdict['msg'].replace(
-                    '*[{0}]*'.format(exdict['field']),
-                    param_name if exdict['field'] == 'argument_name' else
-                    '{0}'.format(param_dict[param_name])
+                exception_message = _format_contract_msg(
+                    exdict, param_name, param_dict.get(param_name, None)
                 )
                 _raise_exception(exception_type(exception_message))
     return wrapper
@@ -548,7 +1020,17 @@ def new_contract(*args, **kwargs):
         )
         # Register custom contract
         _register_custom_contracts(contract_name, exdesc)
-        # Apply PyContracts decorator
+        _EXDESC[func.__code__] = (
+            func.exdesc if len(func.exdesc) > 1 else
+            func.exdesc[next(iter(func.exdesc))]
+        )
+        _CUSTOM_FUNCS[contract_name] = func
+        _CODEGEN_CHECKERS.clear()
+        # Apply PyContracts decorator, deferred until PyContracts is
+        # imported if it has not been yet
+        if contracts is None:
+            _PENDING_CONTRACTS.append(func)
+            return func
         return contracts.new_contract(func)
     return wrapper
 
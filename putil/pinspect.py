@@ -7,14 +7,19 @@
 # Standard library imports
 from __future__ import print_function
 import ast
+import bisect
 import collections
 import copy
+import hashlib
 import json
+import marshal
 import os
 import platform
 import re
+import struct
 import sys
 import types
+import weakref
 # PyPI imports
 try:    # pragma: no cover
     from inspect import Parameter, signature
@@ -31,11 +36,102 @@ else:   # pragma: no cover
 # Global constants
 ###
 _PRIVATE_PROP_REGEXP = re.compile('_[^_]+')
+_ARG_REGEXP = re.compile(r'^\*{0,2}[A-Za-z_]\w*$')
+# Binary callables database file format. The file starts with a fixed-size
+# header (magic number, format version, marshal version and index size)
+# followed by a marshalled index and one marshalled block per module, so
+# that module information can be read without decoding the whole file
+_BIN_MAGIC = b'PUTILCDB'
+_BIN_VERSION = 1
+_BIN_HEADER = struct.Struct('<8sHHI')
+_BIN_TYPES = ('class', 'meth', 'func', 'prop')
+# Module trace cache. Each traced file is stored in its own marshalled
+# file, named after a hash of the file name, module name, cache format
+# version and Python version, that holds the hash of the file contents the
+# trace results are valid for. The file contents are always hashed, file
+# modification times are not reliable (they are preserved by file copies
+# and archive extraction, and have a limited resolution)
+_TRACE_CACHE = {'cache_dir':None}
+_TRACE_CACHE_VERSION = 3
+# Function argument names, cached per function object together with the
+# code object they were obtained from. Values are dictionaries keyed by
+# whether the function is bound (its first argument is then omitted)
+_FUNCTION_ARGS = weakref.WeakKeyDictionary()
+# Code object flags for variable positional and keyword arguments
+_CO_VARARGS = 0x04
+_CO_VARKEYWORDS = 0x08
 
 
 ###
 # Functions
 ###
+def _get_code_args(func):
+    """
+    Returns the argument names of a function obtained from its code
+    object, None if the function signature may be different from the one
+    the code object defines
+    """
+    if any([hasattr(func, item) for item in ['__signature__', '__wrapped__']]):
+        return None
+    code = func.__code__
+    nargs = code.co_argcount
+    nkwargs = getattr(code, 'co_kwonlyargcount', 0)
+    names = code.co_varnames
+    args = list(names[:nargs])
+    num = nargs+nkwargs
+    if code.co_flags & _CO_VARARGS:
+        args.append('*'+names[num])
+        num += 1
+    args.extend(names[nargs:nargs+nkwargs])
+    if code.co_flags & _CO_VARKEYWORDS:
+        args.append('**'+names[num])
+    # Python 2 unpacked tuple arguments have invalid identifiers as names
+    if any([not _ARG_REGEXP.match(arg) for arg in args]):
+        return None
+    return tuple(args)
+
+
+def _get_function_args(func):
+    """
+    Returns a tuple of all the function argument names, variable
+    positional and keyword arguments are prefixed by :code:`*` and
+    :code:`**` respectively. Arguments of functions and methods are
+    obtained from their code object when possible and cached
+    """
+    ffunc = func.__func__ if isinstance(func, types.MethodType) else func
+    if not isinstance(ffunc, types.FunctionType):
+        return _get_signature_args(func)
+    bound = (ffunc is not func) and (func.__self__ is not None)
+    entry = _FUNCTION_ARGS.get(ffunc)
+    if (entry is None) or (entry[0] is not ffunc.__code__):
+        entry = _FUNCTION_ARGS[ffunc] = (ffunc.__code__, {})
+    if bound not in entry[1]:
+        args = _get_code_args(ffunc)
+        if bound:
+            # The first argument of a bound method is omitted, unless it is
+            # a variable positional argument
+            args = (
+                (args[1:] if args[0][0] != '*' else args)
+                if args else
+                None
+            )
+        entry[1][bound] = (
+            args if args is not None else _get_signature_args(func)
+        )
+    return entry[1][bound]
+
+
+def _get_file_stamp(fname):
+    """
+    Returns the modification time and size of a file, None if the file
+    does not exist
+    """
+    try:
+        return (os.path.getmtime(fname), os.path.getsize(fname))
+    except OSError:
+        return None
+
+
 def _get_module_name_from_fname(fname):
     """ Get module name from module file name """
     fname = fname.replace('.pyc', '.py')
@@ -47,6 +143,113 @@ def _get_module_name_from_fname(fname):
     raise RuntimeError('Module could not be found')
 
 
+def _build_line_index(entries):
+    """
+    Builds the line number index of a module callables list. The index is
+    a tuple with the callables list (to detect when it is replaced), the
+    callables starting lines, last lines and names (all sorted by starting
+    line) and, for each callable, the position of the nearest preceding
+    callable that ends after it does (to walk out of nested scopes)
+    """
+    iobj = sorted(entries, key=lambda x: x['code_id'][1])
+    starts = [item['code_id'][1] for item in iobj]
+    lasts = [item['last_lineno'] for item in iobj]
+    names = [item['name'] for item in iobj]
+    prev, stack = [], []
+    for num, last in enumerate(lasts):
+        while stack and (lasts[stack[-1]] <= last):
+            stack.pop()
+        prev.append(stack[-1] if stack else -1)
+        stack.append(num)
+    return entries, starts, lasts, names, prev
+
+
+def _get_module_names():
+    """
+    Returns a dictionary of the names of the imported modules keyed by
+    module file name
+    """
+    ret = {}
+    for mobj in list(sys.modules.values()):
+        fname = getattr(mobj, '__file__', None)
+        if isinstance(fname, str):
+            ret.setdefault(fname.replace('.pyc', '.py'), mobj.__name__)
+    return ret
+
+
+def _get_signature_args(func):
+    """
+    Returns a tuple of all the function argument names obtained from the
+    function signature
+    """
+    par_dict = signature(func).parameters
+    # Mark positional and/or keyword arguments (if any)
+    pos = lambda x: x.kind == Parameter.VAR_POSITIONAL
+    kw = lambda x: x.kind == Parameter.VAR_KEYWORD
+    opts = ['', '*', '**']
+    return tuple([
+        '{prefix}{arg}'.format(prefix=opts[pos(value)+2*kw(value)], arg=par)
+        for par, value in par_dict.items()
+    ])
+
+
+def _get_file_digest(fname):
+    """ Returns the hash of the contents of a file """
+    with open(fname, 'rb') as fobj:
+        return hashlib.sha1(fobj.read()).hexdigest()
+
+
+def _get_trace_cache_fname(module_name, fname, cache_dir):
+    """ Returns the trace cache file name of a module """
+    digest = hashlib.sha1(
+        '{0}|{1}|{2}|{3}'.format(
+            sys.version, _TRACE_CACHE_VERSION, module_name, fname
+        ).encode('utf-8')
+    ).hexdigest()
+    return os.path.join(cache_dir, 'trace_{0}.bin'.format(digest))
+
+
+def _trace_module(fargs):
+    """
+    Traces a module, returns its callables database, reverse callables
+    database and class names. Defined at module level (and with a single
+    argument) so that it can be run in a process pool. Results are read
+    from and written to the trace cache if a cache directory is given
+    """
+    module_name, fname, cache_dir = fargs
+    if cache_dir is not None:
+        cname = _get_trace_cache_fname(module_name, fname, cache_dir)
+        digest = _get_file_digest(fname)
+        try:
+            with open(cname, 'rb') as fobj:
+                cache_digest, ret = marshal.load(fobj)
+            if cache_digest == digest:
+                return ret
+        except (IOError, OSError, EOFError, ValueError, TypeError):
+            pass
+    bobj = collections.namedtuple('Bundle', ['lineno', 'col_offset'])
+    lines = _readlines(fname)
+    # Eliminate all Unicode characters till the first ASCII
+    # character is found in first line of file, to deal with
+    # Unicode-encoded source files
+    for num, char in enumerate(lines[0]):   # pragma: no cover
+        if not _unicode_char(char):
+            break
+    lines[0] = lines[0][num:]
+    tree = ast.parse(''.join(lines))
+    aobj = _AstTreeScanner(module_name, fname, lines)
+    aobj.visit(tree)
+    # Create a fake callable at the end of the file to properly
+    # 'close', i.e. assign a last line number to the last
+    # callable in file
+    fake_node = bobj(len(lines)+1, -1)
+    aobj._close_callable(fake_node, force=True)
+    ret = (aobj._callables_db, aobj._reverse_callables_db, aobj._class_names)
+    if cache_dir is not None:
+        _write_trace_cache(cname, (digest, ret))
+    return ret
+
+
 def _validate_fname(fname):
     """ Validates that a string is a valid file name """
     msg = 'Argument `callables_fname` is not valid'
@@ -59,6 +262,52 @@ def _validate_fname(fname):
         raise RuntimeError(msg)
 
 
+def _write_trace_cache(cname, data):
+    """ Writes the trace cache file of a module """
+    # Write to a temporary file first so that concurrent processes never
+    # read a partially written file
+    tmp_cname = '{0}.{1}'.format(cname, os.getpid())
+    try:
+        with open(tmp_cname, 'wb') as fobj:
+            marshal.dump(data, fobj)
+        os.rename(tmp_cname, cname)
+    except (IOError, OSError, ValueError):
+        pass
+
+
+def disable_trace_cache():
+    """
+    Disables the module trace cache (see
+    :py:func:`putil.pinspect.enable_trace_cache`). Files already in the
+    cache directory are not removed
+    """
+    _TRACE_CACHE['cache_dir'] = None
+
+
+def enable_trace_cache(cache_dir):
+    r"""
+    Enables the module trace cache. The results of parsing each module
+    traced by :py:meth:`putil.pinspect.Callables.trace` (and
+    :py:meth:`putil.pinspect.Callables.refresh`) are stored in the cache
+    directory, and modules whose file name, contents and Python interpreter
+    version have not changed are read from there instead of being parsed
+    again, including by other processes
+
+    :param cache_dir: Cache directory, created if it does not exist
+    :type  cache_dir: string
+
+    :raises: RuntimeError (Argument \`cache_dir\` is not valid)
+    """
+    if not isinstance(cache_dir, str):
+        raise RuntimeError('Argument `cache_dir` is not valid')
+    if not os.path.isdir(cache_dir):
+        try:
+            os.makedirs(cache_dir)
+        except OSError:
+            raise RuntimeError('Argument `cache_dir` is not valid')
+    _TRACE_CACHE['cache_dir'] = cache_dir
+
+
 def get_function_args(func, no_self=False, no_varargs=False):
     """
     Returns a tuple of the function argument names in the order they are
@@ -99,27 +348,14 @@ def get_function_args(func, no_self=False, no_varargs=False):
         ... )
         ('self', 'value')
     """
-    par_dict = signature(func).parameters
-    # Mark positional and/or keyword arguments (if any)
-    pos = lambda x: x.kind == Parameter.VAR_POSITIONAL
-    kw = lambda x: x.kind == Parameter.VAR_KEYWORD
-    opts = ['', '*', '**']
-    args = [
-        '{prefix}{arg}'.format(prefix=opts[pos(value)+2*kw(value)], arg=par)
-        for par, value in par_dict.items()
-    ]
+    args = _get_function_args(func)
     # Filter out 'self' from parameter list (optional)
-    self_filtered_args = args if not args else (
-        args[1 if (args[0] == 'self') and no_self else 0:]
-    )
+    if no_self and args and (args[0] == 'self'):
+        args = args[1:]
     # Filter out positional or keyword arguments (optional)
-    pos = lambda x: (len(x) > 1) and (x[0] == '*') and (x[1] != '*')
-    kw = lambda x: (len(x) > 2) and (x[:2] == '**')
-    varargs_filtered_args = [
-        arg for arg in self_filtered_args
-        if (not no_varargs) or all([no_varargs, not pos(arg), not kw(arg)])
-    ]
-    return tuple(varargs_filtered_args)
+    if no_varargs:
+        args = tuple([arg for arg in args if arg[0] != '*'])
+    return args
 
 
 def get_module_name(module_obj):
@@ -177,6 +413,16 @@ def is_special_method(name):
     return name.startswith('__')
 
 
+def trace_cache_dir():
+    """
+    Returns the module trace cache directory, None if the module trace
+    cache is disabled (see :py:func:`putil.pinspect.enable_trace_cache`)
+
+    :rtype: string or None
+    """
+    return _TRACE_CACHE['cache_dir']
+
+
 def private_props(obj):
     """
     Yields private properties of an object. A private property is
@@ -228,6 +474,11 @@ class Callables(object):
         self._fnames = {}
         self._module_names = []
         self._class_names = []
+        self._line_index = {}
+        # Location (file name, file modification time and size when it was
+        # loaded, offset and size) of the binary file module blocks loaded
+        # lazily (see load method), keyed by module name
+        self._lazy_modules = {}
         if fnames:
             self.trace(fnames)
 
@@ -257,6 +508,8 @@ class Callables(object):
             >>> obj1+obj2 == obj3
             True
         """
+        self._load_lazy_modules()
+        other._load_lazy_modules()
         self._check_intersection(other)
         robj = Callables()
         robj._callables_db = copy.deepcopy(self._callables_db)
@@ -337,9 +590,14 @@ class Callables(object):
             >>> 5 == obj3
             False
         """
-        return isinstance(other, Callables) and all([
+        if not isinstance(other, Callables):
+            return False
+        self._load_lazy_modules()
+        other._load_lazy_modules()
+        # The line number index is derived information, built on demand
+        return all([
             sorted(getattr(self, attr)) == sorted(getattr(other, attr))
-            for attr in private_props(self)]
+            for attr in private_props(self) if attr != '_line_index']
         )
 
     def __iadd__(self, other):
@@ -369,6 +627,8 @@ class Callables(object):
             >>> obj1 == obj3
             True
         """
+        self._load_lazy_modules()
+        other._load_lazy_modules()
         self._check_intersection(other)
         self._callables_db.update(copy.deepcopy(other._callables_db))
         self._reverse_callables_db.update(
@@ -450,6 +710,7 @@ class Callables(object):
         The numbers in parenthesis indicate the line number in which the
         callable starts and ends within the file it is defined in
         """
+        self._load_lazy_modules()
         if self._module_names:
             ret = []
             # List traced modules
@@ -502,49 +763,83 @@ class Callables(object):
 
     def _get_callables_db(self):
         """ Getter for callables_db property """
+        self._load_lazy_modules()
         return self._callables_db
 
     def get_callable_from_line(self, module_file, lineno):
         """ Get the callable that the line number belongs to """
-        module_name = _get_module_name_from_fname(module_file)
+        fdict = self._fnames.get(module_file)
+        module_name = (
+            fdict['name']
+            if fdict else
+            _get_module_name_from_fname(module_file)
+        )
+        if module_name in self._lazy_modules:
+            self._load_lazy_modules([module_name])
         if module_name not in self._modules_dict:
             self.trace([module_file])
-        ret = None
-        # Sort callables by starting line number
-        iobj = sorted(
-            self._modules_dict[module_name], key=lambda x: x['code_id'][1]
-        )
-        for value in iobj:
-            if value['code_id'][1] <= lineno <= value['last_lineno']:
-                ret = value['name']
-            elif value['code_id'][1] > lineno:
-                break
-        return ret if ret else module_name
+        entries = self._modules_dict[module_name]
+        index = self._line_index.get(module_name)
+        if (index is None) or (index[0] is not entries):
+            index = self._line_index[module_name] = _build_line_index(entries)
+        _, starts, lasts, names, prev = index
+        # Start from the last callable that starts at or before the line
+        # number and walk out of nested scopes until one that contains the
+        # line number is found, callables in between end before the
+        # line number
+        num = bisect.bisect_right(starts, lineno)-1
+        while (num >= 0) and (lasts[num] < lineno):
+            num = prev[num]
+        return names[num] if num >= 0 else module_name
 
     def _get_reverse_callables_db(self):
         """ Getter for reverse_callables_db property """
+        self._load_lazy_modules()
         return self._reverse_callables_db
 
-    def load(self, callables_fname):
+    def load(self, callables_fname, lazy=False):
         """
         Loads traced modules information from a `JSON
-        <http://www.json.org/>`_ file. The loaded module information is merged
+        <http://www.json.org/>`_ file or from a binary file (see
+        :py:meth:`putil.pinspect.Callables.save`); the file format is
+        detected automatically. The loaded module information is merged
         with any existing module information
 
         :param callables_fname: File name
         :type  callables_fname: :ref:`FileNameExists`
 
+        :param lazy: Flag that indicates whether the callables of each module
+                     are read and decoded only when they are first needed
+                     (True) or when the file is loaded (False). Only the
+                     module index of a binary file is read when the file is
+                     loaded lazily, so the file has to exist, unchanged,
+                     until all its modules are decoded (otherwise a
+                     RuntimeError exception is raised then); JSON files are
+                     always decoded completely
+        :type  lazy: boolean
+
         :raises:
          * OSError (File *[fname]* could not be found)
 
          * RuntimeError (Argument \\`callables_fname\\` is not valid)
+
+         * RuntimeError (Argument \\`lazy\\` is not valid)
+
+         * RuntimeError (File *[callables_fname]* format is not supported)
         """
-        # Validate file name
+        # Validate arguments
         _validate_fname(callables_fname)
+        if not isinstance(lazy, bool):
+            raise RuntimeError('Argument `lazy` is not valid')
         if not os.path.exists(callables_fname):
             raise OSError(
                 'File {0} could not be found'.format(callables_fname)
             )
+        with open(callables_fname, 'rb') as fobj:
+            if fobj.read(len(_BIN_MAGIC)) == _BIN_MAGIC:
+                fobj.seek(0)
+                self._load_binary(fobj, callables_fname, lazy)
+                return
         with open(callables_fname, 'r') as fobj:
             fdict = json.load(fobj)
         if sys.hexversion < 0x03000000: # pragma: no cover
@@ -568,31 +863,148 @@ class Callables(object):
             rdict[(key, int(tokens[1]))] = value
         self._reverse_callables_db.update(rdict)
         self._modules_dict.update(fdict['_modules_dict'])
+        for module_name in fdict['_modules_dict']:
+            self._lazy_modules.pop(module_name, None)
+            self._line_index.pop(module_name, None)
         self._fnames.update(fdict['_fnames'])
         self._module_names.extend(fdict['_module_names'])
         self._class_names.extend(fdict['_class_names'])
         self._module_names = sorted(list(set(self._module_names)))
         self._class_names = sorted(list(set(self._class_names)))
 
-    def refresh(self):
+    def _load_binary(self, fobj, callables_fname, lazy=False):
+        """ Loads traced modules information from a binary file object """
+        _, version, marshal_version, index_size = _BIN_HEADER.unpack(
+            fobj.read(_BIN_HEADER.size)
+        )
+        if (version != _BIN_VERSION) or (marshal_version > marshal.version):
+            raise RuntimeError(
+                'File {0} format is not supported'.format(callables_fname)
+            )
+        index = marshal.loads(fobj.read(index_size))
+        # The module blocks follow the index in file order. If loading
+        # lazily only their location is kept, and each one is read when it
+        # is first needed
+        start = _BIN_HEADER.size+index_size
+        stamp = _get_file_stamp(callables_fname)
+        for module_name, fname, date, classes, offset, size in index[0]:
+            if lazy:
+                self._lazy_modules[module_name] = (
+                    callables_fname, stamp, start+offset, size
+                )
+            else:
+                self._lazy_modules.pop(module_name, None)
+                fobj.seek(start+offset)
+                self._load_module_block(
+                    module_name, marshal.loads(fobj.read(size))
+                )
+            self._fnames[fname] = {
+                'name':module_name, 'date':date, 'classes':list(classes)
+            }
+        self._module_names = sorted(list(set(self._module_names+index[1])))
+        self._class_names = sorted(list(set(self._class_names+index[2])))
+
+    def _load_lazy_modules(self, module_names=None):
         """
+        Decodes the lazily loaded binary file module blocks of the given
+        modules (all lazily loaded modules if None)
+        """
+        if not self._lazy_modules:
+            return
+        module_names = (
+            list(self._lazy_modules) if module_names is None else module_names
+        )
+        # Each file is opened once and its blocks are read in file order
+        blocks = {}
+        for module_name in module_names:
+            if module_name in self._lazy_modules:
+                callables_fname, stamp, offset, size = (
+                    self._lazy_modules[module_name]
+                )
+                blocks.setdefault((callables_fname, stamp), []).append(
+                    (offset, size, module_name)
+                )
+        for (callables_fname, stamp), items in blocks.items():
+            if _get_file_stamp(callables_fname) != stamp:
+                raise RuntimeError(
+                    'File {0} changed since it was loaded'.format(
+                        callables_fname
+                    )
+                )
+            with open(callables_fname, 'rb') as fobj:
+                for offset, size, module_name in sorted(items):
+                    fobj.seek(offset)
+                    block = marshal.loads(fobj.read(size))
+                    del self._lazy_modules[module_name]
+                    self._load_module_block(module_name, block)
+
+    def _load_module_block(self, module_name, block):
+        """ Adds the callables of a binary file module block to the object """
+        files, names, callable_types, lines, last_linenos, file_ids, rdb = (
+            block
+        )
+        entries = []
+        for name, ctype, line, last_lineno, file_id in zip(
+                names, callable_types, lines, last_linenos, file_ids):
+            entry = {
+                'name':name,
+                'type':_BIN_TYPES[ctype],
+                'code_id':(files[file_id], line),
+                'last_lineno':last_lineno
+            }
+            self._callables_db[name] = entry
+            entries.append(entry)
+        self._modules_dict[module_name] = entries
+        self._line_index.pop(module_name, None)
+        fname, rlines, rnames = rdb
+        self._reverse_callables_db.update(
+            [((fname, line), name) for line, name in zip(rlines, rnames)]
+        )
+
+    def refresh(self, processes=None):
+        r"""
         Re-traces modules which have been modified since the time they were
         traced
+
+        :param processes: Number of worker processes used to parse the
+                          modules. If None or 1 the modules are parsed in
+                          the calling process
+        :type  processes: positive integer or None
+
+        :raises: RuntimeError (Argument \`processes\` is not valid)
         """
-        self.trace(list(self._fnames.keys()), _refresh=True)
+        self.trace(
+            list(self._fnames.keys()), processes=processes, _refresh=True
+        )
 
-    def save(self, callables_fname):
+    def save(self, callables_fname, binary=False):
         """
-        Saves traced modules information to a `JSON`_ file. If
-        the file exists it is overwritten
+        Saves traced modules information to a `JSON`_ file or to a binary
+        file. If the file exists it is overwritten. The binary format is
+        more compact and faster to load than the JSON format, but it is
+        specific to this package and it may not be readable by a different
+        version of the Python interpreter
 
         :param callables_fname: File name
         :type  callables_fname: :ref:`FileName`
 
-        :raises: RuntimeError (Argument \\`fname\\` is not valid)
+        :param binary: Flag that indicates whether the file is written in the
+                       binary format (True) or in the JSON format (False)
+        :type  binary: boolean
+
+        :raises:
+         * RuntimeError (Argument \\`binary\\` is not valid)
+
+         * RuntimeError (Argument \\`fname\\` is not valid)
         """
-        # Validate file name
+        # Validate arguments
         _validate_fname(callables_fname)
+        if not isinstance(binary, bool):
+            raise RuntimeError('Argument `binary` is not valid')
+        self._load_lazy_modules()
+        if binary:
+            self._save_binary(callables_fname)
+            return
         # JSON keys have to be strings but the reverse callables dictionary
         # keys are tuples, where the first item is a file name and the
         # second item is the starting line of the callable within that file
@@ -609,7 +1021,65 @@ class Callables(object):
         with open(callables_fname, 'w') as fobj:
             json.dump(fdict, fobj)
 
-    def trace(self, fnames, _refresh=False):
+    def _save_binary(self, callables_fname):
+        """ Saves traced modules information to a binary file """
+        # Each module is stored in its own block, with the callables
+        # information split in columns and the file names replaced by
+        # indexes into a per-block file name table. The reverse callables
+        # database is stored separately because a callable that is defined
+        # conditionally has more than one starting line
+        rdict = {}
+        for key, value in self._reverse_callables_db.items():
+            rdict.setdefault(key[0], []).append((key[1], value))
+        blocks, modules, offset = [], [], 0
+        for fname in sorted(self._fnames):
+            fdict = self._fnames[fname]
+            entries = self._modules_dict.get(fdict['name'], [])
+            rentries = sorted(rdict.get(fname, []))
+            file_ids = {}
+            for entry in entries:
+                file_ids.setdefault(entry['code_id'][0], len(file_ids))
+            block = marshal.dumps(
+                (
+                    sorted(file_ids, key=file_ids.get),
+                    [entry['name'] for entry in entries],
+                    [_BIN_TYPES.index(entry['type']) for entry in entries],
+                    [entry['code_id'][1] for entry in entries],
+                    [entry['last_lineno'] for entry in entries],
+                    [file_ids[entry['code_id'][0]] for entry in entries],
+                    (
+                        fname,
+                        [item[0] for item in rentries],
+                        [item[1] for item in rentries]
+                    )
+                )
+            )
+            modules.append(
+                (
+                    fdict['name'],
+                    fname,
+                    fdict['date'],
+                    list(fdict['classes']),
+                    offset,
+                    len(block)
+                )
+            )
+            blocks.append(block)
+            offset += len(block)
+        index = marshal.dumps(
+            (modules, list(self._module_names), list(self._class_names))
+        )
+        with open(callables_fname, 'wb') as fobj:
+            fobj.write(
+                _BIN_HEADER.pack(
+                    _BIN_MAGIC, _BIN_VERSION, marshal.version, len(index)
+                )
+            )
+            fobj.write(index)
+            for block in blocks:
+                fobj.write(block)
+
+    def trace(self, fnames, processes=None, _refresh=False):
         r"""
         Generates a list of module callables (functions, classes, methods and
         class properties) and gets their attributes (callable type, file name,
@@ -618,81 +1088,95 @@ class Callables(object):
         :param fnames: File names of the modules to trace
         :type  fnames: list
 
+        :param processes: Number of worker processes used to parse the
+                          modules. If None or 1 the modules are parsed in
+                          the calling process
+        :type  processes: positive integer or None
+
         :raises:
          * OSError (File *[fname]* could not be found)
 
          * RuntimeError (Argument \`fnames\` is not valid)
+
+         * RuntimeError (Argument \`processes\` is not valid)
         """
         # pylint: disable=R0101
         if fnames and (not isinstance(fnames, list)):
             raise RuntimeError('Argument `fnames` is not valid')
         if fnames and any([not isinstance(item, str) for item in fnames]):
             raise RuntimeError('Argument `fnames` is not valid')
+        if ((processes is not None) and
+           ((not isinstance(processes, int)) or
+           isinstance(processes, bool) or (processes < 1))):
+            raise RuntimeError('Argument `processes` is not valid')
         for fname in fnames:
             if not os.path.exists(fname):
                 raise OSError('File {0} could not be found'.format(fname))
         fnames = [item.replace('.pyc', '.py') for item in fnames]
-        bobj = collections.namedtuple('Bundle', ['lineno', 'col_offset'])
+        # Modules to trace, and (when refreshing) keys of the reverse
+        # callables database grouped by file name, computed once
+        mnames, rkeys = None, None
+        todo, done = [], set()
         for fname in fnames:
             if ((fname not in self._fnames) or (_refresh and
                 (fname in self._fnames)
                 and (self._fnames[fname]['date'] < os.path.getmtime(fname)))):
-                module_name = (
-                    _get_module_name_from_fname(fname)
-                    if not _refresh else
-                    self._fnames[fname]['name']
-                )
+                if _refresh:
+                    module_name = self._fnames[fname]['name']
+                else:
+                    if mnames is None:
+                        mnames = _get_module_names()
+                    if fname not in mnames:
+                        raise RuntimeError('Module could not be found')
+                    module_name = mnames[fname]
+                if fname in done:
+                    continue
+                done.add(fname)
                 # Remove old module information if it is going to be refreshed
                 if _refresh:
+                    # Module information not decoded yet is simply dropped
+                    self._lazy_modules.pop(module_name, None)
                     self._module_names.pop(
                         self._module_names.index(module_name)
                     )
                     for cls in self._fnames[fname]['classes']:
                         self._class_names.pop(self._class_names.index(cls))
-                    dlist = []
-                    for key, value in self._reverse_callables_db.items():
-                        if key[0] == fname:
-                            dlist.append(key)
-                            try:
-                                del self._callables_db[value]
-                            except KeyError:
-                                pass
-                    for item in set(dlist):
-                        del self._reverse_callables_db[item]
-                lines = _readlines(fname)
-                # Eliminate all Unicode characters till the first ASCII
-                # character is found in first line of file, to deal with
-                # Unicode-encoded source files
-                for num, char in enumerate(lines[0]):   # pragma: no cover
-                    if not _unicode_char(char):
-                        break
-                lines[0] = lines[0][num:]
-                tree = ast.parse(''.join(lines))
-                aobj = _AstTreeScanner(module_name, fname, lines)
-                aobj.visit(tree)
-                # Create a fake callable at the end of the file to properly
-                # 'close', i.e. assign a last line number to the last
-                # callable in file
-                fake_node = bobj(len(lines)+1, -1)
-                aobj._close_callable(fake_node, force=True)
-                self._class_names += aobj._class_names[:]
-                self._module_names.append(module_name)
-                self._callables_db.update(aobj._callables_db)
-                self._reverse_callables_db.update(aobj._reverse_callables_db)
-                # Split into modules
-                self._modules_dict[module_name] = []
-                iobj = [
-                    item
-                    for item in self._callables_db.values()
-                    if item['name'].startswith(module_name+'.')
-                ]
-                for entry in iobj:
-                    self._modules_dict[module_name].append(entry)
-                self._fnames[fname] = {
-                    'name': module_name,
-                    'date': os.path.getmtime(fname),
-                    'classes':aobj._class_names[:]
-                }
+                    if rkeys is None:
+                        rkeys = {}
+                        for key in self._reverse_callables_db:
+                            rkeys.setdefault(key[0], []).append(key)
+                    for key in rkeys.get(fname, []):
+                        value = self._reverse_callables_db.pop(key)
+                        self._callables_db.pop(value, None)
+                todo.append((module_name, fname, _TRACE_CACHE['cache_dir']))
+        if (processes is None) or (processes == 1) or (len(todo) < 2):
+            results = [_trace_module(item) for item in todo]
+        else:
+            # Imported on demand to keep module import time low
+            import multiprocessing
+            pool = multiprocessing.Pool(min(processes, len(todo)))
+            try:
+                results = pool.map(_trace_module, todo)
+            finally:
+                pool.close()
+                pool.join()
+        for (module_name, fname, _), result in zip(todo, results):
+            callables_db, reverse_callables_db, class_names = result
+            self._class_names += class_names[:]
+            self._module_names.append(module_name)
+            self._callables_db.update(callables_db)
+            self._reverse_callables_db.update(reverse_callables_db)
+            # The module callables are indexed straight from the module
+            # trace, entries are shared with the callables database
+            self._modules_dict[module_name] = [
+                self._callables_db[name] for name in callables_db
+            ]
+            self._line_index.pop(module_name, None)
+            self._fnames[fname] = {
+                'name': module_name,
+                'date': os.path.getmtime(fname),
+                'classes':class_names[:]
+            }
 
     # Managed attributes
     callables_db = property(
@@ -343,6 +343,7 @@ class CsvSource(DataSource):
         Check that columns in filter specification can be found in
         comma-separated file header
         """
+        # pylint: disable=W0640
         rfilter_ex = putil.exh.addex(
             ValueError,
             'Column *[col_name]* in row filter not found '
@@ -352,7 +353,7 @@ class CsvSource(DataSource):
             for key in self.rfilter:
                 rfilter_ex(
                     key not in self._csv_obj.header(),
-                    _MF('col_name', key, 'fname', self.fname)
+                    lambda: _MF('col_name', key, 'fname', self.fname)
                 )
 
     def _check_indep_col_label(self):
@@ -374,6 +375,7 @@ class CsvSource(DataSource):
         Checks that the extra arguments are in the processing
         function definition
         """
+        # pylint: disable=W0640
         eargs_ex = putil.exh.addex(
             ValueError,
             'Extra argument `*[arg_name]*` not found in argument '
@@ -387,7 +389,7 @@ class CsvSource(DataSource):
                     all(
                         [arg not in args for arg in [key, '*args', '**kwargs']]
                     ),
-                    _MF('func_name', fname, 'arg_name', key)
+                    lambda: _MF('func_name', fname, 'arg_name', key)
                 )
 
     def _get_dep_col_label(self):
@@ -517,9 +519,11 @@ class CsvSource(DataSource):
             )
         invalid_ret_ex(
             not (isinstance(ret, list) or isinstance(ret, tuple)),
-            _MF('func_name', self.fproc.__name__)
+            lambda: _MF('func_name', self.fproc.__name__)
+        )
+        illegal_ret_ex(
+            len(ret) != 2, lambda: _MF('func_name', self.fproc.__name__)
         )
-        illegal_ret_ex(len(ret) != 2, _MF('func_name', self.fproc.__name__))
         indep_var = ret[0]
         dep_var = ret[1]
         empty_indep_ex(
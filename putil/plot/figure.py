@@ -8,8 +8,6 @@ from __future__ import print_function
 import os
 # PyPI imports
 import numpy
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_agg import FigureCanvasAgg
 # Putil imports
 import putil.exh
 import putil.misc
@@ -506,7 +504,10 @@ class Figure(object):
         return (self.panels is not None) and len(self.panels)
 
     def _draw(self, force_redraw=False, raise_exception=False):
-        # pylint: disable=C0326,W0612
+        # pylint: disable=C0326,W0612,W0640
+        # Matplotlib is slow to import, defer it until a figure is drawn
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
         log_ex = putil.exh.addex(
             ValueError,
             'Figure cannot be plotted with a logarithmic '
@@ -531,7 +532,7 @@ class Figure(object):
                             self.log_indep_axis and
                             (min(series_obj.indep_var) < 0)
                         ),
-                        edata=_MF(
+                        edata=lambda: _MF(
                             'panel_num', panel_num, 'series_num', series_num
                         )
                     )
@@ -703,6 +704,7 @@ class Figure(object):
         self._fig.savefig(
             fname, bbox_inches='tight', dpi=self._fig.dpi, format=ftype
         )
+        import matplotlib.pyplot as plt
         plt.close('all')
 
     def show(self):
@@ -723,6 +725,7 @@ class Figure(object):
         .. [[[end]]]
         """
         self._draw(force_redraw=self._fig is None, raise_exception=True)
+        import matplotlib.pyplot as plt
         plt.show()
 
     # Managed attributes
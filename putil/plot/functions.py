@@ -4,6 +4,7 @@
 # pylint: disable=C0111,C0302,F0401,R0914,W0105,W0212,W0611
 
 # Standard library imports
+from __future__ import division
 import abc
 import collections
 import itertools
@@ -12,7 +13,6 @@ import sys
 # PyPI imports
 import six
 import numpy
-import matplotlib.pyplot as plt
 # Putil imports
 import putil.exh
 import putil.eng
@@ -78,8 +78,6 @@ def _intelligent_ticks(series, series_min, series_max,
     else:
         min_series = min(series)
         max_series = max(series)
-        rounded_min_series = putil.eng.round_mantissa(min_series, PRECISION)
-        rounded_max_series = putil.eng.round_mantissa(max_series, PRECISION)
         if log_axis:
             dec_start = int(math.log10(min_series))
             dec_stop = int(math.ceil(math.log10(max_series)))
@@ -91,60 +89,63 @@ def _intelligent_ticks(series, series_min, series_max,
             # Try to find the tick spacing that will have the most number of
             # data points on grid. Otherwise, place max_ticks uniformly
             # distributed across the data rage
-            series_delta = putil.eng.round_mantissa(
-                max_series-min_series, PRECISION
-            )
-            working_series = numpy.array(series[:])
+            # Spacings, greatest common divisor (GCD) and tick locations are
+            # computed exactly over the series scaled to integers, there is
+            # no need to round them to avoid confusing the GCD algorithm
+            dseries = putil.eng.to_dec_vector(series, PRECISION)
+            series_delta = max(dseries.ints)-min(dseries.ints)
+            working_series = dseries
             tick_list = list()
             num_ticks = SUGGESTED_MAX_TICKS
-            while (num_ticks >= MIN_TICKS) and (len(working_series) > 1):
-                # Round mantissa of spacings so as to not confuse greatest
-                # common denominator algorithm
-                sdiff = numpy.diff(working_series)
-                nzero_indexes = numpy.nonzero(sdiff)
-                nzero = sdiff[nzero_indexes]
-                exp = numpy.power(10, numpy.floor(numpy.log10(nzero)))
-                nzero = numpy.round(nzero/exp, PRECISION)*exp
-                sdiff[nzero_indexes] = nzero
-                # numpy.unique return list is sorted in ascending order
-                data_spacing = numpy.unique(nzero)
-                # Calculation of greatest common denominator (GCD) is
-                # computationally (and time) expensive, only do it when the
-                # minimum spacing would generate a number of ticks less than
-                # the suggested maximum number of ticks, since the GCD of
-                # all the data point spacings is at most as big as the minimum
-                # data spacing
+            while (num_ticks >= MIN_TICKS) and (len(working_series.ints) > 1):
+                sdiff = putil.eng.dec_step(working_series).ints
+                # Sorted in ascending order
+                data_spacing = sorted(set(item for item in sdiff if item))
+                if not data_spacing:
+                    break
+                # The greatest common divisor (GCD) of all the data point
+                # spacings is at most as big as the minimum data spacing,
+                # only compute it when the minimum spacing would generate a
+                # number of ticks less than the suggested maximum number of
+                # ticks
                 if (series_delta/data_spacing[0])+1 < SUGGESTED_MAX_TICKS:
-                    tick_spacing = putil.misc.gcd(data_spacing)
+                    tick_spacing = putil.eng.dec_gcd(
+                        putil.eng.DECVECTOR(data_spacing, dseries.exp)
+                    ).ints[0]
                     num_ticks = (
-                        (series_delta/tick_spacing)+1
+                        (series_delta//tick_spacing)+1
                         if tick_spacing else
                         MIN_TICKS
                     )
                     if MIN_TICKS <= num_ticks <= SUGGESTED_MAX_TICKS:
-                        tick_list = numpy.linspace(
-                            rounded_min_series, rounded_max_series, num_ticks
-                        ).tolist()
+                        tick_list = putil.eng.dec_linspace(
+                            min_series, max_series, num_ticks, PRECISION
+                        )
                         break
                 # Remove elements that cause minimum spacing, to see if with
                 # those elements removed the number of tick marks can be
                 # withing the acceptable range
                 min_data_spacing = data_spacing[0]
-                indexes = numpy.concatenate(
-                    ([True], (sdiff != min_data_spacing))
-                )
+                indexes = [True]+[item != min_data_spacing for item in sdiff]
                 # Account for fact that if minimum spacing is between last two
                 # elements, the last element cannot be removed (it is the end
                 # of the range), but rather the next-to-last has to be removed
-                if (not indexes[-1]) and (len(working_series) > 2):
+                if (not indexes[-1]) and (len(working_series.ints) > 2):
                     indexes[-2], indexes[-1] = False, True
-                working_series = working_series[indexes]
+                working_series = putil.eng.DECVECTOR(
+                    [
+                        item
+                        for item, keep in zip(working_series.ints, indexes)
+                        if keep
+                    ],
+                    dseries.exp
+                )
             tick_list = (
                 tick_list
                 if len(tick_list) > 0 else
-                numpy.linspace(
+                putil.eng.dec_linspace(
                     min_series, max_series, SUGGESTED_MAX_TICKS
-                ).tolist()
+                )
             )
             tick_spacing = putil.eng.round_mantissa(
                 tick_list[1]-tick_list[0], PRECISION
@@ -255,14 +256,15 @@ def _scale_ticks(tick_list, mode):
     rollback = (above_1k_sum > below_1k_sum) and last_tick_below_10k
     scale = 1 if rollback else scale
     unit = putil.eng.peng_suffix_math(unit, +1) if rollback else unit
-    tick_list = numpy.array(
-        [
-            putil.eng.round_mantissa(element/scale, PRECISION)
-            for element in tick_list
-        ]
+    # Scaling by a power of ten is exact in the decimal representation
+    dticks = putil.eng.to_dec_vector(tick_list, PRECISION)
+    tick_list = putil.eng.from_dec_vector(
+        putil.eng.DECVECTOR(
+            dticks.ints, dticks.exp-int(round(math.log10(scale)))
+        )
     )
-    tick_min = putil.eng.round_mantissa(tick_min/scale, PRECISION)
-    tick_max = putil.eng.round_mantissa(tick_max/scale, PRECISION)
+    tick_min, tick_max = tick_list[0], tick_list[-1]
+    tick_list = numpy.array(tick_list)
     loc, labels = _uniquify_tick_labels(tick_list, tick_min, tick_max)
     count = len(''.join(labels))
     return {
@@ -369,6 +371,7 @@ def parameterized_color_space(param_list, offset=0, color_space='binary'):
     .. [[[end]]]
     """
     # pylint: disable=E1101
+    import matplotlib.pyplot as plt
     color_space_name_list = [
         'binary', 'Blues', 'BuGn', 'BuPu', 'GnBu', 'Greens', 'Greys',
         'Oranges', 'OrRd', 'PuBu', 'PuBuGn', 'PuRd', 'Purples', 'RdPu',
@@ -5,7 +5,6 @@
 
 # PyPI imports
 import numpy
-import matplotlib.pyplot as plt
 # Putil imports
 import putil.exh
 import putil.pcontracts
@@ -892,6 +891,7 @@ class Panel(object):
     def _draw_panel(self, axarr_prim, indep_axis_dict, print_indep_axis):
         """ Draw panel series """
         # pylint: disable=W0612
+        import matplotlib.pyplot as plt
         axarr_sec = (
             axarr_prim.twinx()
             if self._panel_has_secondary_axis else
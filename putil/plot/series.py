@@ -5,10 +5,6 @@
 
 # PyPI imports
 import numpy
-import matplotlib.path
-import matplotlib.pyplot as plt
-from scipy.stats import linregress
-from scipy.interpolate import InterpolatedUnivariateSpline
 # Putil imports
 import putil.misc
 import putil.pcontracts
@@ -358,6 +354,7 @@ class Series(object):
     def _validate_marker(self, marker):
         """ Validate if marker specification is valid """
         # pylint: disable=R0201
+        import matplotlib.pyplot as plt
         try:
             plt.plot(range(10), marker=marker)
         except ValueError:
@@ -368,6 +365,8 @@ class Series(object):
 
     def _print_marker(self):
         """ Returns marker description """
+        import matplotlib.markers
+        import matplotlib.path
         marker_consts = [
             {
                 'value':matplotlib.markers.TICKLEFT,
@@ -438,11 +437,13 @@ class Series(object):
                 self.interp_indep_var = numpy.concatenate(
                     (self.interp_indep_var, [self.indep_var[-1]])
                 )
+                from scipy.interpolate import InterpolatedUnivariateSpline
                 spl = InterpolatedUnivariateSpline(
                     self.indep_var, self.dep_var
                 )
                 self.interp_dep_var = spl(self.interp_indep_var)
             elif self.interp == 'LINREG':
+                from scipy.stats import linregress
                 slope, intercept, _, _, _ = linregress(
                     self.indep_var, self.dep_var
                 )
@@ -493,6 +494,7 @@ class Series(object):
 
     def _legend_artist(self, legend_scale=None):
         """ Creates artist (marker -if used- and line style -if used-) """
+        import matplotlib.pyplot as plt
         legend_scale = LEGEND_SCALE if legend_scale is None else legend_scale
         return plt.Line2D(
             (0, 1),
@@ -1,14 +1,14 @@
 # ptypes.py
 # Copyright (c) 2013-2016 Pablo Acosta-Serafini
 # See LICENSE for details
-# pylint: disable=C0111
+# pylint: disable=C0111,W0212
 
 # Standard library imports
 import os
 import platform
 import inspect
-# PyPI imports
-import numpy
+import re
+import sys
 # Putil imports
 import putil.pcontracts
 
@@ -21,6 +21,20 @@ _SUFFIX_TUPLE = (
     ' ',
     'k', 'M', 'G', 'T', 'P', 'E', 'Z', 'Y'
 )
+# Strings accepted by _check_engineering_notation_number, i.e. a string that
+# float() accepts optionally followed by an engineering suffix. A trailing
+# suffix character is always taken to be the suffix, so 'inf' or 'nan' are
+# only numbers when followed by one. Digit grouping underscores are accepted
+# by float() starting with Python 3.6
+_DIGITS = r'\d(?:_?\d)*' if sys.version_info >= (3, 6) else r'\d+'
+_NUMBER = r'(?:{0}\.(?:{0})?|\.{0}|{0})(?:[eE][+-]?{0})?'.format(_DIGITS)
+_ENG_NUMBER_REGEXP = re.compile(
+    r'^\s*[+-]?(?:(?:[iI][nN][fF](?:[iI][nN][iI][tT][yY])?|[nN][aA][nN]|'
+    r'{0})\s*[{1}]|[iI][nN]F|[nN][aA]N|{0})\s*$'.format(
+        _NUMBER,
+        ''.join(item for item in _SUFFIX_TUPLE if item != ' ')
+    )
+)
 
 
 ###
@@ -65,11 +79,38 @@ def _check_csv_row_filter(obj):
     return 0
 
 
+def _check_engineering_notation_number(obj):
+    try:
+        obj = obj.rstrip()
+        float(obj[:-1] if obj[-1] in _SUFFIX_TUPLE else obj)
+        return False
+    except (AttributeError, IndexError, ValueError):
+        # AttributeError: obj.rstrip(), object could not be a string
+        # IndexError: obj[-1], when an empty string
+        # ValueError: float(), when not a string representing a number
+        return True
+
+
+def _check_many_engineering_notation_number(objs):
+    # Strings, by far the common case, are matched against a pre-compiled
+    # regular expression instead of going through the exception-driven
+    # single-object check
+    match = _ENG_NUMBER_REGEXP.match
+    return [
+        num for num, obj in enumerate(objs)
+        if ((not match(obj)) if isinstance(obj, str) else
+           _check_engineering_notation_number(obj))
+    ]
+
+
 def _check_increasing_real_numpy_vector(obj):
     # pylint: disable=C0103
-    if ((not isinstance(obj, numpy.ndarray)) or (isinstance(obj, numpy.ndarray)
-       and ((len(obj.shape) > 1) or ((len(obj.shape) == 1) and
-       (obj.shape[0] == 0))))):
+    # An object can only be a Numpy vector if Numpy has been imported, this
+    # avoids importing Numpy (which is slow) if it is not used elsewhere
+    numpy = sys.modules.get('numpy', None)
+    if ((numpy is None) or (not isinstance(obj, numpy.ndarray)) or
+       (len(obj.shape) > 1) or ((len(obj.shape) == 1) and
+       (obj.shape[0] == 0))):
         return True
     if (((obj.dtype.type == numpy.array([0]).dtype.type) or
        (obj.dtype.type == numpy.array([0.0]).dtype.type)) and
@@ -80,7 +121,8 @@ def _check_increasing_real_numpy_vector(obj):
 
 
 def _check_real_numpy_vector(obj):
-    if (isinstance(obj, numpy.ndarray) and
+    numpy = sys.modules.get('numpy', None)
+    if ((numpy is not None) and isinstance(obj, numpy.ndarray) and
        (len(obj.shape) == 1) and (obj.shape[0] > 0) and
        ((obj.dtype.type == numpy.array([0]).dtype.type) or
        (obj.dtype.type == numpy.array([0.0]).dtype.type))):
@@ -88,6 +130,33 @@ def _check_real_numpy_vector(obj):
     return True
 
 
+def _check_many_increasing_real_numpy_vector(objs):
+    # pylint: disable=C0103
+    return _check_many_real_numpy_vector(objs, True)
+
+
+def _check_many_real_numpy_vector(objs, increasing=False):
+    numpy = sys.modules.get('numpy', None)
+    if ((numpy is not None) and isinstance(objs, numpy.ndarray) and
+       (len(objs.shape) == 2) and (objs.shape[1] > 0)):
+        # The rows of a two-dimensional Numpy array are vectors of the same
+        # size and data type, validate them all at once
+        if ((objs.dtype.type != numpy.array([0]).dtype.type) and
+           (objs.dtype.type != numpy.array([0.0]).dtype.type)):
+            return list(range(objs.shape[0]))
+        if (not increasing) or (objs.shape[1] == 1):
+            return []
+        return numpy.nonzero(
+            numpy.logical_not(numpy.diff(objs, axis=1).min(axis=1) > 0)
+        )[0].tolist()
+    func = (
+        _check_increasing_real_numpy_vector
+        if increasing else
+        _check_real_numpy_vector
+    )
+    return [num for num, obj in enumerate(objs) if func(obj)]
+
+
 def _homogenize_data_filter(dfilter):
     """
     Make data filter definition consistent, create a
@@ -361,14 +430,7 @@ def engineering_notation_number(obj):
 
     :rtype: None
     """
-    try:
-        obj = obj.rstrip()
-        float(obj[:-1] if obj[-1] in _SUFFIX_TUPLE else obj)
-        return None
-    except (AttributeError, IndexError, ValueError):
-        # AttributeError: obj.rstrip(), object could not be a string
-        # IndexError: obj[-1], when an empty string
-        # ValueError: float(), when not a string representing a number
+    if _check_engineering_notation_number(obj):
         raise ValueError(putil.pcontracts.get_exdesc())
 
 
@@ -672,3 +734,17 @@ def real_numpy_vector(obj):
     """
     if _check_real_numpy_vector(obj):
         raise ValueError(putil.pcontracts.get_exdesc())
+
+
+###
+# Batch forms of custom contracts, used by putil.pcontracts.validate_many
+###
+putil.pcontracts._register_batch_contract(
+    'engineering_notation_number', _check_many_engineering_notation_number
+)
+putil.pcontracts._register_batch_contract(
+    'increasing_real_numpy_vector', _check_many_increasing_real_numpy_vector
+)
+putil.pcontracts._register_batch_contract(
+    'real_numpy_vector', _check_many_real_numpy_vector
+)
@@ -13,13 +13,10 @@ if sys.hexversion < 0x03000000: # pragma: no cover
     from itertools import izip_longest
 else:    # pragma: no cover
     from itertools import zip_longest as izip_longest
-try:    # pragma: no cover
-    from inspect import signature
-except ImportError: # pragma: no cover
-    from funcsigs import signature
 # PyPI imports
 import pytest
 # Putil imports
+import putil.pinspect
 if sys.hexversion < 0x03000000: # pragma: no cover
     from putil.compat2 import _ex_type_str, _get_ex_msg
 else:   # pragma: no cover
@@ -31,38 +28,7 @@ else:   # pragma: no cover
 ###
 def _get_fargs(func, no_self=False, no_varargs=False): # pragma: no cover
     """ Same as putil.pinspect.get_function_args """
-    is_parg = lambda x: (len(x) > 1) and (x[0] == '*') and (x[1] != '*')
-    is_kwarg = lambda x: (len(x) > 2) and (x[:2] == '**')
-
-    par_dict = signature(func).parameters
-    # Mark positional and/or keyword arguments (if any)
-    args = [
-        '{prefix}{arg}'.format(
-            prefix=(
-                '*'
-                if par_dict[par].kind == par_dict[par].VAR_POSITIONAL else
-                (
-                    '**'
-                    if par_dict[par].kind == par_dict[par].VAR_KEYWORD else
-                    ''
-                )
-            ),
-            arg=par
-        )
-        for par in par_dict
-    ]
-    # Filter out 'self' from parameter list (optional)
-    self_filtered_args = args if not args else (
-        args[1 if (args[0] == 'self') and no_self else 0:]
-    )
-    # Filter out positional or keyword arguments (optional)
-    varargs_filtered_args = tuple([
-        arg
-        for arg in self_filtered_args
-        if ((not no_varargs) or
-           (no_varargs and (not is_parg(arg)) and (not is_kwarg(arg))))
-    ])
-    return varargs_filtered_args
+    return putil.pinspect.get_function_args(func, no_self, no_varargs)
 
 
 def _pcolor(text, color, indent=0): # pragma: no cover
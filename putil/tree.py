@@ -5,6 +5,7 @@
 # pylint: disable=C0111,R0913,W0105,W0212
 
 # Standard library imports
+import bisect
 import copy
 import sys
 # Putil imports
@@ -35,6 +36,14 @@ exobj_tree = trace_ex_tree.trace_module(no_print=True)
 _F = lambda x, y: dict(field=x, value=y)
 
 
+def _remove_child(children, name):
+    """ Remove a node name from a sorted list of children node names """
+    idx = bisect.bisect_left(children, name)
+    if (idx == len(children)) or (children[idx] != name):
+        raise ValueError('Node {0} not in children list'.format(name))
+    del children[idx]
+
+
 ###
 # Classes
 ###
@@ -171,10 +180,9 @@ class Tree(object):
         parent = self._db[oname]['parent']
         self._db[name]['parent'] = parent
         if parent:
-            self._db[parent]['children'].remove(oname)
-            self._db[parent]['children'] = sorted(
-                self._db[parent]['children']+[name]
-            )
+            # Children node names are kept sorted
+            _remove_child(self._db[parent]['children'], oname)
+            bisect.insort(self._db[parent]['children'], name)
         else:
             self._root = name
             self._root_hierarchy_length = len(
@@ -203,9 +211,7 @@ class Tree(object):
             self._db[child] = {
                 'parent':parent, 'children':[], 'data':[]
             }
-            self._db[parent]['children'] = sorted(
-                self._db[parent]['children']+[child]
-            )
+            bisect.insort(self._db[parent]['children'], child)
 
     def _create_node(self, name, parent, children, data):
         """ Create new tree node """
@@ -242,7 +248,7 @@ class Tree(object):
             # Delete link to parent (if not root node)
             del_list = self._get_subtree(node)
             if parent:
-                self._db[parent]['children'].remove(node)
+                _remove_child(self._db[parent]['children'], node)
             # Delete children (sub-tree)
             for child in del_list:
                 del self._db[child]
@@ -360,10 +366,8 @@ class Tree(object):
         # Update parent
         if not self.is_root(name):
             parent = self._db[name]['parent']
-            self._db[parent]['children'].remove(name)
-            self._db[parent]['children'] = sorted(
-                self._db[parent]['children']+[new_name]
-            )
+            _remove_child(self._db[parent]['children'], name)
+            bisect.insort(self._db[parent]['children'], new_name)
         # Update children
         iobj = (
             self._get_subtree(name)
@@ -719,9 +723,7 @@ class Tree(object):
             dest_node.split(self._node_separator)[:-1]
         )
         self._db[dest_node]['parent'] = parent
-        self._db[parent]['children'] = sorted(
-            self._db[parent]['children']+[dest_node]
-        )
+        bisect.insort(self._db[parent]['children'], dest_node)
 
     def delete_prefix(self, name):
         r"""
@@ -901,10 +903,9 @@ class Tree(object):
             children = self._db[name]['children']
             for child in children:
                 self._db[child]['parent'] = parent
-            self._db[parent]['children'].remove(name)
-            self._db[parent]['children'] = sorted(
-                self._db[parent]['children']+children
-            )
+            _remove_child(self._db[parent]['children'], name)
+            for child in children:
+                bisect.insort(self._db[parent]['children'], child)
             del self._db[name]
 
     def get_children(self, name):
@@ -929,7 +930,7 @@ class Tree(object):
         """
         putil.exh.addai('name', self._validate_node_name(name))
         self._node_in_tree(name)
-        return sorted(self._db[name]['children'])
+        return self._db[name]['children'][:]
 
     def get_data(self, name):
         r"""
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# startup_benchmark.py
+# Copyright (c) 2013-2016 Pablo Acosta-Serafini
+# See LICENSE for details
+# pylint: disable=C0111
+
+# Standard library imports
+from __future__ import print_function
+import argparse
+import os
+import subprocess
+import sys
+# Putil imports
+import sbin.functions
+
+
+###
+# Global variables
+###
+# Maximum cumulative import time (in milliseconds) and third-party modules
+# that should not be imported as a side effect of importing each top-level
+# module
+_HEAVY = ['contracts', 'funcsigs', 'matplotlib', 'numpy', 'scipy']
+BUDGETS = {
+    'putil.eng':(150, _HEAVY),
+    'putil.exdoc':(150, _HEAVY),
+    'putil.exh':(100, _HEAVY),
+    'putil.misc':(150, _HEAVY),
+    'putil.pcontracts':(100, _HEAVY),
+    'putil.pcsv':(150, _HEAVY),
+    'putil.pinspect':(100, _HEAVY),
+    'putil.plot':(400, ['contracts', 'funcsigs', 'matplotlib', 'scipy']),
+    'putil.ptypes':(100, _HEAVY),
+    'putil.tree':(100, _HEAVY),
+}
+
+
+###
+# Functions
+###
+def _run(cmd):
+    """ Run a Python command in a fresh interpreter """
+    env = os.environ.copy()
+    pkg_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = os.pathsep.join(
+        [pkg_dir]+([env['PYTHONPATH']] if env.get('PYTHONPATH') else [])
+    )
+    proc = subprocess.Popen(
+        [sys.executable]+cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env
+    )
+    stdout, stderr = proc.communicate()
+    if proc.returncode:
+        raise RuntimeError(stderr.decode('utf-8'))
+    return stdout.decode('utf-8'), stderr.decode('utf-8')
+
+
+def import_time(module):
+    """
+    Returns the cumulative import time of a module in milliseconds, as
+    reported by the interpreter -X importtime option (Python 3.7 or newer)
+    """
+    _, stderr = _run(['-X', 'importtime', '-c', 'import '+module])
+    for line in stderr.split('\n'):
+        tokens = [item.strip() for item in line.split('|')]
+        if (len(tokens) == 3) and (tokens[2] == module):
+            return int(tokens[1])/1000.0
+    raise RuntimeError('Import time of module {0} not found'.format(module))
+
+
+def imported_modules(module, candidates):
+    """
+    Returns which of the candidate modules are imported as a side effect of
+    importing a module
+    """
+    stdout, _ = _run(
+        [
+            '-c',
+            'import sys, {0}; print(" ".join(sys.modules))'.format(module)
+        ]
+    )
+    loaded = stdout.split()
+    return sorted(item for item in candidates if item in loaded)
+
+
+def main(modules, no_print):
+    """ Check import time and import side effects of top-level modules """
+    measure = sys.hexversion >= 0x03070000
+    modules = modules or sorted(BUDGETS.keys())
+    failed = False
+    for module in modules:
+        budget, heavy = BUDGETS.get(module, (None, _HEAVY))
+        itime = import_time(module) if measure else None
+        loaded = imported_modules(module, heavy)
+        ok = (not loaded) and ((itime is None) or (budget is None) or
+             (itime <= budget))
+        failed = failed or (not ok)
+        if not no_print:
+            print(
+                '{0} {1} {2} (budget: {3}){4}'.format(
+                    sbin.functions.pcolor(
+                        'PASS' if ok else 'FAIL', 'green' if ok else 'red'
+                    ),
+                    module.ljust(18),
+                    (
+                        'N/A'
+                        if itime is None else
+                        '{0:.1f} ms'.format(itime)
+                    ).rjust(10),
+                    'N/A' if budget is None else '{0} ms'.format(budget),
+                    (
+                        ', imports {0}'.format(', '.join(loaded))
+                        if loaded else
+                        ''
+                    )
+                )
+            )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    PARSER = argparse.ArgumentParser(
+        description=(
+            'Check import time budgets (Python 3.7 or newer) and import side '
+            'effects of top-level package modules'
+        )
+    )
+    PARSER.add_argument(
+        '-q', '--quiet',
+        help='suppress messages',
+        action="store_true",
+        default=False
+    )
+    PARSER.add_argument(
+        'module',
+        help='module(s) to check (default: all top-level modules)',
+        nargs='*'
+    )
+    ARGS = PARSER.parse_args()
+    main(ARGS.module, ARGS.quiet)
@@ -183,7 +183,7 @@ class TestFigure(object):
         def mock_show():
             print('show called')
         obj = putil.plot.Figure(panels=default_panel)
-        with mock.patch('putil.plot.figure.plt.show', side_effect=mock_show):
+        with mock.patch('matplotlib.pyplot.show', side_effect=mock_show):
             obj.show()
         out, _ = capsys.readouterr()
         assert out == 'show called\n'
@@ -9,7 +9,8 @@ import sys
 # PyPI imports
 import numpy
 import pytest
-import matplotlib
+import matplotlib.markers
+import matplotlib.path
 # Putil imports
 from putil.test import AE, AI, AROPROP, RE, compare_strings
 import putil.plot
@@ -282,6 +282,66 @@ def test_to_sci_string(num, ref):
     assert to_sci_string(num) == ref
 
 
+@pytest.mark.parametrize(
+    'dvec, ref', [
+    (((), 0), ((0, ), 0)),
+    (((0, 0), -1), ((0, ), -1)),
+    (((300, 75, 120), -2), ((15, ), -2)),
+    (((-4, 6), 0), ((2, ), 0)),
+    (((25, 10), -13), ((5, ), -13)),
+    ]
+)
+def test_dec_gcd(dvec, ref):
+    """ Test dec_gcd function behavior """
+    obj = putil.eng.dec_gcd(putil.eng.DECVECTOR(*dvec))
+    assert obj == putil.eng.DECVECTOR(*ref)
+
+
+@pytest.mark.parametrize(
+    'args, ref', [
+    ((0.1, 0.5, 5), [0.1, 0.2, 0.3, 0.4, 0.5]),
+    ((0.1, 0.7, 7), [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7]),
+    ((1000, 5000, 5), [1000.0, 2000.0, 3000.0, 4000.0, 5000.0]),
+    ((-1E-6, 1E-6, 3), [-1E-6, 0.0, 1E-6]),
+    ((0, 1, 4), [0.0, 1/3.0, 2/3.0, 1.0]),
+    ((1.23456, 2.34567, 2, 2), [1.23, 2.35]),
+    ((1, 2, 1), [1.0]),
+    ((1, 2, 0), []),
+    ]
+)
+def test_dec_linspace(args, ref):
+    """ Test dec_linspace function behavior """
+    assert putil.eng.dec_linspace(*args) == ref
+
+
+@pytest.mark.parametrize(
+    'vector, ref', [
+    ([], []),
+    ([0.8], []),
+    ([0.8, 0.9, 1.1], [0.1, 0.2]),
+    ([1E-3, 5, -2.5], [4.999, -7.5]),
+    ]
+)
+def test_dec_step(vector, ref):
+    """ Test dec_step function behavior """
+    obj = putil.eng.dec_step(putil.eng.to_dec_vector(vector))
+    assert putil.eng.from_dec_vector(obj) == ref
+
+
+@pytest.mark.parametrize(
+    'dvec, ref', [
+    (((), 0), []),
+    (((1, 25, 3), -1), [0.1, 2.5, 0.3]),
+    (((-7, 0), 2), [-700.0, 0.0]),
+    (((1, ), -24), [1E-24]),
+    (((3, ), 24), [3E+24]),
+    ]
+)
+def test_from_dec_vector(dvec, ref):
+    """ Test from_dec_vector function behavior """
+    assert putil.eng.from_dec_vector(putil.eng.DECVECTOR(*dvec)) == ref
+
+
 @pytest.mark.parametrize(
     'num, ref', [
     (0, '0'),
@@ -1126,3 +1186,39 @@ def test_round_mantissa(num, dec, ref):
     obj = obj if isdflt(dec) else functools.partial(obj, decimals=dec)
     test = obj(num) == ref
     assert test.all() if isinstance(num, ndarray) else test
+
+
+@pytest.mark.parametrize(
+    'vector, dec, ref', [
+    ([], DFLT, ((), 0)),
+    ([0.8, 0.9, 1, 12.5], DFLT, ((8, 9, 10, 125), -1)),
+    ([0.1+0.2], DFLT, ((30000000000000004, ), -17)),
+    ([0.1+0.2], 10, ((3, ), -1)),
+    ([1234.5678, 2E-3], 2, ((1230000, 2), -3)),
+    ([0, -0.0, '0.000'], DFLT, ((0, 0, 0), 0)),
+    (['135.56E-8', '-1.50'], DFLT, ((13556, -15000000000), -10)),
+    (array([1, 2000]), 2, ((1, 2000), 0)),
+    (array([1.5E-24, 2E24]), DFLT, ((15, 20*10**48), -25)),
+    ]
+)
+def test_to_dec_vector(vector, dec, ref):
+    """ Test to_dec_vector function behavior """
+    obj = putil.eng.to_dec_vector
+    obj = obj if isdflt(dec) else functools.partial(obj, decimals=dec)
+    assert obj(vector) == putil.eng.DECVECTOR(*ref)
+
+
+@pytest.mark.parametrize(
+    'vector, dec', [
+        ([1, float('inf')], DFLT),
+        ([float('-inf')], 2),
+        ([float('nan'), 2.5], DFLT),
+        (['inf'], DFLT),
+        (['1.5a'], DFLT),
+    ]
+)
+def test_to_dec_vector_exceptions(vector, dec):
+    """ Test to_dec_vector function exceptions """
+    obj = putil.eng.to_dec_vector
+    obj = obj if isdflt(dec) else functools.partial(obj, decimals=dec)
+    AI(obj, 'vector', vector=vector)
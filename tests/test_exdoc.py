@@ -257,6 +257,101 @@ class TestExDocCxt(object):
         pobj2 = putil.pinspect.Callables([__file__, fname])
         assert pobj1 == pobj2
 
+    @pytest.mark.skipif(
+        sys.hexversion < 0x03070000, reason='Requires Python 3.7 or newer'
+    )
+    def test_async(self):
+        """ Test asynchronous context manager behavior """
+        def run(awaitable):
+            try:
+                next(awaitable.__await__())
+            except StopIteration as eobj:
+                return eobj.value
+        with pytest.raises(RuntimeError) as excinfo:
+            putil.exdoc.AsyncExDocCxt(exclude=5)
+        assert GET_EXMSG(excinfo) == 'Argument `exclude` is not valid'
+        putil.exh.del_exh_obj()
+        gobj = putil.exh.get_or_create_exh_obj()
+        cobj = putil.exdoc.AsyncExDocCxt(exclude=['_pytest'])
+        tobj = run(cobj.__aenter__())
+        tests.support.exdoc_support_module_4.func('John')
+        assert putil.exh.get_exh_obj() is not gobj
+        assert run(cobj.__aexit__(None, None, None)) is False
+        # Global exception handler is not used or modified
+        assert putil.exh.get_exh_obj() is gobj
+        assert not gobj
+        ref = (
+            '.. Auto-generated exceptions documentation for\n'
+            '.. tests.support.exdoc_support_module_4.func\n\n'
+            ':raises: TypeError (Argument \\`name\\` is not valid)\n\n'
+        )
+        cname = 'tests.support.exdoc_support_module_4.func'
+        assert tobj.get_sphinx_doc(cname) == ref
+        # Exceptions within the context are propagated
+        cobj = putil.exdoc.AsyncExDocCxt()
+        run(cobj.__aenter__())
+        assert run(cobj.__aexit__(OSError, None, None)) is False
+        assert putil.exh.get_exh_obj() is gobj
+        putil.exh.del_exh_obj()
+
+    @pytest.mark.skipif(
+        sys.hexversion < 0x03070000, reason='Requires Python 3.7 or newer'
+    )
+    def test_async_concurrent(self):
+        """
+        Test that interleaved coroutines in the same thread trace exceptions
+        independently
+        """
+        import asyncio
+        # Coroutines are defined in a string so that this module can be
+        # imported by Python versions without async/await support
+        source = (
+            'async def trace(func, arg, events):\n'
+            '    async with putil.exdoc.AsyncExDocCxt() as exdoc_obj:\n'
+            '        events[0].set()\n'
+            '        await events[1].wait()\n'
+            '        func(arg)\n'
+            '        await asyncio.sleep(0)\n'
+            '    return exdoc_obj\n'
+            'async def main():\n'
+            '    ev1, ev2 = asyncio.Event(), asyncio.Event()\n'
+            '    return await asyncio.gather(\n'
+            '        trace(mod4.func, "John", (ev1, ev2)),\n'
+            '        trace(mod5.float_func, 1.0, (ev2, ev1))\n'
+            '    )\n'
+        )
+        gdict = {
+            'asyncio':asyncio,
+            'putil':putil,
+            'mod4':tests.support.exdoc_support_module_4,
+            'mod5':tests.support.exdoc_support_module_5
+        }
+        exec(source, gdict)
+        putil.exh.del_exh_obj()
+        loop = asyncio.new_event_loop()
+        try:
+            obj1, obj2 = loop.run_until_complete(gdict['main']())
+        finally:
+            loop.close()
+        assert putil.exh.get_exh_obj() is None
+        cname1 = 'tests.support.exdoc_support_module_4.func'
+        cname2 = 'tests.support.exdoc_support_module_5.float_func'
+        doc1 = obj1.get_sphinx_doc(cname1)
+        doc2 = obj2.get_sphinx_doc(cname2)
+        assert 'Argument \\`name\\` is not valid' in doc1
+        assert 'Argument \\`arg\\` is illegal' in doc2
+        assert obj1.get_sphinx_doc(cname2) == ''
+        assert obj2.get_sphinx_doc(cname1) == ''
+
+    def test_async_unsupported(self):
+        """
+        Test that the asynchronous context manager is not available without
+        task-scoped exception handlers
+        """
+        exmsg = 'Asynchronous context manager requires Python 3.7 or newer'
+        with mock.patch('putil.exh._CONTEXT_EXH', None):
+            AE(putil.exdoc.AsyncExDocCxt, RuntimeError, exmsg)
+
 
 ###
 # Test classes
@@ -360,15 +455,15 @@ class TestExDoc(object):
         exobj._ex_dict = {
             12345: {
                 (RuntimeError, 'Exception 1'): {
-                    'function':['root/leaf1'],
-                    'raised': [False],
+                    'function':{0:0},
+                    'raised':0,
                     'name':'root/leaf1'
                 }
             },
             67899:{
                 (OSError, 'Exception 2'): {
-                    'function':['root.leaf2'],
-                    'raised': [False],
+                    'function':{0:0},
+                    'raised':0,
                     'name':'root/leaf2'
                 }
             }
@@ -420,22 +515,29 @@ class TestExDoc(object):
             nsys = importlib.import_module('sys')
         setattr(mobj, 'sys', nsys)
         sfunc = 'putil.exdoc.sys._getframe'
-        with mock.patch(sfunc, side_effect=mock_getframe):
-            tstr = exdocobj.get_sphinx_autodoc()
-            assert tstr == ''
-            tstr = exdocobj.get_sphinx_autodoc()
-            CS(tstr,
-                '.. Auto-generated exceptions documentation for\n'
-                '.. tests.support.exdoc_support_module_1.'
-                'ExceptionAutoDocClass.multiply\n\n'
-                ':raises: ValueError (Overflow)\n\n'
-            )
-            tstr = exdocobj_single.get_sphinx_autodoc()
-            CS(tstr,
-                '.. Auto-generated exceptions documentation for\n'
-                '.. tests.support.exdoc_support_module_4.func\n\n'
-                ':raises: TypeError (Argument \\`name\\` is not valid)\n\n'
-            )
+        try:
+            with mock.patch(sfunc, side_effect=mock_getframe):
+                tstr = exdocobj.get_sphinx_autodoc()
+                assert tstr == ''
+                tstr = exdocobj.get_sphinx_autodoc()
+                CS(tstr,
+                    '.. Auto-generated exceptions documentation for\n'
+                    '.. tests.support.exdoc_support_module_1.'
+                    'ExceptionAutoDocClass.multiply\n\n'
+                    ':raises: ValueError (Overflow)\n\n'
+                )
+                tstr = exdocobj_single.get_sphinx_autodoc()
+                CS(tstr,
+                    '.. Auto-generated exceptions documentation for\n'
+                    '.. tests.support.exdoc_support_module_4.func\n\n'
+                    ':raises: TypeError (Argument \\`name\\` is not valid)'
+                    '\n\n'
+                )
+        finally:
+            # Restore original module so that modules imported later in the
+            # session (e.g. Matplotlib) are not handed the patched one
+            sys.modules['sys'] = sys
+            setattr(mobj, 'sys', sys)
 
     def test_get_sphinx_doc(self, exdocobj, exdocobj_raised):
         """ Test get_sphinx_doc method behavior """
@@ -9,9 +9,11 @@
 from __future__ import print_function
 import collections
 import copy
+import inspect
 import os
 import re
 import sys
+import threading
 from itertools import product
 if sys.hexversion >= 0x03000000:
     import unittest.mock as mock
@@ -81,6 +83,14 @@ def test_add():
     inst4 = obj(IOError, 'Invalid *[name]*')
     inst4(False)
     AE(inst4, IOError, 'Invalid arg', True, [{'field':'name', 'value':'arg'}])
+    # Not-raising calls do not validate or evaluate the exception data
+    inst4(False, 5)
+    edata = mock.Mock(return_value=[{'field':'name', 'value':'arg'}])
+    inst4(False, edata)
+    assert not edata.called
+    AE(inst4, IOError, 'Invalid arg', True, edata)
+    assert edata.call_count == 1
+    AI(inst4, 'edata', True, lambda: 5)
     obj(TypeError, 'My exception', False)
     with pytest.raises(TypeError) as excinfo:
         obj(TypeError, 'My exception', True)
@@ -90,6 +100,24 @@ def test_add():
     with pytest.raises(IOError) as excinfo:
         obj(IOError, 'Invalid *[name]*', True, edata)
     assert GET_EXMSG(excinfo) == 'Invalid arg'
+    # Registrations from the same call site re-use the registered exception
+    putil.exh.set_exh_obj(putil.exh.ExHandle())
+    exhobj = putil.exh.get_exh_obj()
+    func = lambda: obj(RuntimeError, 'Cached exception')
+    inst5 = func()
+    ref = copy.deepcopy(exhobj._ex_dict)
+    with mock.patch.object(exhobj, 'add_exception') as mock_add_exception:
+        inst6 = func()
+        assert not mock_add_exception.called
+    assert exhobj._ex_dict == ref
+    assert inst6.__self__._ex_data == inst5.__self__._ex_data
+    AE(inst6, RuntimeError, 'Cached exception', True)
+    ref = 'RuntimeError (Cached exception)*'
+    assert exhobj.exceptions_db[0]['data'] == ref
+    putil.exh.set_exh_obj(putil.exh.ExHandle(full_cname=True))
+    func()
+    assert not putil.exh.get_exh_obj()._exobj_cache
+    putil.exh.del_exh_obj()
 
 def test_add_ai():
     """ Test add_ai function behavior """
@@ -151,6 +179,102 @@ def test_star_exh_obj():
         new_exh_obj = putil.exh.get_or_create_exh_obj(callables_fname=fname)
         assert pobj == new_exh_obj._callables_obj
     putil.exh.del_exh_obj()
+    # thread_local parameter
+    AI(putil.exh.set_exh_obj, 'obj', obj=5, thread_local=True)
+    gobj, tobj = putil.exh.ExHandle(), putil.exh.ExHandle()
+    putil.exh.set_exh_obj(gobj)
+    putil.exh.set_exh_obj(tobj, thread_local=True)
+    assert id(putil.exh.get_exh_obj()) == id(tobj)
+    assert id(putil.exh.get_or_create_exh_obj()) == id(tobj)
+    ret = []
+    thread = threading.Thread(
+        target=lambda: ret.append(putil.exh.get_exh_obj())
+    )
+    thread.start()
+    thread.join()
+    assert id(ret[0]) == id(gobj)
+    putil.exh.del_exh_obj(thread_local=True)
+    assert id(putil.exh.get_exh_obj()) == id(gobj)
+    putil.exh.del_exh_obj(thread_local=True)
+    putil.exh.del_exh_obj()
+
+
+def test_merge_thread_exh_obj():
+    """ Test merge_thread_exh_obj function behavior """
+    def func(exhobj, raised):
+        putil.exh.set_exh_obj(exhobj, thread_local=True)
+        exobj = putil.exh.addex(TypeError, 'Message')
+        if raised:
+            try:
+                exobj(True)
+            except TypeError:
+                pass
+        obj = putil.exh.merge_thread_exh_obj
+        ret.append((obj(), obj()))
+    putil.exh.del_exh_obj()
+    assert putil.exh.merge_thread_exh_obj() is None
+    ret = []
+    # Handler of the first thread that merges becomes the global handler
+    exhobjs = [putil.exh.ExHandle() for _ in range(4)]
+    threads = [
+        threading.Thread(target=func, args=(exhobj, num == 2))
+        for num, exhobj in enumerate(exhobjs)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    robj = putil.exh.get_exh_obj()
+    assert any([robj is exhobj for exhobj in exhobjs])
+    assert all([(item1 is robj) and (item2 is None) for item1, item2 in ret])
+    fdict = list(robj._flatten_ex_dict().values())
+    assert len(fdict) == 1
+    assert fdict[0]['raised'] == [True]
+    # Incompatible handlers are not merged
+    putil.exh.set_exh_obj(putil.exh.ExHandle(full_cname=True), True)
+    AE(
+        putil.exh.merge_thread_exh_obj,
+        RuntimeError,
+        'Incompatible exception handlers'
+    )
+    putil.exh.del_exh_obj(True)
+    putil.exh.del_exh_obj()
+
+
+def test_merge_exh_objs():
+    """ Test merge_exh_objs function behavior """
+    obj = putil.exh.merge_exh_objs
+    AI(obj, 'objs', objs=5)
+    AI(obj, 'objs', objs=[])
+    AI(obj, 'objs', objs=[putil.exh.ExHandle(), 5])
+    AE(
+        obj, RuntimeError, 'Incompatible exception handlers',
+        objs=[putil.exh.ExHandle(), putil.exh.ExHandle(full_cname=True)]
+    )
+    def func(exhobj, raised):
+        exhobj.add_exception('my_exception', TypeError, 'Message')
+        if raised:
+            with pytest.raises(TypeError):
+                exhobj.raise_exception_if('my_exception', True)
+    def caller(exhobj, raised):
+        func(exhobj, raised)
+    exhobjs = [putil.exh.ExHandle(full_cname=True) for _ in range(3)]
+    func(exhobjs[0], False)
+    caller(exhobjs[1], True)
+    func(exhobjs[2], True)
+    refs = [copy.copy(exhobj) for exhobj in exhobjs]
+    robj = obj(exhobjs)
+    # Merged exception handlers are not modified
+    assert all([ref == exhobj for ref, exhobj in zip(refs, exhobjs)])
+    assert robj == exhobjs[0]+exhobjs[1]+exhobjs[2]
+    # Exceptions defined in more than one exception handler are combined
+    fdict = list(robj._flatten_ex_dict().values())[0]
+    assert len(fdict['function']) == 2
+    fname = 'tests.test_exh.test_merge_exh_objs'
+    assert [
+        robj.decode_call(item).split('/')[-2] for item in fdict['function']
+    ] == [fname, fname+'.caller']
+    assert fdict['raised'] == [True, True]
 
 
 @pytest.mark.parametrize(
@@ -164,6 +288,38 @@ def test_ex_type_str(arg, ref):
     assert putil.exh._ex_type_str(arg) == ref
 
 
+def test_invalid_frame():
+    """ Test _invalid_frame() function behavior """
+    obj = putil.exh._invalid_frame
+    frame = sys._getframe(0)
+    assert not obj(frame)
+    fname = frame.f_code.co_filename
+    assert fname in putil.exh._INVALID_FRAME_CACHE
+    # Cached decision is used, file system is not accessed again
+    with mock.patch('os.path.isfile') as mock_isfile:
+        assert not obj(frame)
+        assert not mock_isfile.called
+    # Expired decisions are refreshed
+    putil.exh._INVALID_FRAME_CACHE[fname] = (True, 0)
+    assert not obj(frame)
+    assert putil.exh._INVALID_FRAME_CACHE[fname][0] is False
+    # Cache size is bounded
+    size = putil.exh._INVALID_FRAME_CACHE_SIZE
+    for num in range(size+10):
+        source = 'import sys; frame = sys._getframe(0)'
+        gdict = {}
+        exec_function(source, '<string{0}>'.format(num), gdict)
+        assert obj(gdict['frame'])
+    assert len(putil.exh._INVALID_FRAME_CACHE) <= size
+    source = 'import sys; frame = sys._getframe(0)'
+    gdict = {}
+    exec_function(source, '<string>', gdict)
+    assert obj(gdict['frame'])
+    gdict = {}
+    exec_function(source, putil.exh.__file__.replace('.pyc', '.py'), gdict)
+    assert obj(gdict['frame'])
+
+
 class TestExHandle(object):
     """ Tests for ExHandle class """
     def test_init(self):
@@ -174,6 +330,7 @@ class TestExHandle(object):
         AI(obj, 'exclude', exclude=5)
         AI(obj, 'exclude', exclude=['p', 'a', 5, 'c'])
         AI(obj, 'callables_fname', callables_fname=True)
+        AI(obj, 'stats', stats=5)
         arg = {'exclude':['sys', '_not_a_module_']}
         msg = 'Source for module _not_a_module_ could not be found'
         AE(obj, ValueError, msg, **arg)
@@ -432,6 +589,20 @@ class TestExHandle(object):
             'exh_support_module_2.MyClass.value(setter)'
         )
         assert item['msg'] == 'Illegal value'
+        # Class properties are resolved once per class, and again only if
+        # the class module is re-traced
+        cache = exobj._class_props_cache[exh_support_module_2.MyClass]
+        assert sorted(set(cache[2].values())) == [
+            'exh_support_module_2.MyClass.value(getter)',
+            'exh_support_module_2.MyClass.value(setter)'
+        ]
+        cname = 'inspect.getmembers'
+        with mock.patch(cname, side_effect=inspect.getmembers) as mobj:
+            exobj._get_class_props(exh_support_module_2.MyClass)
+            assert not mobj.called
+            exobj._callables_obj._fnames[cache[0]]['date'] -= 1
+            assert exobj._get_class_props(exh_support_module_2.MyClass)
+            assert mobj.called
         ###
         # Test exclude: test without exclusion and with exclusion,
         # the function name should be 'None'
@@ -473,6 +644,57 @@ class TestExHandle(object):
         for item in cdb.values():
             assert not item['function'][0]
 
+    def test_callable_path_cache(self):
+        """ Test fully qualified callable names caching """
+        exobj = putil.exh.ExHandle(full_cname=True)
+        def func():
+            return exobj._get_callable_path()
+        # Source code context is not read when the callable path is first
+        # obtained, and callable names are not resolved again for the same
+        # path (call has to be in the same line for the path to be the same)
+        ret = []
+        for cname in [
+                'inspect.getframeinfo',
+                'putil.exh.ExHandle._resolve_callable_full_name'
+        ]:
+            with mock.patch(cname) as mobj:
+                ret.append(func())
+            assert not mobj.called
+        assert ret[0] == ret[1]
+        assert ret[0][1].startswith(
+            'tests.test_exh.TestExHandle.test_callable_path_cache'
+        )
+        assert exobj._cname_cache
+        assert len(exobj._cpath_cache) == 1
+
+    def test_ex_dict_storage(self):
+        """ Test exceptions dictionary interned storage """
+        exobj = putil.exh.ExHandle(full_cname=True)
+        def func1():
+            return exobj.add_exception('my_exception', TypeError, 'Message')
+        def func2():
+            return func1()
+        keys = [func1(), func2(), func1(), func2()]
+        assert keys[0][:2] == keys[1][:2]
+        assert keys[0] == keys[2]
+        assert keys[1] == keys[3]
+        entry = exobj._ex_dict[keys[0][0]][keys[0][1]]
+        # Callable paths are interned, the first one is always None
+        assert exobj._paths[0] is None
+        assert len(exobj._paths) == 3
+        assert sorted(entry['function'].values()) == [0, 1]
+        assert entry['raised'] == 0
+        exobj.raise_exception_if('my_exception', False, _keys=keys[1])
+        with pytest.raises(TypeError):
+            exobj.raise_exception_if('my_exception', True, _keys=keys[1])
+        assert entry['raised'] == 2
+        fdict = list(exobj._flatten_ex_dict().values())[0]
+        assert fdict['function'] == [keys[0][2], keys[1][2]]
+        assert fdict['raised'] == [False, True]
+        assert [
+            item['data'] for item in exobj.exceptions_db
+        ] == ['TypeError (Message)', 'TypeError (Message)*']
+
     def test_raise_exception_if_exceptions(self):
         """ Test raise_exception_if method exceptions """
         # pylint: disable=W0702
@@ -509,7 +731,9 @@ class TestExHandle(object):
                 assert db[num]['name'] == fname
         # Tests
         obj = putil.exh.ExHandle()
-        def func3(cond1=False, cond2=False, cond3=False, cond4=False):
+        def func3(
+                cond1=False, cond2=False, cond3=False, cond4=False, cond5=False
+        ):
             exobj = putil.exh.ExHandle()
             items = (
                 (RuntimeError, 'This is an exception'),
@@ -520,6 +744,9 @@ class TestExHandle(object):
             exobj.raise_exception_if('my_exception1', cond1, edata=None)
             edata = {'field':'fname', 'value':'my_file.txt'}
             exobj.raise_exception_if('my_exception2', cond2, edata=edata)
+            exobj.raise_exception_if(
+                'my_exception2', cond5, edata=lambda: edata
+            )
             if cond3:
                 exobj.raise_exception_if('my_exception3', False)
             edata = {'field':'not_a_field', 'value':'my_file.txt'}
@@ -542,10 +769,34 @@ class TestExHandle(object):
         AE(func3, RuntimeError, 'This is an exception', True, False)
         exmsg = 'This is an exception with a my_file.txt field'
         AE(func3, OSError, exmsg, cond2=True)
+        AE(func3, OSError, exmsg, cond5=True)
         exmsg = 'Exception name my_exception3 not found'
         AE(func3, ValueError, exmsg, cond3=True)
         exmsg = 'Field not_a_field not in exception message'
         AE(func3, RuntimeError, exmsg, cond4=True)
+        # Test message templates, fields can appear more than once in the
+        # message but only once in the replacement values
+        def func4(edata, clear=False):
+            exobj = putil.exh.ExHandle()
+            exmsg = 'File *[fname]* ({braces}), line *[lnum]* of *[fname]*'
+            exobj.add_exception('my_exception', OSError, exmsg)
+            assert list(exobj._msg_templates) == [(OSError, exmsg)]
+            if clear:
+                # Templates are re-built when not available
+                exobj._msg_templates = {}
+            exobj.raise_exception_if('my_exception', True, edata)
+        edata = [
+            {'field':'lnum', 'value':5}, {'field':'fname', 'value':'*[lnum]*'}
+        ]
+        exmsg = 'File *[lnum]* ({braces}), line 5 of *[lnum]*'
+        AE(func4, OSError, exmsg, edata)
+        edata = {'field':'lnum', 'value':5}
+        exmsg = 'File *[fname]* ({braces}), line 5 of *[fname]*'
+        AE(func4, OSError, exmsg, edata)
+        AE(func4, OSError, exmsg, edata, True)
+        edata = [{'field':'lnum', 'value':5}, {'field':'lnum', 'value':6}]
+        exmsg = 'Field lnum not in exception message'
+        AE(func4, RuntimeError, exmsg, edata)
         # Test that edata=None works
         exobj = func3()
         cdb = exobj._flatten_ex_dict()
@@ -663,12 +914,17 @@ class TestExHandle(object):
                 obj2.save_callables(callables_fname2)
                 obj3 = putil.pinspect.Callables()
                 obj3.load(callables_fname2)
+                obj2.save_callables(callables_fname2, binary=True)
+                obj4 = putil.exh.ExHandle(callables_fname=callables_fname2)
+                assert obj1.callables_db == obj4.callables_db
         assert obj1 == obj3
 
     def test_save_callables_exceptions(self):
         """ Test save_callables method exceptions """
         obj = putil.exh.ExHandle()
         AI(obj.save_callables, 'callables_fname', True)
+        with putil.misc.TmpFile() as fname:
+            AI(obj.save_callables, 'binary', fname, 5)
 
     def test_callables_db(self):
         """ Test callables_db property behavior """
@@ -695,6 +951,101 @@ class TestExHandle(object):
         # Test that property cannot be deleted
         AROPROP(exobj, 'callables_separator')
 
+    def test_stats(self):
+        """ Test stats property and get_stats_table method behavior """
+        def func1(value):
+            putil.exh.addai('value', value < 0)
+        def func2(exhobj, value):
+            exhobj.add_exception('my_exception', TypeError, 'Message')
+            exhobj.raise_exception_if('my_exception', value < 0)
+        def trace(exhobj):
+            with putil.exh.ExHandleCxt(exhobj):
+                for value in [1, 2, -1, 3]:
+                    try:
+                        func1(value)
+                    except RuntimeError:
+                        pass
+                    try:
+                        func2(exhobj, value)
+                    except TypeError:
+                        pass
+        # Statistics not collected
+        exhobj = putil.exh.ExHandle()
+        trace(exhobj)
+        assert exhobj.stats is None
+        assert exhobj.get_stats_table() == ''
+        assert putil.exh.ExHandle(stats=True).get_stats_table() == ''
+        # Statistics collected
+        for full_cname in [False, True]:
+            exhobj = putil.exh.ExHandle(full_cname=full_cname, stats=True)
+            trace(exhobj)
+            stats = exhobj.stats
+            assert len(stats) == 2
+            names = [
+                'tests.test_exh.TestExHandle.test_stats.func{0}'.format(num)
+                for num in [1, 2]
+            ]
+            if full_cname:
+                assert sorted(stats) == names
+            else:
+                assert sorted(stats) == sorted(
+                    [
+                        '{0}:{1}({2})'.format(
+                            func.__code__.co_filename,
+                            func.__code__.co_firstlineno,
+                            func.__name__
+                        )
+                        for func in [func1, func2]
+                    ]
+                )
+            for entry in stats.values():
+                assert entry['registrations'] == 4
+                assert entry['raised'] == 1
+                assert entry['path_time'] > 0
+                assert entry['raise_time'] > 0
+            table = exhobj.get_stats_table().split('\n')
+            assert len(table) == 4
+            assert table[0].split() == [
+                'Callable', 'Registrations', 'Raised', 'Path', 'time', '[ms]',
+                'Raise', 'time', '[ms]'
+            ]
+            assert set(table[1]) == set(['-', ' '])
+            assert table[2].split()[0] in stats
+            assert table[2].split()[1:3] == ['4', '1']
+            assert len(set([len(line) for line in table])) == 1
+            # Registrations re-used from the same call site are timed
+            name = [item for item in stats if 'func1' in item][0]
+            ref = stats[name]['path_time']
+            with putil.exh.ExHandleCxt(exhobj):
+                func1(1)
+            assert exhobj.stats[name]['registrations'] == 5
+            assert exhobj.stats[name]['path_time'] > ref
+        # Statistics are copied and merged
+        cobj = copy.copy(exhobj)
+        assert cobj.stats == exhobj.stats
+        robj = cobj+exhobj
+        for name, entry in robj.stats.items():
+            assert entry['registrations'] == (
+                2*exhobj.stats[name]['registrations']
+            )
+            assert entry['raised'] == 2
+            for key in ['path_time', 'raise_time']:
+                ref = 2*exhobj.stats[name][key]
+                assert abs(entry[key]-ref) < 1e-9
+        assert cobj.stats == exhobj.stats
+        assert (putil.exh.ExHandle(True)+exhobj).stats is None
+        # Statistics of different exception handlers are merged by callable
+        # name
+        exhobj1 = putil.exh.ExHandle(stats=True)
+        trace(exhobj1)
+        exhobj2 = putil.exh.ExHandle(stats=True)
+        trace(exhobj2)
+        robj = exhobj1+exhobj2
+        assert sorted(robj.stats) == sorted(exhobj1.stats)
+        for entry in robj.stats.values():
+            assert entry['registrations'] == 8
+            assert entry['raised'] == 2
+
     def test_str(self):
         """ Test __str__ method behavior """
         for full_cname in [True, False]:
@@ -925,7 +1276,7 @@ class TestExHandle(object):
                     assert value['function'] == [None]
         # pylint: disable=W0104
         obj1 = putil.exh.ExHandle(_copy=True)
-        obj1._ex_dict = {'id1':5, 'ssid1':10}
+        obj1._ex_dict = {'id1':{}, 'ssid1':{}}
         obj1._callables_obj = putil.pinspect.Callables()
         obj1._callables_obj._callables_db = {
             'call1':{'a':5, 'b':6},
@@ -938,7 +1289,7 @@ class TestExHandle(object):
         obj1._callables_obj._class_names = ['once', 'upon']
         #
         obj2 = putil.exh.ExHandle(_copy=True)
-        obj2._ex_dict = {'id2':3, 'ssid2':1}
+        obj2._ex_dict = {'id2':{}, 'ssid2':{}}
         obj2._callables_obj = putil.pinspect.Callables()
         obj2._callables_obj._callables_db = {
             'call3':{'a':10, 'b':100},
@@ -1048,3 +1399,53 @@ class TestExHandle(object):
             exhobj.add_exception('test', RuntimeError, 'Message')
         my_func(exhobj)
         assert exhobj
+
+
+class TestExHandleCxt(object):
+    """ Tests for ExHandleCxt class """
+    def test_init(self):
+        """ Test constructor behavior """
+        AI(putil.exh.ExHandleCxt, 'obj', obj=5)
+        putil.exh.del_exh_obj()
+        with putil.exh.ExHandleCxt() as exhobj:
+            assert isinstance(exhobj, putil.exh.ExHandle)
+            assert putil.exh.get_exh_obj() is exhobj
+        assert putil.exh.get_exh_obj() is None
+
+    def test_scope(self):
+        """ Test exception handler scope """
+        gobj, tobj, cobj1, cobj2 = [putil.exh.ExHandle() for _ in range(4)]
+        putil.exh.set_exh_obj(gobj)
+        putil.exh.set_exh_obj(tobj, thread_local=True)
+        ret = []
+        with putil.exh.ExHandleCxt(cobj1):
+            # Context handler takes precedence over other handlers
+            assert putil.exh.get_exh_obj() is cobj1
+            assert putil.exh.get_or_create_exh_obj() is cobj1
+            putil.exh.addai('arg1', False)
+            with putil.exh.ExHandleCxt(cobj2):
+                assert putil.exh.get_exh_obj() is cobj2
+                putil.exh.addai('arg2', False)
+            assert putil.exh.get_exh_obj() is cobj1
+            # Context handler is not visible in other threads
+            thread = threading.Thread(
+                target=lambda: ret.append(putil.exh.get_exh_obj())
+            )
+            thread.start()
+            thread.join()
+        assert ret[0] is gobj
+        assert putil.exh.get_exh_obj() is tobj
+        putil.exh.del_exh_obj(thread_local=True)
+        assert putil.exh.get_exh_obj() is gobj
+        assert (not gobj) and (not tobj)
+        for obj, ref in [(cobj1, 'arg1'), (cobj2, 'arg2')]:
+            edb = obj.exceptions_db
+            assert len(edb) == 1
+            exmsg = 'Argument `{0}` is not valid'.format(ref)
+            assert edb[0]['data'] == 'RuntimeError ({0})'.format(exmsg)
+        # Context handler is restored when an exception is raised
+        with pytest.raises(ValueError):
+            with putil.exh.ExHandleCxt(cobj1):
+                raise ValueError('Bad value')
+        assert putil.exh.get_exh_obj() is gobj
+        putil.exh.del_exh_obj()
@@ -6,9 +6,14 @@
 # Standard library imports
 import copy
 import functools
+import marshal
+import os
+import shutil
 import sys
+import tempfile
 # PyPI imports
 import contracts
+import contracts.library.extensions
 import pytest
 # Putil imports
 import putil.exh
@@ -37,6 +42,28 @@ def decfunc(func):
     return wrapper
 
 
+@pytest.fixture
+def restore_contracts(request):
+    """
+    Unregisters the custom contracts defined by a test, and disables code
+    generation, when the test finishes
+    """
+    registries = [
+        putil.pcontracts._CUSTOM_CONTRACTS,
+        putil.pcontracts._CUSTOM_FUNCS,
+        putil.pcontracts._EXDESC,
+        contracts.library.extensions.Extension.registrar,
+    ]
+    keys = [set(registry) for registry in registries]
+    def fin():
+        putil.pcontracts.disable_codegen()
+        for registry, rkeys in zip(registries, keys):
+            for key in set(registry)-rkeys:
+                del registry[key]
+        putil.pcontracts._PARSED_CONTRACTS.clear()
+    request.addfinalizer(fin)
+
+
 def ret_func(par):
     """ Returns the passed argument """
     return par
@@ -96,6 +123,39 @@ def test_format_arg_exceptions():
         AE(obj, TypeError, exmsg, arg=item)
 
 
+def test_get_custom_contract():
+    """ Test _get_custom_contract function behavior """
+    original_custom_contracts = copy.deepcopy(
+        putil.pcontracts._CUSTOM_CONTRACTS
+    )
+    putil.pcontracts._CUSTOM_CONTRACTS = dict()
+    putil.pcontracts._PARSED_CONTRACTS.clear()
+    obj = putil.pcontracts._get_custom_contract
+    assert obj('str|not_zero') is None
+    assert obj(int) is None
+    assert putil.pcontracts._PARSED_CONTRACTS == {'str|not_zero':None}
+    # Registering a custom contract invalidates parsed contracts
+    putil.pcontracts._register_custom_contracts('not_zero', 'Zero')
+    assert putil.pcontracts._PARSED_CONTRACTS == {}
+    assert obj('str|not_zero') == 'not_zero'
+    assert obj('str|not_zero') == 'not_zero'
+    assert obj('str|not_zero_or_one') is None
+    assert obj('list(not_zero)') == 'not_zero'
+    assert putil.pcontracts._PARSED_CONTRACTS == {
+        'str|not_zero':'not_zero',
+        'str|not_zero_or_one':None,
+        'list(not_zero)':'not_zero'
+    }
+    # Parsed contracts that reference a custom contract no longer
+    # registered are parsed again
+    putil.pcontracts._CUSTOM_CONTRACTS = dict()
+    assert obj('str|not_zero') is None
+    putil.pcontracts._CUSTOM_CONTRACTS = copy.deepcopy(
+        original_custom_contracts
+    )
+    putil.pcontracts._PARSED_CONTRACTS.clear()
+
+
 def test_isexception():
     """ Test _isexception function behavior """
     assert not putil.pcontracts._isexception(str)
@@ -444,6 +504,124 @@ def test_contract():
     )
 
 
+@pytest.mark.usefixtures('restore_contracts')
+def test_codegen():
+    """ Test contract checking with generated code behavior """
+    obj = putil.pcontracts._get_codegen_checker
+    assert not putil.pcontracts.codegen_enabled()
+    AI(putil.pcontracts.enable_codegen, 'cache_dir', cache_dir=5)
+    AI(putil.pcontracts.enable_codegen, 'cache_dir', cache_dir=__file__)
+    assert not putil.pcontracts.codegen_enabled()
+    @putil.pcontracts.new_contract('Odd number: *[number]*')
+    def even_number(number):
+        if number % 2:
+            raise ValueError(putil.pcontracts.get_exdesc())
+    # Supported grammar
+    contract_args = {
+        'data':'list(list(str|int|float|None))',
+        'number':'None|even_number',
+        'flag':bool,
+        'opt':'(None|str),str',
+    }
+    checker = obj(contract_args)
+    args = {'data':[['a', 1, None]], 'number':2, 'flag':True, 'opt':'a'}
+    assert checker(args)
+    assert checker(dict(list(args.items())+[('extra', 5)]))
+    items = [
+        ('data', [['a', [1]]]),
+        ('data', [('a', 1)]),
+        ('data', 'a'),
+        ('number', 3),
+        ('number', 'a'),
+        ('flag', 1),
+        ('opt', None),
+    ]
+    for key, value in items:
+        assert not checker(dict(list(args.items())+[(key, value)]))
+    del args['flag']
+    assert not checker(args)
+    assert obj({})({})
+    # Unsupported grammar
+    items = [
+        'int,>0', 'str|bool,int', 'list[>0](str)', 'list(int', 'str|', '(str',
+        'not_a_valid_contract', 5
+    ]
+    for item in items:
+        assert obj({'value':item}) is None
+    # Contracts are checked by PyContracts when the generated checker does
+    # not validate an argument, or the contract is not supported
+    @putil.pcontracts.contract(number='None|even_number', name=str)
+    def func1(number, name='a'):
+        return number, name
+    @putil.pcontracts.contract(number='int,>0')
+    def func2(number):
+        return number
+    @putil.pcontracts.contract(number=int)
+    def func3(number):
+        putil.exh.addai('number')
+    def trace():
+        exhobj = putil.exh.ExHandle(full_cname=True)
+        with putil.exh.ExHandleCxt(exhobj):
+            func3(1)
+        return sorted([item['name'] for item in exhobj.exceptions_db])
+    ref = trace()
+    cache_dir = tempfile.mkdtemp()
+    putil.pcontracts.enable_codegen(os.path.join(cache_dir, 'a', 'b'))
+    assert putil.pcontracts.codegen_enabled()
+    assert func1(2) == (2, 'a')
+    assert func1(None, 'b') == (None, 'b')
+    AE(func1, RuntimeError, 'Odd number: 3', 3)
+    AI(func1, 'name', 2, 5)
+    assert func2(1) == 1
+    AI(func2, 'number', 0)
+    # Generated checkers are discarded when a custom contract is registered
+    # or code generation is enabled or disabled
+    assert len(putil.pcontracts._CODEGEN_CHECKERS) == 2
+    putil.pcontracts.enable_codegen(os.path.join(cache_dir, 'a', 'b'))
+    assert not putil.pcontracts._CODEGEN_CHECKERS
+    assert func1(2) == (2, 'a')
+    assert len(putil.pcontracts._CODEGEN_CHECKERS) == 1
+    @putil.pcontracts.new_contract()
+    def odd_number(number):
+        return number % 2 == 1
+    assert not putil.pcontracts._CODEGEN_CHECKERS
+    # Compiled checkers are cached on disk
+    fnames = os.listdir(os.path.join(cache_dir, 'a', 'b'))
+    assert len(fnames) == 1
+    fname = os.path.join(cache_dir, 'a', 'b', fnames[0])
+    checker = obj({'number':'None|even_number', 'name':str})
+    assert checker({'number':2, 'name':'a'})
+    with open(fname, 'wb') as fobj:
+        fobj.write(b'corrupted')
+    checker = obj({'number':'None|even_number', 'name':str})
+    assert checker({'number':2, 'name':'a'})
+    # Corrupted cache files are re-written
+    with open(fname, 'rb') as fobj:
+        assert fobj.read() != b'corrupted'
+    # Cache files written by another interpreter version are not loaded
+    with open(fname, 'wb') as fobj:
+        fobj.write(b'\x00'*len(putil.pcontracts._CODEGEN_HEADER))
+        marshal.dump(compile('check = None', 'other', 'exec'), fobj)
+    checker = obj({'number':'None|even_number', 'name':str})
+    assert checker({'number':2, 'name':'a'})
+    with open(fname, 'rb') as fobj:
+        assert fobj.read(len(putil.pcontracts._CODEGEN_HEADER)) == (
+            putil.pcontracts._CODEGEN_HEADER
+        )
+    # Generated code frames are not part of callable paths
+    assert trace() == ref
+    assert ref[0].split('/')[-2:] == [
+        'tests.test_pcontracts.test_codegen.trace',
+        'tests.test_pcontracts.test_codegen.func3'
+    ]
+    assert func1(2) == (2, 'a')
+    putil.pcontracts.disable_codegen()
+    assert not putil.pcontracts.codegen_enabled()
+    assert not putil.pcontracts._CODEGEN_CHECKERS
+    AE(func1, RuntimeError, 'Odd number: 3', 3)
+    shutil.rmtree(cache_dir)
+
+
 def test_enable_disable_contracts():
     """
     Test wrappers around disable_all, enable_all and
@@ -461,6 +639,16 @@ def test_enable_disable_contracts():
     putil.pcontracts.enable_all()
     assert not putil.pcontracts.all_disabled()
     AI(func, 'number', number=None)
+    # Contracts are checked with the cached PyContracts-decorated function
+    @putil.pcontracts.contract(number=int)
+    def func2(number):
+        return number
+    assert func2(5) == 5
+    putil.pcontracts.disable_all()
+    assert func2('a') == 'a'
+    putil.pcontracts.enable_all()
+    AI(func2, 'number', number='a')
+    assert func2(6) == 6
 
 
 def test_get_exdesc():
@@ -550,6 +738,12 @@ def test_new_contract():
         }
     )
     assert func3('def') == ref
+    # Exception descriptions are bound to the custom contract, they are
+    # available even if the custom contract cannot be found in the stack
+    func4, func3 = func3, None
+    assert func4('def') == ref
+    assert func4.exdesc == ref[1]
+    assert putil.pcontracts._EXDESC[func4.__code__] == ref[1]
     ref = {
         'func3':{
             'ex1':{
@@ -567,11 +761,55 @@ def test_new_contract():
         }
     }
     assert putil.pcontracts._CUSTOM_CONTRACTS == ref
+    putil.pcontracts._CUSTOM_CONTRACTS = dict()
+    # Exception descriptions are only returned to the custom contract
+    # itself, not to other functions called while it is being checked
+    def func5():
+        return putil.pcontracts.get_exdesc()
+    @putil.pcontracts.new_contract('Outer message')
+    def func6(name6):
+        return name6, func5()
+    exmsg = 'Function object could not be found for function `func5`'
+    AE(func6, RuntimeError, exmsg, name6='a')
     putil.pcontracts._CUSTOM_CONTRACTS = copy.deepcopy(
         original_custom_contracts
     )
 
 
+def test_validate_many():
+    """ Test validate_many function behavior """
+    obj = putil.pcontracts.validate_many
+    AI(obj, 'argname', contract=int, iterable=[1], argname=5)
+    @putil.pcontracts.new_contract(
+        argument_invalid='Argument `*[argument_name]*` is not valid',
+        argument_bad=(OSError, 'Bad *[data]*')
+    )
+    def batch_contract(obj):
+        exdesc = putil.pcontracts.get_exdesc()
+        if not isinstance(obj, int):
+            raise ValueError(exdesc['argument_invalid'])
+        if obj < 0:
+            raise ValueError(exdesc['argument_bad'])
+    ref = [
+        (1, RuntimeError, 'Argument `num` is not valid'),
+        (3, OSError, 'Bad -2')
+    ]
+    assert obj('batch_contract', [1, 'a', 2, -2], 'num') == ref
+    assert obj(int, ['a', 3]) == [
+        (0, RuntimeError, 'Argument `item` is not valid')
+    ]
+    assert obj('str|int', (item for item in ['a', 3])) == []
+    assert obj('batch_contract', []) == []
+    # Contract is parsed once
+    assert putil.pcontracts._COMPILED_CONTRACTS[int] is not None
+    putil.pcontracts.disable_all()
+    assert obj('batch_contract', ['a']) == []
+    putil.pcontracts.enable_all()
+    with pytest.raises(contracts.ContractSyntaxError):
+        obj('not_a_valid_contract', [1])
+    del putil.pcontracts._CUSTOM_CONTRACTS['batch_contract']
+
+
 ###
 # Test classes
 ###
@@ -673,3 +911,27 @@ class TestCreateArgumentValuePairs(object):
             pass
         ref = {'ppar1':1, 'ppar2':2, 'kpar1':'a', 'kpar2':20}
         assert orig_func(1, 2, kpar2=20) == ref
+
+    def test_signature_cache(self):
+        """
+        Test that function signature and default arguments are computed
+        once per function
+        """
+        def orig_func(ppar1, kpar1='a', kpar2=2):
+            pass
+        obj = putil.pcontracts._create_argument_value_pairs
+        ref = {'ppar1':1, 'kpar1':'a', 'kpar2':2}
+        assert obj(orig_func, 1) == ref
+        ref = (['ppar1', 'kpar1', 'kpar2'], [('kpar1', 'a'), ('kpar2', 2)])
+        assert putil.pcontracts._SIGNATURES[orig_func][1:] == ref
+        ref = {'ppar1':1, 'kpar1':'b', 'kpar2':2}
+        assert obj(orig_func, 1, kpar1='b') == ref
+        assert obj(orig_func, 1, 2, 3, 4) == {}
+        assert obj(orig_func, 1, 2, kpar1=3) == {}
+        def orig_func_var_arguments(ppar1, *args, **kwargs):
+            pass
+        ref = {'ppar1':1, 'args':(2, 3), 'kwargs':{'kpar1':4}}
+        assert obj(orig_func_var_arguments, 1, 2, 3, kpar1=4) == ref
+        assert putil.pcontracts._SIGNATURES[orig_func_var_arguments][1] is None
+        # Callables that cannot be weakly referenced are not cached
+        assert obj(len, [1]) == {'obj':[1]}
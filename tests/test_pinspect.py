@@ -8,7 +8,9 @@ from __future__ import print_function
 from functools import partial
 import copy
 import os
+import shutil
 import sys
+import tempfile
 import time
 import types
 # PyPI imports
@@ -36,6 +38,8 @@ def test_private_props():
         '_callables_db',
         '_class_names',
         '_fnames',
+        '_lazy_modules',
+        '_line_index',
         '_module_names',
         '_modules_dict',
         '_reverse_callables_db'
@@ -109,6 +113,78 @@ def test_is_special_method():
     assert putil.pinspect.is_special_method('__func_name__')
 
 
+def test_trace_cache():
+    """ Test module trace cache behavior """
+    AI(putil.pinspect.enable_trace_cache, 'cache_dir', cache_dir=5)
+    assert putil.pinspect.trace_cache_dir() is None
+    tmpdir = tempfile.mkdtemp()
+    cache_dir = os.path.join(tmpdir, 'cache')
+    fname = os.path.join(tmpdir, 'mod.py')
+    with open(fname, 'w') as fobj:
+        fobj.write('def func1():\n    pass\n')
+    scanner = putil.pinspect._AstTreeScanner
+    try:
+        AI(
+            putil.pinspect.enable_trace_cache,
+            'cache_dir',
+            cache_dir=fname
+        )
+        putil.pinspect.enable_trace_cache(cache_dir)
+        assert putil.pinspect.trace_cache_dir() == cache_dir
+        fargs = ('mod', fname, cache_dir)
+        ref = putil.pinspect._trace_module(('mod', fname, None))
+        assert putil.pinspect._trace_module(fargs) == ref
+        assert len(os.listdir(cache_dir)) == 1
+        # Cached results are used without parsing the file
+        putil.pinspect._AstTreeScanner = None
+        assert putil.pinspect._trace_module(fargs) == ref
+        # Touched files are not parsed again
+        mtime = os.path.getmtime(fname)
+        os.utime(fname, (mtime+10, mtime+10))
+        assert putil.pinspect._trace_module(fargs) == ref
+        # Modified files are parsed again and the cache is updated
+        with open(fname, 'w') as fobj:
+            fobj.write('def func2():\n    pass\n')
+        os.utime(fname, (0, 0))
+        with pytest.raises(TypeError):
+            putil.pinspect._trace_module(fargs)
+        putil.pinspect._AstTreeScanner = scanner
+        assert list(putil.pinspect._trace_module(fargs)[0]) == [
+            'mod.func2'
+        ]
+        assert len(os.listdir(cache_dir)) == 1
+        # Files modified without changing their size and modification time
+        # are parsed again
+        with open(fname, 'w') as fobj:
+            fobj.write('def func3():\n    pass\n')
+        os.utime(fname, (0, 0))
+        assert list(putil.pinspect._trace_module(fargs)[0]) == [
+            'mod.func3'
+        ]
+        assert len(os.listdir(cache_dir)) == 1
+        # Corrupted cache files are ignored
+        cname = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+        with open(cname, 'wb') as fobj:
+            fobj.write(b'corrupted')
+        assert list(putil.pinspect._trace_module(fargs)[0]) == [
+            'mod.func3'
+        ]
+        # Callables objects use the cache
+        mfile = modfile('putil.pinspect').replace('.pyc', '.py')
+        obj1 = putil.pinspect.Callables([mfile])
+        obj2 = putil.pinspect.Callables([mfile])
+        assert obj1 == obj2
+        assert len(os.listdir(cache_dir)) == 2
+        putil.pinspect.disable_trace_cache()
+        assert putil.pinspect.trace_cache_dir() is None
+        assert putil.pinspect.Callables([mfile]) == obj1
+        assert len(os.listdir(cache_dir)) == 2
+    finally:
+        putil.pinspect._AstTreeScanner = scanner
+        putil.pinspect.disable_trace_cache()
+        shutil.rmtree(tmpdir)
+
+
 ###
 # Test for classes
 ###
@@ -304,20 +380,20 @@ class TestCallables(object):
             '   putil.pit.MyClass\n'
             'putil.pit.MyClass: class (1-2)\n'
             'putil.pit.func1: func (3-4)\n'
-            'putil.test._get_fargs: func (32-67)\n'
-            'putil.test._pcolor: func (68-82)\n'
-            'putil.test.assert_arg_invalid: func (83-115)\n'
-            'putil.test.assert_exception: func (116-199)\n'
-            'putil.test._invalid_frame: func (200-206)\n'
-            'putil.test.assert_prop: func (207-246)\n'
-            'putil.test.assert_ro_prop: func (247-266)\n'
-            'putil.test.compare_strings: func (267-356)\n'
-            'putil.test.compare_strings.colorize_lines: func (296-307)\n'
-            'putil.test.compare_strings.print_non_diff: func (308-312)\n'
-            'putil.test.compare_strings.print_diff: func (313-321)\n'
-            'putil.test.comp_list_of_dicts: func (357-371)\n'
-            'putil.test.exception_type_str: func (372-389)\n'
-            'putil.test.get_exmsg: func (390-404)'
+            'putil.test._get_fargs: func (29-33)\n'
+            'putil.test._pcolor: func (34-48)\n'
+            'putil.test.assert_arg_invalid: func (49-81)\n'
+            'putil.test.assert_exception: func (82-165)\n'
+            'putil.test._invalid_frame: func (166-172)\n'
+            'putil.test.assert_prop: func (173-212)\n'
+            'putil.test.assert_ro_prop: func (213-232)\n'
+            'putil.test.compare_strings: func (233-322)\n'
+            'putil.test.compare_strings.colorize_lines: func (262-273)\n'
+            'putil.test.compare_strings.print_non_diff: func (274-278)\n'
+            'putil.test.compare_strings.print_diff: func (279-287)\n'
+            'putil.test.comp_list_of_dicts: func (323-337)\n'
+            'putil.test.exception_type_str: func (338-355)\n'
+            'putil.test.get_exmsg: func (356-370)'
         )
         CS(str(obj), rtext)
         ftime = int(os.path.getmtime(src))
@@ -334,20 +410,20 @@ class TestCallables(object):
             '   putil.pit\n'
             '   putil.test\n'
             'putil.pit.my_func: func (1-2)\n'
-            'putil.test._get_fargs: func (32-67)\n'
-            'putil.test._pcolor: func (68-82)\n'
-            'putil.test.assert_arg_invalid: func (83-115)\n'
-            'putil.test.assert_exception: func (116-199)\n'
-            'putil.test._invalid_frame: func (200-206)\n'
-            'putil.test.assert_prop: func (207-246)\n'
-            'putil.test.assert_ro_prop: func (247-266)\n'
-            'putil.test.compare_strings: func (267-356)\n'
-            'putil.test.compare_strings.colorize_lines: func (296-307)\n'
-            'putil.test.compare_strings.print_non_diff: func (308-312)\n'
-            'putil.test.compare_strings.print_diff: func (313-321)\n'
-            'putil.test.comp_list_of_dicts: func (357-371)\n'
-            'putil.test.exception_type_str: func (372-389)\n'
-            'putil.test.get_exmsg: func (390-404)'
+            'putil.test._get_fargs: func (29-33)\n'
+            'putil.test._pcolor: func (34-48)\n'
+            'putil.test.assert_arg_invalid: func (49-81)\n'
+            'putil.test.assert_exception: func (82-165)\n'
+            'putil.test._invalid_frame: func (166-172)\n'
+            'putil.test.assert_prop: func (173-212)\n'
+            'putil.test.assert_ro_prop: func (213-232)\n'
+            'putil.test.compare_strings: func (233-322)\n'
+            'putil.test.compare_strings.colorize_lines: func (262-273)\n'
+            'putil.test.compare_strings.print_non_diff: func (274-278)\n'
+            'putil.test.compare_strings.print_diff: func (279-287)\n'
+            'putil.test.comp_list_of_dicts: func (323-337)\n'
+            'putil.test.exception_type_str: func (338-355)\n'
+            'putil.test.get_exmsg: func (356-370)'
         )
         CS(str(obj), rtext)
         ## Test malformed JSON file
@@ -441,6 +517,78 @@ class TestCallables(object):
                 obj4.load(fname2)
                 obj4.load(fname1)
         assert obj3 == obj4
+        # Binary format
+        props = [
+            'callables_db', 'reverse_callables_db', '_modules_dict',
+            '_fnames', '_module_names', '_class_names'
+        ]
+        obj1 = putil.pinspect.Callables()
+        with putil.misc.TmpFile() as fname:
+            obj1.save(fname, binary=True)
+            obj2 = putil.pinspect.Callables()
+            obj2.load(fname)
+        assert obj1 == obj2
+        assert not bool(obj2)
+        with putil.misc.TmpFile() as fname:
+            obj3.save(fname, binary=True)
+            obj4 = putil.pinspect.Callables()
+            obj4.load(fname)
+        for prop in props:
+            assert getattr(obj3, prop) == getattr(obj4, prop)
+        # Merging of binary file and traced module information
+        obj1 = putil.pinspect.Callables([modfile(mname1)])
+        with putil.misc.TmpFile() as fname:
+            obj1.save(fname, binary=True)
+            obj2 = putil.pinspect.Callables([modfile(mname2)])
+            obj2.load(fname)
+        for prop in props:
+            assert getattr(obj2, prop) == getattr(obj3, prop)
+        # Callables defined conditionally have multiple reverse entries
+        obj1 = putil.pinspect.Callables([modfile('putil.pcontracts')])
+        with putil.misc.TmpFile() as fname:
+            obj1.save(fname, binary=True)
+            obj2 = putil.pinspect.Callables()
+            obj2.load(fname)
+        assert len(obj1.reverse_callables_db) > len(obj1.callables_db)
+        for prop in props:
+            assert getattr(obj1, prop) == getattr(obj2, prop)
+        # Lazy loading decodes module information only when needed
+        fname1 = modfile(mname1).replace('.pyc', '.py')
+        fname2 = modfile(mname2).replace('.pyc', '.py')
+        with putil.misc.TmpFile() as fname:
+            obj3.save(fname, binary=True)
+            obj1 = putil.pinspect.Callables()
+            obj1.load(fname, lazy=True)
+            obj2 = putil.pinspect.Callables()
+            obj2.load(fname, lazy=True)
+            obj4 = putil.pinspect.Callables()
+            obj4.load(fname, lazy=True)
+            obj5 = putil.pinspect.Callables()
+            obj5.load(fname, lazy=True)
+            assert bool(obj1)
+            assert obj1._modules_dict == {}
+            assert sorted(obj1._lazy_modules) == sorted([mname1, mname2])
+            assert sorted(obj1._fnames) == sorted(obj3._fnames)
+            ref = obj3.get_callable_from_line(fname1, 300)
+            assert obj1.get_callable_from_line(fname1, 300) == ref
+            assert list(obj1._lazy_modules) == [mname2]
+            assert obj1 == obj3
+            assert obj1._lazy_modules == {}
+            for prop in props:
+                assert getattr(obj1, prop) == getattr(obj3, prop)
+            assert obj2.callables_db == obj3.callables_db
+            assert obj2._lazy_modules == {}
+            # Refreshed modules are traced again instead of decoded
+            obj4._fnames[fname2]['date'] = 0
+            obj4.refresh()
+            assert list(obj4._lazy_modules) == [mname1]
+            assert obj4 == obj3
+            # Module information cannot be decoded if the file changed
+            with open(fname, 'ab') as fobj:
+                fobj.write(b'\x00')
+            exmsg = 'File {0} changed since it was loaded'.format(fname)
+            AE(obj5._get_callables_db, RuntimeError, exmsg)
+            assert sorted(obj5._lazy_modules) == sorted([mname1, mname2])
 
     def test_load_exceptions(self):
         """ Test load method exceptions """
@@ -449,12 +597,23 @@ class TestCallables(object):
             AI(obj.load, 'callables_fname', callables_fname=item)
         exmsg = 'File _not_a_file_ could not be found'
         AE(obj.load, OSError, exmsg, callables_fname='_not_a_file_')
+        with putil.misc.TmpFile() as fname:
+            obj.save(fname, binary=True)
+            AI(obj.load, 'lazy', callables_fname=fname, lazy=5)
+            with open(fname, 'rb') as fobj:
+                data = fobj.read()
+            with open(fname, 'wb') as fobj:
+                fobj.write(data[:8]+b'\xff'+data[9:])
+            exmsg = 'File {0} format is not supported'.format(fname)
+            AE(obj.load, RuntimeError, exmsg, callables_fname=fname)
 
     def test_save_exceptions(self):
         """ Test save method exceptions """
         obj = putil.pinspect.Callables()
         for item in [True, 5]:
             AI(obj.save, 'callables_fname', callables_fname=item)
+        with putil.misc.TmpFile() as fname:
+            AI(obj.save, 'binary', callables_fname=fname, binary=5)
 
     def test_trace(self):
         """ Test trace method behavior """
@@ -577,7 +736,7 @@ class TestCallables(object):
         ref.append('tests.test_exdoc.MockFCode.__init__: meth (141-145)')
         ref.append('tests.test_exdoc.MockGetFrame: class (146-153)')
         ref.append('tests.test_exdoc.MockGetFrame.__init__: meth (147-153)')
-        ref.append('{0}: class (154-263)'.format(cname1))
+        ref.append('{0}: class (154-358)'.format(cname1))
         ref.append('{0}.test_init: meth (156-208)'.format(cname1))
         ref.append('{0}.test_init.check_ctx1: func (159-164)'.format(cname1))
         ref.append('{0}.test_init.check_ctx2: func (165-171)'.format(cname1))
@@ -585,19 +744,27 @@ class TestCallables(object):
         ref.append('{0}: meth (209-245)'.format(mename1))
         ref.append('{0}.func1: func (211-217)'.format(mename1))
         ref.append('{0}.test_trace: func (218-234)'.format(mename1))
-        ref.append('{0}.test_save_callables: meth (246-263)'.format(cname1))
-        ref.append('{0}: class (264-698)'.format(cname2))
-        ref.append('{0}.test_init: meth (266-282)'.format(cname2))
-        ref.append('{0}.test_copy: meth (283-296)'.format(cname2))
-        ref.append('{0}: meth (297-395)'.format(mename2))
-        ref.append('{0}.func1: func (304-307)'.format(mename2))
-        ref.append('{0}.mock_add_nodes1: func (309-310)'.format(mename2))
-        ref.append('{0}.mock_add_nodes2: func (311-312)'.format(mename2))
-        ref.append('{0}.mock_add_nodes3: func (313-314)'.format(mename2))
-        ref.append('{0}.test_depth: meth (396-403)'.format(cname2))
-        ref.append('{0}.test_exclude: meth (404-411)'.format(cname2))
-        ref.append('{0}_autodoc: meth (412-439)'.format(meroot))
-        ref.append('{0}_doc: meth (440-698)'.format(meroot))
+        ref.append('{0}.test_save_callables: meth (246-259)'.format(cname1))
+        ref.append('{0}.test_async: meth (260-296)'.format(cname1))
+        ref.append('{0}.test_async.run: func (265-269)'.format(cname1))
+        ref.append(
+            '{0}.test_async_concurrent: meth (297-345)'.format(cname1)
+        )
+        ref.append(
+            '{0}.test_async_unsupported: meth (346-358)'.format(cname1)
+        )
+        ref.append('{0}: class (359-800)'.format(cname2))
+        ref.append('{0}.test_init: meth (361-377)'.format(cname2))
+        ref.append('{0}.test_copy: meth (378-391)'.format(cname2))
+        ref.append('{0}: meth (392-490)'.format(mename2))
+        ref.append('{0}.func1: func (399-402)'.format(mename2))
+        ref.append('{0}.mock_add_nodes1: func (404-405)'.format(mename2))
+        ref.append('{0}.mock_add_nodes2: func (406-407)'.format(mename2))
+        ref.append('{0}.mock_add_nodes3: func (408-409)'.format(mename2))
+        ref.append('{0}.test_depth: meth (491-498)'.format(cname2))
+        ref.append('{0}.test_exclude: meth (499-506)'.format(cname2))
+        ref.append('{0}_autodoc: meth (507-541)'.format(meroot))
+        ref.append('{0}_doc: meth (542-800)'.format(meroot))
         ref_txt = '\n'.join(ref)
         actual_txt = str(xobj)
         CS(actual_txt, ref_txt)
@@ -636,6 +803,32 @@ class TestCallables(object):
         actual_txt = str(xobj)
         CS(actual_txt, ref_txt)
 
+    def test_trace_processes(self):
+        """ Test trace method behavior with a process pool """
+        import putil.pcsv
+        import tests.support.exdoc_support_module_1
+        fnames = [
+            modfile('putil.pcsv.csv_file'),
+            modfile('putil.pcsv.dsort'),
+            modfile('tests.support.exdoc_support_module_1'),
+        ]
+        sobj = putil.pinspect.Callables(fnames)
+        pobj = putil.pinspect.Callables()
+        pobj.trace(fnames, processes=2)
+        assert sobj == pobj
+        assert str(sobj) == str(pobj)
+        assert sobj._modules_dict == pobj._modules_dict
+        for mname, entries in pobj._modules_dict.items():
+            assert entries
+            assert all(
+                [item['name'].startswith(mname+'.') for item in entries]
+            )
+        pobj.refresh(processes=2)
+        assert sobj == pobj
+        for item in [0, -1, True, 2.5, 'a']:
+            AI(pobj.trace, 'processes', fnames=fnames, processes=item)
+            AI(pobj.refresh, 'processes', processes=item)
+
 
     def test_callables_db(self):
         """ Test callables_db property """
@@ -702,6 +895,7 @@ class TestCallables(object):
 
     def test_get_callable_from_line(self):
         """ Test get_callable_from_line() function """
+        import putil.pcsv
         xobj = putil.pinspect.Callables()
         import tests.support.pinspect_support_module_4
         fname = modfile('tests.support.pinspect_support_module_4')
@@ -729,6 +923,28 @@ class TestCallables(object):
         assert xobj.get_callable_from_line(fname, 23) == ref
         ref = 'tests.support.pinspect_support_module_4'
         assert xobj.get_callable_from_line(fname, 100) == ref
+        # Index agrees with a linear scan of the module callables on every
+        # line, and it is rebuilt when the module is traced again
+        for mname in ['putil.pcsv.csv_file', 'putil.exh', 'putil.pinspect']:
+            fname = modfile(mname).replace('.pyc', '.py')
+            xobj = putil.pinspect.Callables([fname])
+            iobj = sorted(
+                xobj._modules_dict[mname], key=lambda x: x['code_id'][1]
+            )
+            for lineno in range(1, iobj[-1]['last_lineno']+2):
+                ref = mname
+                for value in iobj:
+                    if value['code_id'][1] <= lineno <= value['last_lineno']:
+                        ref = value['name']
+                    elif value['code_id'][1] > lineno:
+                        break
+                assert xobj.get_callable_from_line(fname, lineno) == ref
+        index = xobj._line_index['putil.pinspect']
+        xobj._fnames[fname]['date'] = 0
+        xobj.refresh()
+        assert 'putil.pinspect' not in xobj._line_index
+        xobj.get_callable_from_line(fname, 1)
+        assert xobj._line_index['putil.pinspect'] is not index
 
 
 ##
@@ -793,6 +1009,53 @@ class TestGetFunctionArgs(object):
         assert obj(no_self=True, no_varargs=True) == ('value', )
         assert obj(no_varargs=True) == ('self', 'value')
 
+    def test_code_args(self):
+        """
+        Test that arguments obtained from code objects match the function
+        signature and are cached per function object
+        """
+        import functools
+        sig_args = putil.pinspect._get_signature_args
+        obj = putil.pinspect.get_function_args
+        class MyClass(object):
+            def meth1(self, value, *args, **kwargs):
+                pass
+            def meth2(*args):
+                pass
+            @classmethod
+            def meth3(cls, value=None):
+                pass
+        def func1(ppar1, ppar2=5, *args, **kwargs):
+            pass
+        def func2(**kwargs):
+            pass
+        @functools.wraps(func2)
+        def func3(ppar1):
+            pass
+        funcs = [
+            func1, func2, func3, MyClass.meth1, MyClass().meth1,
+            MyClass().meth2, MyClass.meth3, MyClass().meth3
+        ]
+        if sys.hexversion >= 0x03000000:
+            fdict = {}
+            exec(
+                'def func4(ppar1, *args, kpar1, kpar2=1, **kwargs): pass',
+                fdict
+            )
+            exec('def func5(ppar1, *, kpar1): pass', fdict)
+            funcs.extend([fdict['func4'], fdict['func5']])
+            assert obj(fdict['func5']) == ('ppar1', 'kpar1')
+        for func in funcs:
+            assert obj(func) == sig_args(func)
+            assert obj(func) == sig_args(func)
+        assert obj(func3) == ('**kwargs', )
+        assert obj(MyClass().meth3) == ('value', )
+        assert obj(MyClass().meth2) == ('*args', )
+        assert func1 in putil.pinspect._FUNCTION_ARGS
+        # Cached arguments are discarded when the code object changes
+        func1.__code__ = func2.__code__
+        assert obj(func1) == ('**kwargs', )
+
     def test_nonzero(self):
         """ Test __nonzero__() function """
         obj = putil.pinspect.Callables()
@@ -7,6 +7,7 @@
 import sys
 import numpy
 # Putil imports
+import putil.pcontracts
 import putil.ptypes
 from putil.test import AE, AI
 
@@ -23,6 +24,16 @@ emsg = lambda msg: (
 ###
 # Helper functions
 ###
+def check_batch_contract(name, invalid, valid):
+    """ Check batch form of contract against the individual form """
+    ref = [
+        (num, RuntimeError, 'Argument `obj` is not valid')
+        for num in range(len(invalid))
+    ]
+    ret = putil.pcontracts.validate_many(name, invalid+valid, 'obj')
+    assert ret == ref
+
+
 def check_contract(obj, name, value):
     AE(obj, ValueError, emsg(name), obj=value)
 
@@ -147,12 +158,13 @@ def test_csv_row_filter_contract():
 def test_engineering_notation_number():
     """ Test EngineeringNotationNumber pseudo-type """
     obj = putil.ptypes.engineering_notation_number
-    items = ['3.12b', 'f', 'a1b', '   +  123.45f  ']
+    items = ['3.12b', 'f', 'a1b', '   +  123.45f  ', 'inf', 'nan', 5]
     for item in items:
         check_contract(obj, 'engineering_notation_number', item)
-    items = ['   +123.45f  ', '   -0  ']
-    for item in items:
+    vitems = ['   +123.45f  ', '   -0  ', '1.5e-3 k', 'infk', 'NaN']
+    for item in vitems:
         obj(item)
+    check_batch_contract('engineering_notation_number', items, vitems)
 
 
 def test_engineering_notation_suffix():
@@ -216,13 +228,21 @@ def test_increasing_real_numpy_vector_contract():
     ]
     for item in items:
         check_contract(obj, 'increasing_real_numpy_vector', item)
-    items = [
+    vitems = [
         numpy.array([1, 2, 3]),
         numpy.array([10.0, 12.1, 12.5]),
         numpy.array([10.0])
     ]
-    for item in items:
+    for item in vitems:
         obj(item)
+    name = 'increasing_real_numpy_vector'
+    check_batch_contract(name, items, vitems)
+    # Rows of two-dimensional Numpy arrays are validated at once
+    vfunc = putil.pcontracts.validate_many
+    items = numpy.array([[1, 2, 3], [1, 1, 2], [3, 2, 1], [-1, 0, 1]])
+    assert [item[0] for item in vfunc(name, items)] == [1, 2]
+    assert vfunc(name, numpy.array([[1.0], [2.0]])) == []
+    assert len(vfunc(name, numpy.array([['a', 'b'], ['c', 'd']]))) == 2
 
 
 def test_interpolation_option_contract():
@@ -309,10 +329,17 @@ def test_real_numpy_vector_contract():
     ]
     for item in items:
         check_contract(obj, 'real_numpy_vector', item)
-    items = [
+    vitems = [
         numpy.array([1, 2, 3]),
         numpy.array([10.0, 8.0, 2.0]),
         numpy.array([10.0])
     ]
-    for item in items:
+    for item in vitems:
         obj(item)
+    check_batch_contract('real_numpy_vector', items, vitems)
+    # Rows of two-dimensional Numpy arrays are validated at once
+    vfunc = putil.pcontracts.validate_many
+    items = numpy.array([[1, 2, 3], [3, 2, 1]])
+    assert vfunc('real_numpy_vector', items) == []
+    items = numpy.array([[True, False], [False, True]])
+    assert [item[0] for item in vfunc('real_numpy_vector', items)] == [0, 1]
@@ -121,6 +121,25 @@ def default_trees():
     return t1obj, t2obj, t3obj, t4obj
 
 
+###
+# Test functions
+###
+def test_remove_child():
+    """ Test _remove_child function behavior """
+    obj = putil.tree._remove_child
+    children = ['a.b', 'a.d', 'a.f']
+    obj(children, 'a.d')
+    assert children == ['a.b', 'a.f']
+    for name in ['a.a', 'a.c', 'a.g']:
+        exmsg = 'Node {0} not in children list'.format(name)
+        AE(obj, ValueError, exmsg, children=children, name=name)
+    assert children == ['a.b', 'a.f']
+    obj(children, 'a.f')
+    obj(children, 'a.b')
+    assert children == []
+    AE(obj, ValueError, 'Node a.b not in children list', children, 'a.b')
+
+
 ###
 # Test classes
 ###
@@ -645,6 +664,19 @@ class TestTreeNode(object):
         assert tree1.get_children('t1l1.t1l2b2.t1l3b2a') == []
         assert tree1.get_children('t1l1.t1l2b2.t1l3b2b') == []
         assert tree1.get_children('t1l1.t1l2b2.t1l3b2c') == []
+        # Returned list is a copy of the sorted children list
+        tree1.get_children('t1l1').append('t1l1.t1l2b0')
+        assert tree1.get_children('t1l1') == ['t1l1.t1l2b1', 't1l1.t1l2b2']
+        # Children added and removed in any order are kept sorted
+        tobj = putil.tree.Tree()
+        names = ['root.leaf{0}'.format((7*num) % 50) for num in range(50)]
+        tobj.add_nodes([{'name':name, 'data':[]} for name in names])
+        assert tobj.get_children('root') == sorted(names)
+        tobj.delete_subtree(names[10:30])
+        tobj.rename_node('root.leaf7', 'root.leaf99')
+        ref = sorted(names[:10]+names[30:])
+        ref[ref.index('root.leaf7')] = 'root.leaf99'
+        assert tobj.get_children('root') == sorted(ref)
 
     def test_get_data(self, default_trees):
         """ Test get_data method behavior """